@@ -0,0 +1,96 @@
+"""
+Move old chat threads from chat_messages into chat_messages_archive
+
+Chat history is read newest-first, so keeping only recent threads in
+chat_messages keeps the hot table and its indexes small. A thread (a root
+message and all of its replies) is archived once its root is older than the
+retention window. Run periodically, e.g. from cron:
+
+    python archive_chat_messages.py --days 90
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, case, func, insert, select
+from sqlalchemy.orm import aliased
+
+from database import get_db_session
+from models import ChatMessage, ChatMessageArchive, ChatReadMarker, ChatUnreadCounter
+
+ARCHIVE_COLUMNS = [
+    'id', 'webtoon_id', 'scene_id', 'sender_type', 'sender_name', 'message',
+    'session_id', 'is_read', 'character_id', 'parent_message_id', 'created_at'
+]
+
+def archive_chat_messages(days: int = 90, batch_size: int = 1000) -> int:
+    """Archive threads whose root message is older than `days`; returns moved row count"""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    moved = 0
+
+    while True:
+        with get_db_session() as db:
+            root_ids = [row.id for row in db.query(ChatMessage.id).filter(
+                ChatMessage.parent_message_id == None,
+                ChatMessage.created_at < cutoff
+            ).order_by(ChatMessage.created_at).limit(batch_size).all()]
+
+            if not root_ids:
+                break
+
+            thread_filter = (ChatMessage.id.in_(root_ids)) | (ChatMessage.parent_message_id.in_(root_ids))
+
+            # Unread replies leave the hot table, so take them off the readers' counters
+            root = aliased(ChatMessage)
+            unread = db.query(
+                ChatMessage.webtoon_id, root.session_id, func.count(ChatMessage.id)
+            ).join(
+                root, ChatMessage.parent_message_id == root.id
+            ).outerjoin(
+                ChatReadMarker, and_(
+                    ChatReadMarker.webtoon_id == ChatMessage.webtoon_id,
+                    ChatReadMarker.session_id == root.session_id
+                )
+            ).filter(
+                ChatMessage.parent_message_id.in_(root_ids),
+                ChatMessage.sender_type == "character",
+                ChatMessage.is_read == False,
+                (ChatReadMarker.last_read_at == None) | (ChatMessage.created_at > ChatReadMarker.last_read_at)
+            ).group_by(ChatMessage.webtoon_id, root.session_id).all()
+
+            for webtoon_id, session_id, count in unread:
+                db.query(ChatUnreadCounter).filter(
+                    ChatUnreadCounter.webtoon_id == webtoon_id,
+                    ChatUnreadCounter.session_id == session_id
+                ).update({
+                    "unread_count": case(
+                        (ChatUnreadCounter.unread_count > count, ChatUnreadCounter.unread_count - count),
+                        else_=0
+                    )
+                }, synchronize_session=False)
+
+            columns = [getattr(ChatMessage, name) for name in ARCHIVE_COLUMNS]
+            db.execute(
+                insert(ChatMessageArchive).from_select(
+                    ARCHIVE_COLUMNS,
+                    select(*columns).where(thread_filter)
+                )
+            )
+
+            # Replies first because of the self-referencing foreign key
+            moved += db.query(ChatMessage).filter(
+                ChatMessage.parent_message_id.in_(root_ids)
+            ).delete(synchronize_session=False)
+            moved += db.query(ChatMessage).filter(
+                ChatMessage.id.in_(root_ids)
+            ).delete(synchronize_session=False)
+
+    return moved
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old chat threads")
+    parser.add_argument("--days", type=int, default=90, help="Retention window in days")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Threads moved per transaction")
+    args = parser.parse_args()
+
+    count = archive_chat_messages(days=args.days, batch_size=args.batch_size)
+    print(f"Archived {count} chat messages")
@@ -0,0 +1,79 @@
+"""
+Batch build time of the co-like recommender
+
+Generates synthetic like pairs in memory with power-law webtoon popularity
+and power-law session activity. Heavy readers are what make Lᵀ·L
+expensive. The script then times collaborative.co_like_neighbours, i.e.
+everything the batch does except reading the likes table and writing the
+result. Runs without a database.
+
+Usage: python benchmarks/bench_co_likes.py [--likes 1000000] [--webtoons 20000] [--sessions 200000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from collaborative import co_like_neighbours, CO_LIKE_TOP_N
+
+
+def power_law(rng: np.random.Generator, n: int, exponent: float, size: int) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    ranks = rng.choice(n, size=size, p=weights / weights.sum())
+    return rng.permutation(n)[ranks]  # popular ids scattered, not clustered at 0
+
+
+def synthetic_likes(likes: int, webtoons: int, sessions: int, seed: int):
+    """Unique (item, session) pairs, topped up until `likes` remain after dedup"""
+    rng = np.random.default_rng(seed)
+    keys = np.empty(0, dtype=np.int64)
+    while len(keys) < likes:
+        batch = int((likes - len(keys)) * 1.2) + 1000
+        items = power_law(rng, webtoons, 0.9, batch)
+        readers = power_law(rng, sessions, 0.6, batch)
+        keys = np.unique(np.concatenate([keys, readers.astype(np.int64) * webtoons + items]))
+    keys = rng.permutation(keys)[:likes]
+    return keys % webtoons, keys // webtoons
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark co-like neighbour build")
+    parser.add_argument("--likes", type=int, default=1_000_000)
+    parser.add_argument("--webtoons", type=int, default=20_000)
+    parser.add_argument("--sessions", type=int, default=200_000)
+    parser.add_argument("--top-n", type=int, default=CO_LIKE_TOP_N)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    items, sessions = synthetic_likes(args.likes, args.webtoons, args.sessions, args.seed)
+    per_session = np.bincount(sessions)
+    print(f"{len(items):,} likes, {args.webtoons:,} webtoons, {args.sessions:,} sessions "
+          f"(max {per_session.max():,} likes per session)")
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = co_like_neighbours(items, sessions, args.webtoons, args.sessions, args.top_n)
+        timings.append(time.perf_counter() - started)
+
+    # Separate run: tracing slows allocation down
+    tracemalloc.start()
+    co_like_neighbours(items, sessions, args.webtoons, args.sessions, args.top_n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    item = result[0]
+    covered = len(np.unique(item))
+    print(f"{len(item):,} neighbours for {covered:,} webtoons (top {args.top_n})")
+    print(f"build: best {min(timings):.2f}s, median {sorted(timings)[len(timings) // 2]:.2f}s "
+          f"over {args.repeat} runs; peak traced memory {peak / 2**20:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
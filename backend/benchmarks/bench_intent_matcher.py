@@ -0,0 +1,68 @@
+"""
+Micro-benchmark for the chat intent matcher
+
+Compares the compiled Aho-Corasick matcher against the old per-intent
+`any(word in message for word in keywords)` scan while the number of intents
+grows. The automaton's time per character should stay flat. The last column
+is IntentMatcher with its default choice of path
+(intent_matcher.NAIVE_SCAN_MAX_KEYWORDS), which should track the faster of
+the two.
+
+Usage: python benchmarks/bench_intent_matcher.py
+"""
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_matcher import IntentMatcher, NAIVE_SCAN_MAX_KEYWORDS
+
+MESSAGE_LENGTH = 200
+KEYWORDS_PER_INTENT = 5
+REPEAT = 200
+
+
+def make_intents(count: int, rng: random.Random):
+    intents = []
+    for i in range(count):
+        keywords = [
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 8)))
+            for _ in range(KEYWORDS_PER_INTENT)
+        ]
+        intents.append((f"intent_{i}", keywords))
+    return intents
+
+
+def naive_match(intents, message: str):
+    message_lower = message.lower()
+    for name, keywords in intents:
+        if any(word in message_lower for word in keywords):
+            return name
+    return None
+
+
+def main():
+    rng = random.Random(42)
+    # Messages that match nothing force both approaches through their worst case
+    message = "".join(rng.choice("가나다라마바사 ") for _ in range(MESSAGE_LENGTH))
+
+    print(f"{KEYWORDS_PER_INTENT} keywords per intent; automaton above {NAIVE_SCAN_MAX_KEYWORDS} keywords")
+    print(f"{'intents':>8} {'naive us/msg':>14} {'automaton us/msg':>18} {'automaton ns/char':>18} {'default us/msg':>16}")
+    for count in (3, 6, 10, 13, 16, 20, 30, 300, 1000):
+        intents = make_intents(count, rng)
+        automaton = IntentMatcher(intents, compiled=True)
+        default = IntentMatcher(intents)
+
+        naive = timeit.timeit(lambda: naive_match(intents, message), number=REPEAT) / REPEAT
+        compiled = timeit.timeit(lambda: automaton.match(message), number=REPEAT) / REPEAT
+        chosen = timeit.timeit(lambda: default.match(message), number=REPEAT) / REPEAT
+
+        print(f"{count:>8} {naive * 1e6:>14.1f} {compiled * 1e6:>18.1f} "
+              f"{compiled * 1e9 / MESSAGE_LENGTH:>18.1f} {chosen * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Before/after benchmark for encoding get_webtoon_scenes
+
+Encodes a 100-scene webtoon (4 dialogues per scene) the three ways the
+endpoint has been served:
+
+  stdlib   - response_model validation, then stdlib json (old default)
+  orjson   - response_model validation, then ORJSONResponse (app default)
+  direct   - serializers.json_response: one validation, pydantic-core JSON
+
+Runs without a database (transient ORM objects).
+
+Usage: python benchmarks/bench_scene_listing.py [--scenes 100] [--dialogues 4]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from pydantic import TypeAdapter
+
+from models import Scene, Dialogue
+from schemas import SceneResponse
+from serializers import json_response
+
+REPEAT = 50
+
+
+def make_scenes(scene_count: int, dialogue_count: int):
+    webtoon_id = uuid.uuid4()
+    now = datetime.utcnow()
+    scenes = []
+    for number in range(1, scene_count + 1):
+        scene = Scene(
+            id=uuid.uuid4(), webtoon_id=webtoon_id, scene_number=number,
+            description="장면 설명 " * 10, scene_description="주인공이 낡은 편지를 발견한다. " * 5,
+            narration="그날 밤, 도시는 조용했다. " * 4, image_url=f"/static/uploads/scenes/{uuid.uuid4()}.png",
+            character_positions={"주인공": {"x": 0.3, "y": 0.6}}, panel_layout="single",
+            created_at=now, updated_at=now
+        )
+        scene.dialogues = [
+            Dialogue(
+                id=uuid.uuid4(), scene_id=scene.id, who_speaks="주인공",
+                dialogue="이건... 누가 보낸 편지지? " * 2, fact_or_fiction="fiction",
+                dialogue_order=order, created_at=now
+            )
+            for order in range(1, dialogue_count + 1)
+        ]
+        scenes.append(scene)
+    return scenes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scene list encoding")
+    parser.add_argument("--scenes", type=int, default=100)
+    parser.add_argument("--dialogues", type=int, default=4)
+    args = parser.parse_args()
+
+    scenes = make_scenes(args.scenes, args.dialogues)
+    adapter = TypeAdapter(List[SceneResponse])
+
+    def response_model_content():
+        # What FastAPI hands to the response class when a route returns ORM objects
+        validated = adapter.validate_python(scenes, from_attributes=True)
+        return adapter.dump_python(validated, mode="json")
+
+    def stdlib():
+        return json.dumps(response_model_content(), ensure_ascii=False).encode("utf-8")
+
+    def with_orjson():
+        return orjson.dumps(response_model_content(), option=orjson.OPT_NON_STR_KEYS)
+
+    def direct():
+        return json_response(List[SceneResponse], scenes).body
+
+    size = len(direct())
+    print(f"{args.scenes} scenes x {args.dialogues} dialogues, {size / 1024:.1f} KiB per response")
+
+    baseline = None
+    for name, fn in (("stdlib", stdlib), ("orjson", with_orjson), ("direct", direct)):
+        elapsed = timeit.timeit(fn, number=REPEAT) / REPEAT
+        baseline = baseline or elapsed
+        print(f"{name:<8} {elapsed * 1000:>8.2f} ms  {baseline / elapsed:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
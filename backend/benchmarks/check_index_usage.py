@@ -0,0 +1,145 @@
+"""
+Check that the hot queries use their indexes
+
+Runs EXPLAIN for the queries the routers issue most (webtoon list, comment
+and chat threads, like lookups) against a seeded Postgres database and
+fails if a plan does not touch the expected index:
+
+    python benchmarks/seed_data.py --webtoons 200
+    python benchmarks/check_index_usage.py
+
+tests/test_index_usage.py runs the same checks under pytest against
+TEST_DATABASE_URL.
+
+Seeded tables are small enough that the planner may rightly pick a
+sequential scan, so sequential scans are disabled while explaining
+(--allow-seqscan keeps them on). This checks that each query shape *can*
+use its index, which is what a missing or mismatched index breaks.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from database import engine
+
+# (name, SQL as issued by the router, indexes of which at least one must appear in the plan)
+CHECKS = [
+    (
+        "webtoon list",
+        "SELECT * FROM webtoons WHERE status = 'published' OR session_id = :session_id "
+        "ORDER BY created_at DESC LIMIT 20 OFFSET 0",
+        {"idx_webtoons_published_created", "idx_webtoons_session_created"},
+    ),
+    (
+        "my webtoons",
+        "SELECT * FROM webtoons WHERE session_id = :session_id ORDER BY created_at DESC",
+        {"idx_webtoons_session_created"},
+    ),
+    (
+        "comment roots",
+        "SELECT * FROM comments WHERE webtoon_id = :webtoon_id AND parent_comment_id IS NULL "
+        "ORDER BY created_at DESC",
+        {"idx_comments_thread"},
+    ),
+    (
+        "comment replies",
+        "SELECT * FROM comments WHERE parent_comment_id = :comment_id ORDER BY created_at",
+        {"idx_comments_replies"},
+    ),
+    (
+        "chat roots",
+        "SELECT * FROM chat_messages WHERE webtoon_id = :webtoon_id AND parent_message_id IS NULL "
+        "ORDER BY created_at DESC LIMIT 50",
+        {"idx_chat_messages_thread"},
+    ),
+    (
+        "chat replies",
+        "SELECT * FROM chat_messages WHERE parent_message_id = :message_id ORDER BY created_at",
+        {"idx_chat_messages_replies"},
+    ),
+    (
+        "like lookup",
+        "SELECT * FROM likes WHERE webtoon_id = :webtoon_id AND session_id = :session_id",
+        {"idx_likes_session_webtoon", "likes_webtoon_id_session_id_key"},
+    ),
+    (
+        "my likes",
+        "SELECT * FROM likes WHERE session_id = :session_id",
+        {"idx_likes_session_webtoon"},
+    ),
+]
+
+
+def plan_indexes(node) -> set:
+    """Names of all indexes referenced anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    names = set()
+    if "Index Name" in node:
+        names.add(node["Index Name"])
+    for child in node.get("Plans", []):
+        names |= plan_indexes(child)
+    return names
+
+
+def sample_params(conn) -> dict:
+    row = conn.execute(text(
+        "SELECT l.webtoon_id, l.session_id FROM likes l LIMIT 1"
+    )).first()
+    if row is None:
+        raise SystemExit("No seeded data found; run benchmarks/seed_data.py first")
+    message_id = conn.execute(text(
+        "SELECT parent_message_id FROM chat_messages WHERE parent_message_id IS NOT NULL LIMIT 1"
+    )).scalar()
+    comment_id = conn.execute(text("SELECT id FROM comments LIMIT 1")).scalar()
+    return {
+        "webtoon_id": row.webtoon_id,
+        "session_id": row.session_id,
+        "message_id": message_id,
+        "comment_id": comment_id,
+    }
+
+
+def check_plans(conn, allow_seqscan: bool = False):
+    """Yield (name, indexes used, plan, ok) for every check; conn must be inside a transaction"""
+    conn.execute(text("ANALYZE webtoons, comments, chat_messages, likes"))
+    params = sample_params(conn)
+    if not allow_seqscan:
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+
+    for name, sql, expected in CHECKS:
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        used = plan_indexes(plan[0]["Plan"])
+        yield name, used, plan, bool(used & expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assert index usage for hot queries")
+    parser.add_argument("--allow-seqscan", action="store_true", help="Leave sequential scans enabled")
+    parser.add_argument("--verbose", action="store_true", help="Print each plan")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Index checks need PostgreSQL (DATABASE_URL)")
+
+    failed = []
+    with engine.begin() as conn:
+        for name, used, plan, ok in check_plans(conn, args.allow_seqscan):
+            print(f"{'ok ' if ok else 'FAIL'} {name:<16} uses: {', '.join(sorted(used)) or '(no index)'}")
+            if args.verbose:
+                print(json.dumps(plan, indent=2))
+            if not ok:
+                failed.append(name)
+
+    if failed:
+        print(f"\nExpected index not used for: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Startup-time budget for worker boot
+
+Imports the app in fresh interpreters and fails (exit 1) if the median
+import time exceeds the budget, or if a module that should load lazily is
+imported at boot (Pillow, NumPy/SciPy, boto3, torch):
+
+    python benchmarks/check_startup_time.py --budget 1.5
+
+Import time excludes interpreter startup and the startup event (schema
+check, background jobs). It is the part that grows as modules are added.
+When the budget fails, benchmarks/profile_imports.py shows what to defer.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed on specific paths (uploads, recommendation batches, S3)
+LAZY_MODULES = ("PIL", "numpy", "scipy", "boto3", "torch")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": sorted(m for m in {lazy!r} if m in sys.modules)}}))
+"""
+
+
+def measure(module: str):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, lazy=LAZY_MODULES)],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"import {module} failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if app import exceeds a time budget")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_SECONDS", "1.5")),
+                        help="Maximum median import time in seconds")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [measure(args.module) for _ in range(args.runs)]
+    seconds = sorted(sample["seconds"] for sample in samples)
+    median = statistics.median(seconds)
+    loaded = sorted({name for sample in samples for name in sample["loaded"]})
+
+    print(f"import {args.module}: median {median * 1000:.0f} ms, "
+          f"min {seconds[0] * 1000:.0f} ms, max {seconds[-1] * 1000:.0f} ms over {args.runs} runs "
+          f"(budget {args.budget * 1000:.0f} ms)")
+
+    failed = False
+    if median > args.budget:
+        print("FAIL import time over budget; see benchmarks/profile_imports.py")
+        failed = True
+    if loaded:
+        print(f"FAIL imported at boot but should load lazily: {', '.join(loaded)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
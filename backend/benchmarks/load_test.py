@@ -0,0 +1,200 @@
+"""
+Asyncio load driver for the API
+
+Simulates readers, editors, likes, comments and chat against a running
+server (seed it first with seed_data.py) and reports throughput and
+p50/p95/p99 latency per endpoint. Results can be saved as a baseline and
+later runs compared against it:
+
+    python benchmarks/load_test.py --base-url http://localhost:8001 \
+        --users 50 --duration 60 --save benchmarks/baselines/local.json
+    python benchmarks/load_test.py --compare benchmarks/baselines/local.json
+
+With --compare the script exits non-zero if any endpoint's p95 regressed by
+more than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+# Relative weight of each simulated flow
+FLOWS = {
+    "reader": 70,
+    "like": 10,
+    "comment": 8,
+    "chat": 8,
+    "editor": 4,
+}
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class LoadTest:
+    def __init__(self, base_url: str, users: int, duration: float, seed: int):
+        self.base_url = base_url.rstrip("/")
+        self.users = users
+        self.duration = duration
+        self.rng = random.Random(seed)
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.webtoon_ids = []
+
+    async def timed(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    async def load_webtoon_ids(self):
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=30) as client:
+            response = await client.get("/api/webtoons/", params={"page": 1, "per_page": 100})
+            response.raise_for_status()
+            self.webtoon_ids = [w["id"] for w in response.json()["webtoons"]]
+        if not self.webtoon_ids:
+            raise SystemExit("No webtoons found; run benchmarks/seed_data.py first")
+
+    async def reader(self, client, webtoon_id):
+        await self.timed(client, "GET /api/webtoons/", "GET", "/api/webtoons/",
+                         params={"page": self.rng.randint(1, 5), "per_page": 20})
+        await self.timed(client, "GET /api/webtoons/{id}", "GET", f"/api/webtoons/{webtoon_id}")
+        await self.timed(client, "GET /api/scenes/webtoon/{id}", "GET", f"/api/scenes/webtoon/{webtoon_id}")
+        await self.timed(client, "GET /api/interactions/comments/webtoon/{id}", "GET",
+                         f"/api/interactions/comments/webtoon/{webtoon_id}")
+        await self.timed(client, "GET /api/chat/messages/webtoon/{id}", "GET",
+                         f"/api/chat/messages/webtoon/{webtoon_id}")
+
+    async def like(self, client, webtoon_id):
+        await self.timed(client, "POST /api/interactions/like", "POST", "/api/interactions/like",
+                         params={"webtoon_id": webtoon_id})
+
+    async def comment(self, client, webtoon_id):
+        await self.timed(client, "POST /api/interactions/comments", "POST", "/api/interactions/comments",
+                         json={"webtoon_id": webtoon_id, "content": "벤치마크 댓글입니다"})
+
+    async def chat(self, client, webtoon_id):
+        await self.timed(client, "POST /api/chat/messages", "POST", "/api/chat/messages",
+                         json={"webtoon_id": webtoon_id, "sender_type": "user",
+                               "sender_name": "독자", "message": "이 장면은 왜 그런 거예요?"})
+        await self.timed(client, "GET /api/chat/unread-count/webtoon/{id}", "GET",
+                         f"/api/chat/unread-count/webtoon/{webtoon_id}")
+
+    async def editor(self, client, webtoon_id):
+        response = await self.timed(client, "POST /api/webtoons/", "POST", "/api/webtoons/",
+                                    json={"title": "벤치마크 작품", "summary": "부하 테스트용"})
+        if response is None or response.status_code >= 400:
+            return
+        own_id = response.json()["id"]
+        await self.timed(client, "POST /api/scenes/", "POST", "/api/scenes/",
+                         json={"webtoon_id": own_id, "scene_number": 1, "description": "첫 장면",
+                               "scene_description": "첫 장면", "narration": "시작"})
+        await self.timed(client, "POST /api/webtoons/{id}/characters", "POST",
+                         f"/api/webtoons/{own_id}/characters",
+                         json={"webtoon_id": own_id, "name": "주인공", "role": "주인공"})
+
+    async def virtual_user(self, deadline: float):
+        flows = list(FLOWS)
+        weights = [FLOWS[f] for f in flows]
+        # One client per user so each keeps its own session cookie
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=30) as client:
+            while time.perf_counter() < deadline:
+                flow = self.rng.choices(flows, weights)[0]
+                await getattr(self, flow)(client, self.rng.choice(self.webtoon_ids))
+
+    async def run(self):
+        await self.load_webtoon_ids()
+        start = time.perf_counter()
+        deadline = start + self.duration
+        await asyncio.gather(*(self.virtual_user(deadline) for _ in range(self.users)))
+        elapsed = time.perf_counter() - start
+        return self.report(elapsed)
+
+    def report(self, elapsed: float):
+        results = {}
+        for name, values in sorted(self.latencies.items()):
+            results[name] = {
+                "requests": len(values),
+                "errors": self.errors.get(name, 0),
+                "rps": len(values) / elapsed,
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+            }
+        return {"users": self.users, "duration_s": elapsed, "endpoints": results}
+
+
+def print_report(report, baseline=None):
+    header = f"{'endpoint':<46} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    if baseline:
+        header += f" {'p95 vs base':>12}"
+    print(header)
+    for name, stats in report["endpoints"].items():
+        line = (f"{name:<46} {stats['requests']:>7} {stats['errors']:>5} {stats['rps']:>8.1f} "
+                f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+        if baseline:
+            base = baseline["endpoints"].get(name)
+            if base and base["p95_ms"]:
+                line += f" {(stats['p95_ms'] / base['p95_ms'] - 1) * 100:>+11.1f}%"
+        print(line)
+
+
+def regressions(report, baseline, tolerance: float):
+    failed = []
+    for name, stats in report["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if base and base["p95_ms"] and stats["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            failed.append(name)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API load test")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    report = asyncio.run(LoadTest(args.base_url, args.users, args.duration, args.seed).run())
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if baseline:
+        failed = regressions(report, baseline, args.tolerance)
+        if failed:
+            print(f"\np95 regressed more than {args.tolerance:.0%} on: {', '.join(failed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Import-time profile of the API
+
+Imports the app in a fresh interpreter under `python -X importtime` and
+reports where the time goes: the slowest modules by cumulative time (a
+module plus everything it pulled in) and self time summed per top-level
+package. Use it to find what to make lazy; check_startup_time.py enforces
+the budget.
+
+Usage: python benchmarks/profile_imports.py [--module main] [--top 25]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str):
+    """[(module name, self µs, cumulative µs, depth)] in import order"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"import {module} failed")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    # Keep only the module's own subtree: children are listed before their parent
+    end = max(i for i, row in enumerate(rows) if row[0] == module and row[3] == 0)
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile app import time")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    rows = import_times(args.module)
+    total = sum(self_us for _, self_us, _, _ in rows)
+    print(f"import {args.module}: {total / 1000:.0f} ms across {len(rows)} modules\n")
+
+    print(f"{'cumulative':>12} {'self':>9}  module")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>7.1f}ms  {name}")
+
+    packages = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    print(f"\n{'self':>9}  package")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{self_us / 1000:>7.1f}ms  {package} ({self_us / total:.0%})")
+
+
+if __name__ == "__main__":
+    main()
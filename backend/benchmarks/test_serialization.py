@@ -0,0 +1,157 @@
+"""
+Micro-benchmarks for response serialization (pytest-benchmark)
+
+Measures what a handler plus FastAPI's response_model handling costs for
+the list endpoints, at realistic sizes:
+
+  legacy  - handler builds `Model(**obj.__dict__)`; FastAPI dumps the model,
+            validates it again against response_model, then encodes JSON
+  dict    - handler returns `row_to_dict(obj)`; FastAPI validates once
+  json    - handler returns `serializers.json_response`; validated from
+            attributes and encoded in pydantic-core, no response_model pass
+
+Runs without a database: transient ORM objects with every column set, as
+they would be when loaded from a row. Not part of the default
+test run:
+
+    pytest backend/benchmarks                              # from the repo root
+    pytest backend/benchmarks --benchmark-group-by=param:count
+"""
+import json
+import uuid
+from datetime import datetime
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from models import Webtoon, Comment, ChatMessage
+from schemas import WebtoonResponse, CommentResponse, ChatMessageResponse
+from serializers import json_response, row_to_dict
+
+SIZES = [20, 100, 1000]
+PATHS = ["legacy", "dict", "json"]
+
+
+def make_webtoon(i):
+    now = datetime.utcnow()
+    return Webtoon(
+        id=uuid.uuid4(), title=f"웹툰 {i}", summary="요약 " * 40, description="설명 " * 20,
+        thumbnail_url=None, author_name="Anonymous", genre="fantasy", theme="모험", story_style="drama",
+        number_of_cuts=20, status="published", view_count=i, like_count=i // 2,
+        session_id=uuid.uuid4().hex, created_at=now, updated_at=now
+    )
+
+
+def make_comment(webtoon_id, parent_id=None):
+    now = datetime.utcnow()
+    return Comment(
+        id=uuid.uuid4(), webtoon_id=webtoon_id, scene_id=None, author_name="익명", content="재밌어요! " * 10,
+        parent_comment_id=parent_id, session_id=uuid.uuid4().hex, created_at=now, updated_at=now
+    )
+
+
+def make_chat(webtoon_id, parent_id=None):
+    return ChatMessage(
+        id=uuid.uuid4(), webtoon_id=webtoon_id, scene_id=None, character_id=None, sender_type="user" if parent_id is None else "character",
+        sender_name="독자", message="이 장면은 왜 그런 거예요? " * 3, session_id=uuid.uuid4().hex,
+        is_read=False, parent_message_id=parent_id, created_at=datetime.utcnow()
+    )
+
+
+def fastapi_path(response_type, content):
+    """Validate against response_model and encode, as FastAPI does"""
+    adapter = TypeAdapter(response_type)
+    validated = adapter.validate_python(content)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+def legacy_prepare(content):
+    # FastAPI dumps returned pydantic models before re-validating them
+    return [item.model_dump() for item in content]
+
+
+def webtoon_paths(count):
+    webtoons = [make_webtoon(i) for i in range(count)]
+    response_type = List[WebtoonResponse]
+    return {
+        "legacy": lambda: fastapi_path(response_type, legacy_prepare([
+            WebtoonResponse(**dict(w.__dict__), is_owner=False, is_liked=False) for w in webtoons
+        ])),
+        "dict": lambda: fastapi_path(response_type, [
+            row_to_dict(w, is_owner=False, is_liked=False) for w in webtoons
+        ]),
+        "json": lambda: json_response(response_type, [
+            row_to_dict(w, is_owner=False, is_liked=False) for w in webtoons
+        ]).body,
+    }
+
+
+def comment_paths(count):
+    webtoon_id = uuid.uuid4()
+    comments = []
+    for _ in range(count):
+        root = make_comment(webtoon_id)
+        comments.append((root, [make_comment(webtoon_id, root.id) for _ in range(3)]))
+
+    def as_dicts():
+        return [
+            row_to_dict(root, is_owner=False, replies=[row_to_dict(reply, is_owner=False) for reply in replies])
+            for root, replies in comments
+        ]
+
+    response_type = List[CommentResponse]
+    return {
+        "legacy": lambda: fastapi_path(response_type, legacy_prepare([
+            CommentResponse(**dict(root.__dict__), is_owner=False, replies=[
+                CommentResponse(**dict(reply.__dict__), is_owner=False) for reply in replies
+            ])
+            for root, replies in comments
+        ])),
+        "dict": lambda: fastapi_path(response_type, as_dicts()),
+        "json": lambda: json_response(response_type, as_dicts()).body,
+    }
+
+
+def chat_paths(count):
+    webtoon_id = uuid.uuid4()
+    chats = []
+    for _ in range(count):
+        root = make_chat(webtoon_id)
+        chats.append((root, [make_chat(webtoon_id, root.id)]))
+
+    def as_dicts():
+        return [
+            row_to_dict(root, is_owner=True, replies=[row_to_dict(reply, is_owner=False) for reply in replies])
+            for root, replies in chats
+        ]
+
+    response_type = List[ChatMessageResponse]
+    return {
+        "legacy": lambda: fastapi_path(response_type, legacy_prepare([
+            ChatMessageResponse(**dict(root.__dict__), is_owner=True, replies=[
+                ChatMessageResponse(**dict(reply.__dict__), is_owner=False) for reply in replies
+            ])
+            for root, replies in chats
+        ])),
+        "dict": lambda: fastapi_path(response_type, as_dicts()),
+        "json": lambda: json_response(response_type, as_dicts()).body,
+    }
+
+
+PAYLOADS = {"webtoons": webtoon_paths, "comments": comment_paths, "chat": chat_paths}
+
+
+@pytest.mark.parametrize("payload", list(PAYLOADS))
+def test_paths_agree(payload):
+    """All paths must produce the same JSON, or the timings are not comparable"""
+    results = {path: json.loads(run()) for path, run in PAYLOADS[payload](5).items()}
+    assert results["legacy"] == results["dict"] == results["json"]
+
+
+@pytest.mark.parametrize("path", PATHS)
+@pytest.mark.parametrize("count", SIZES)
+@pytest.mark.parametrize("payload", list(PAYLOADS))
+def test_serialization(benchmark, payload, count, path):
+    benchmark.group = f"{payload} x{count}"
+    benchmark(PAYLOADS[payload](count)[path])
@@ -0,0 +1,184 @@
+"""
+"Readers who liked this also liked"
+
+Item-item collaborative filtering over the likes table. Sessions × webtoons
+form a sparse 0/1 matrix L, and Lᵀ·L counts co-likes for every webtoon pair.
+Each count is scored as cosine similarity, shrunk toward zero when only a
+few sessions back it:
+
+    score(i, j) = co(i, j) / sqrt(likes(i) · likes(j)) · co(i, j) / (co(i, j) + CO_LIKE_SHRINKAGE)
+
+The top CO_LIKE_TOP_N neighbours per webtoon are written to
+webtoon_co_likes, and /api/webtoons/{id}/also-liked reads one webtoon's list
+with a single indexed query.
+
+The batch is checked every CO_LIKE_REFRESH_SECONDS inside the app (0
+disables), or runs from cron with `python collaborative.py`. A Postgres
+advisory lock keeps it to one process at a time. Each rebuild records its
+time in score_checkpoints, and the in-app loop skips a rebuild while the
+last one is younger than the interval. Starting or restarting workers
+therefore rebuilds at most once per interval across the deployment. Build
+time at 1M likes is
+measured by benchmarks/bench_co_likes.py. NumPy and SciPy are imported
+inside the batch functions. main.py imports this module at boot only to
+start the loop.
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal
+from models import Like, ScoreCheckpoint, WebtoonCoLike
+
+logger = logging.getLogger(__name__)
+
+CO_LIKE_TOP_N = int(os.getenv("CO_LIKE_TOP_N", "20"))
+CO_LIKE_REFRESH_SECONDS = int(os.getenv("CO_LIKE_REFRESH_SECONDS", "3600"))
+CO_LIKE_SHRINKAGE = 5.0
+MIN_CO_LIKES = 2  # One shared reader is noise, not a signal
+
+CHECKPOINT_NAME = "co_likes"
+ADVISORY_LOCK_ID = 46_046
+BLOCK_SIZE = 2048  # webtoon rows per sparse product; bounds peak memory
+FETCH_SIZE = 50_000
+INSERT_CHUNK = 5_000
+
+
+def co_like_neighbours(items, sessions, n_items: int, n_sessions: int, top_n: int = CO_LIKE_TOP_N):
+    """
+    Top-N co-liked neighbours from integer-coded (item, session) like pairs.
+
+    Takes NumPy integer arrays. Returns parallel arrays (item, neighbour,
+    rank, score, co_likes), sorted by item and then by rank.
+    """
+    import numpy as np
+    from scipy import sparse
+    
+    likes = sparse.csr_matrix(
+        (np.ones(len(items), dtype=np.int32), (sessions, items)), shape=(n_sessions, n_items)
+    )
+    likes.data[:] = 1  # duplicate pairs count once
+    by_item = likes.T.tocsr()
+    popularity = np.diff(by_item.indptr).astype(np.float64)
+
+    parts = []
+    for start in range(0, n_items, BLOCK_SIZE):
+        co = (by_item[start:start + BLOCK_SIZE] @ likes).tocoo()
+        row = co.row.astype(np.int64) + start
+        col = co.col.astype(np.int64)
+        counts = co.data.astype(np.float64)
+
+        keep = (row != col) & (counts >= MIN_CO_LIKES)
+        row, col, counts = row[keep], col[keep], counts[keep]
+        scores = counts / np.sqrt(popularity[row] * popularity[col]) * counts / (counts + CO_LIKE_SHRINKAGE)
+
+        # Best first within each item, then the first top_n of every run
+        order = np.lexsort((col, -scores, row))
+        row, col, counts, scores = row[order], col[order], counts[order], scores[order]
+        run_starts = np.searchsorted(row, row, side="left")
+        rank = np.arange(len(row)) - run_starts
+        keep = rank < top_n
+        parts.append((row[keep], col[keep], rank[keep] + 1, scores[keep], counts[keep].astype(np.int64)))
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, np.empty(0), empty
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def load_likes(db: Session):
+    """(item codes, session codes, webtoon ids, session count) for every like"""
+    import numpy as np
+    
+    webtoon_codes, session_codes = {}, {}
+    items, sessions = [], []
+    rows = db.query(Like.webtoon_id, Like.session_id).filter(Like.webtoon_id.isnot(None))
+    for webtoon_id, session_id in rows.yield_per(FETCH_SIZE):
+        items.append(webtoon_codes.setdefault(webtoon_id, len(webtoon_codes)))
+        sessions.append(session_codes.setdefault(session_id, len(session_codes)))
+    return (
+        np.array(items, dtype=np.int64),
+        np.array(sessions, dtype=np.int64),
+        list(webtoon_codes),
+        len(session_codes),
+    )
+
+
+def rebuild_co_likes(db: Session, top_n: int = CO_LIKE_TOP_N) -> int:
+    """Recompute every neighbour list from the likes table; returns rows written"""
+    started = datetime.utcnow()
+    items, sessions, webtoon_ids, n_sessions = load_likes(db)
+    item, neighbour, rank, score, co_likes = co_like_neighbours(
+        items, sessions, len(webtoon_ids), n_sessions, top_n
+    )
+
+    db.query(WebtoonCoLike).delete(synchronize_session=False)
+    for start in range(0, len(item), INSERT_CHUNK):
+        end = start + INSERT_CHUNK
+        db.execute(insert(WebtoonCoLike), [
+            {
+                "webtoon_id": webtoon_ids[i],
+                "similar_webtoon_id": webtoon_ids[j],
+                "rank": int(r),
+                "score": float(s),
+                "co_likes": int(c),
+            }
+            for i, j, r, s, c in zip(item[start:end], neighbour[start:end], rank[start:end],
+                                     score[start:end], co_likes[start:end])
+        ])
+
+    checkpoint = last_rebuild(db)
+    if checkpoint is None:
+        db.add(ScoreCheckpoint(name=CHECKPOINT_NAME, checkpoint=started))
+    else:
+        checkpoint.checkpoint = started
+    db.commit()
+    return len(item)
+
+
+def last_rebuild(db: Session):
+    return db.query(ScoreCheckpoint).filter(ScoreCheckpoint.name == CHECKPOINT_NAME).first()
+
+
+def refresh_co_likes(max_age: int = CO_LIKE_REFRESH_SECONDS) -> int:
+    """
+    Rebuild in a fresh session; returns rows written.
+
+    Skipped (returning 0) while another process holds the lock, or when the
+    last rebuild started less than max_age seconds ago.
+    """
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            locked = db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID}).scalar()
+            if not locked:
+                return 0
+        checkpoint = last_rebuild(db)
+        if checkpoint is not None and datetime.utcnow() - checkpoint.checkpoint < timedelta(seconds=max_age):
+            return 0
+        return rebuild_co_likes(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(interval: int = CO_LIKE_REFRESH_SECONDS):
+    """Background loop started by main.py"""
+    while True:
+        try:
+            written = await run_in_threadpool(refresh_co_likes)
+            logger.debug("Co-like neighbours rebuilt (%d rows)", written)
+        except Exception:
+            logger.exception("Co-like rebuild failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    written = refresh_co_likes(max_age=0)  # cron: always rebuild unless locked
+    print(f"Wrote {written} co-like neighbours in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,162 @@
+"""
+Response compression middleware (Brotli and gzip)
+
+Compresses text and JSON responses above COMPRESSION_MIN_SIZE bytes using
+the best encoding the client accepts. Responses carrying an ETag are
+compressed once per content version: the compressed bytes are kept in a
+small LRU keyed by (path, ETag, encoding) and reused until the content
+changes. The path is part of the key because an ETag only identifies a
+version of one resource: FileResponse derives it from mtime and size, so
+two files of the same size written in the same second share one.
+A strong ETag is sent as a weak one on the compressed response: the bytes
+differ from the identity body it validates. Starlette strips W/ from
+If-None-Match, so conditional requests still match.
+
+Only complete 200 responses are compressed. Other statuses, ranges
+(Content-Range) and zero-copy file sends (http.response.pathsend) pass
+through untouched.
+"""
+import gzip
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; fall back to gzip only
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+COMPRESSION_CACHE_SIZE = int(os.getenv("COMPRESSION_CACHE_SIZE", "256"))
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "text/", "application/javascript", "image/svg+xml"
+)
+
+
+def choose_encoding(accept_encoding: str, candidates=None) -> Optional[str]:
+    """Pick the preferred of candidates ("br", "gzip") from an Accept-Encoding header, honouring q-values"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    if candidates is None:
+        candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (path, ETag, encoding)"""
+
+    def __init__(self, max_entries: int = COMPRESSION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get_or_compress(self, path: str, etag: Optional[str], body: bytes, encoding: str) -> bytes:
+        if not etag or etag.startswith("W/") or self.max_entries <= 0:
+            return compress(body, encoding)
+
+        key = (path, etag, encoding)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            return cached
+
+        compressed = compress(body, encoding)
+        self._entries[key] = compressed
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return compressed
+
+
+class CompressionMiddleware:
+    """Negotiate Brotli/gzip and compress eligible responses"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, cache: CompressedBodyCache = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache or CompressedBodyCache()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        chunks = []
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (message["status"] != 200 or "content-range" in headers
+                        or headers.get("content-encoding") or not content_type.startswith(COMPRESSIBLE_TYPES)):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] != "http.response.body":
+                # e.g. http.response.pathsend: no body to compress, send the held start first
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(scope=start_message)
+            if len(body) >= self.minimum_size:
+                etag = headers.get("etag")
+                body = self.cache.get_or_compress(scope["path"], etag, body, encoding)
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if etag and not etag.startswith("W/"):
+                    headers["etag"] = f"W/{etag}"
+            headers["content-length"] = str(len(body))
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
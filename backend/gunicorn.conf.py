@@ -0,0 +1,100 @@
+"""
+Production server: gunicorn managing uvicorn workers
+
+    cd backend && gunicorn -c gunicorn.conf.py main:app
+
+Workers default to one per available CPU; the API is async and offloads
+blocking work to each worker's thread pool, so more processes than cores
+only adds context switching and database connections. Override with
+WEB_CONCURRENCY.
+
+The app is imported once in the master (preload_app) and forked, so
+workers start fast and share read-only pages. Connections opened during
+import must not be shared across processes, so every engine's pool is
+dropped right after fork.
+
+On SIGTERM, gunicorn stops accepting connections and each worker finishes
+in-flight requests (including their background tasks) for up to
+GRACEFUL_TIMEOUT seconds before the app's shutdown handler runs. Writes
+are committed per request, so there is no in-memory buffer to flush.
+
+Prometheus samples from all workers are collected through files in
+PROMETHEUS_MULTIPROC_DIR (see metrics.py). The directory is emptied when
+this config loads, before the app is imported, and a worker's live gauges
+are dropped when it exits.
+The master serves the aggregate on METRICS_BIND, which listens on
+loopback only by default; set it empty to disable.
+"""
+import os
+import shutil
+import tempfile
+
+# Must be set before the app, and so prometheus_client, is imported
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "gltr-prometheus"))
+
+
+def clear_multiproc_dir() -> None:
+    """Empty the metrics directory before preload_app imports the app
+
+    Counters left by a previous run would be added to this one's. Config is
+    loaded before the app, so the master's own metric files are created
+    after this. A HUP reloads the config in the same master; its files and
+    the live workers' must survive that, so each master clears only once.
+    """
+    if os.environ.get("GLTR_PROMETHEUS_CLEARED_BY") == str(os.getpid()):
+        return
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    os.environ["GLTR_PROMETHEUS_CLEARED_BY"] = str(os.getpid())
+
+
+clear_multiproc_dir()
+
+
+def default_workers() -> int:
+    try:
+        cores = len(os.sched_getaffinity(0))  # respects container CPU pinning
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    return max(cores, 1)
+
+
+bind = os.getenv("BIND", f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", default_workers()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# Recycle workers now and then to cap slow leaks; jitter avoids restarting all at once
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv("ACCESS_LOG", "-")
+errorlog = "-"
+
+metrics_bind = os.getenv("METRICS_BIND", "127.0.0.1:9100")
+
+
+def when_ready(server):
+    if metrics_bind:
+        from prometheus_client import start_http_server
+        from metrics import metrics_registry
+        host, _, port = metrics_bind.rpartition(":")
+        start_http_server(int(port), addr=host or "127.0.0.1", registry=metrics_registry())
+
+
+def post_fork(server, worker):
+    # Pools inherited from the master would share sockets between processes
+    from database import engine, replica_engines
+    for db_engine in (engine, *replica_engines):
+        db_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    # Stop reporting the gauges of a worker that is gone
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,207 @@
+"""
+Image worker for directly uploaded images
+
+Finalizing a direct upload only queues it (status "processing"). This
+worker runs as its own process, outside the API workers:
+
+    cd backend && python image_processing.py          # poll forever
+    cd backend && python image_processing.py --once   # drain the queue and exit
+
+For each queued asset it reads the unvalidated object from
+storage.PENDING_UPLOAD_PREFIX and probes its real format and dimensions.
+Only allow-listed raster formats are accepted (IMAGE_EXTENSIONS). A valid
+image is copied to its public `uploads/...` key, with the extension taken
+from the probed format, and resized variants are written next to it. The
+webtoon thumbnail or scene image is then pointed at the result. Anything
+that fails marks the asset "failed".
+
+The size is checked again here, not only at finalize: a presigned S3 PUT
+stays valid until it expires, so the object can be replaced after
+finalize. Objects over MAX_FILE_SIZE are rejected without being read.
+
+Assets still "pending" PENDING_UPLOAD_TTL_SECONDS after presign were
+never finalized. The worker deletes them and their objects when it is
+idle (and once per `--once` run).
+
+Workers claim assets with FOR UPDATE SKIP LOCKED, so several can run side by
+side. Pillow is imported on first use.
+"""
+import argparse
+import io
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from database import SessionLocal
+from models import ImageAsset, Scene, Webtoon
+from storage import UPLOAD_URL_EXPIRES, get_storage
+
+logger = logging.getLogger(__name__)
+
+IMAGE_WORKER_POLL_SECONDS = float(os.getenv("IMAGE_WORKER_POLL_SECONDS", "2"))
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "10485760"))
+# Never shorter than the upload URL's lifetime, or a slow upload could lose its asset
+PENDING_UPLOAD_TTL_SECONDS = max(int(os.getenv("PENDING_UPLOAD_TTL_SECONDS", "86400")), UPLOAD_URL_EXPIRES)
+CLEANUP_BATCH = 500
+
+# Formats accepted for upload, with the extension their public key gets
+IMAGE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+# Bounding boxes (width, height) of the variants generated per asset type
+VARIANTS = {
+    "thumbnail": {"thumbnail": (400, 600)},
+    "scene": {"small": (480, 4096), "medium": (960, 4096)},
+}
+
+
+def variant_key(key: str, name: str) -> str:
+    base, ext = os.path.splitext(key)
+    return f"{base}_{name}{ext}"
+
+
+def probe_image(data: bytes):
+    """Return (PIL image, mime type) for data, verifying it is a decodable image"""
+    from PIL import Image
+    
+    with Image.open(io.BytesIO(data)) as probe:
+        probe.verify()
+    image = Image.open(io.BytesIO(data))
+    return image, Image.MIME.get(image.format)
+
+
+def make_variant(image, size) -> bytes:
+    from PIL import Image
+    
+    variant = image.copy()
+    variant.thumbnail(size, Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    variant.save(buffer, format=image.format)
+    return buffer.getvalue()
+
+
+def public_key(asset: ImageAsset, mime_type: str) -> str:
+    return f"uploads/{asset.asset_type}s/{asset.id}{IMAGE_EXTENSIONS[mime_type]}"
+
+
+def process_image_asset(db, asset: ImageAsset) -> None:
+    """Validate one claimed asset, publish it and generate its variants"""
+    storage = get_storage()
+    pending_key = asset.file_path
+
+    try:
+        # Checked before and after reading: the object may change in between
+        if storage.size(pending_key) > MAX_FILE_SIZE:
+            raise ValueError("too large")
+        data = storage.read(pending_key)
+        if len(data) > MAX_FILE_SIZE:
+            raise ValueError("too large")
+        image, mime_type = probe_image(data)
+    except Exception:
+        mime_type = None
+    if mime_type not in IMAGE_EXTENSIONS:
+        logger.warning("Uploaded object %s is not an accepted image within the size limit", pending_key)
+        asset.status = "failed"
+        db.commit()
+        storage.delete(pending_key)
+        return
+
+    key = public_key(asset, mime_type)
+    url = storage.save(key, data, mime_type)
+    variants = {}
+    for name, size in VARIANTS.get(asset.asset_type, {}).items():
+        variants[name] = storage.save(variant_key(key, name), make_variant(image, size), mime_type)
+
+    asset.file_path = key
+    asset.mime_type = mime_type
+    asset.width, asset.height = image.size
+    asset.file_size = len(data)
+    asset.variants = variants
+    asset.status = "ready"
+
+    # Publish the image on its target
+    if asset.asset_type == "thumbnail":
+        db.query(Webtoon).filter(Webtoon.id == asset.webtoon_id).update(
+            {Webtoon.thumbnail_url: variants["thumbnail"]}, synchronize_session=False
+        )
+    elif asset.asset_type == "scene":
+        db.query(Scene).filter(Scene.id == asset.scene_id).update(
+            {Scene.image_url: url}, synchronize_session=False
+        )
+    db.commit()
+    storage.delete(pending_key)
+
+
+def process_queued_assets(limit: int = None) -> int:
+    """Process queued assets one at a time until none are left; returns how many were handled"""
+    handled = 0
+    while limit is None or handled < limit:
+        db = SessionLocal()
+        try:
+            asset = db.query(ImageAsset).filter(
+                ImageAsset.status == "processing"
+            ).order_by(ImageAsset.created_at).with_for_update(skip_locked=True).first()
+            if asset is None:
+                return handled
+
+            asset_id = asset.id
+            try:
+                process_image_asset(db, asset)
+            except Exception:
+                logger.exception("Processing image asset %s failed", asset_id)
+                db.rollback()
+                db.query(ImageAsset).filter(ImageAsset.id == asset_id).update(
+                    {ImageAsset.status: "failed"}, synchronize_session=False
+                )
+                db.commit()
+        finally:
+            db.close()
+        handled += 1
+    return handled
+
+
+def cleanup_pending_assets(max_age: int = PENDING_UPLOAD_TTL_SECONDS, limit: int = CLEANUP_BATCH) -> int:
+    """Delete assets never finalized within max_age seconds, with their objects; returns how many"""
+    storage = get_storage()
+    db = SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+        stale = db.query(ImageAsset).filter(
+            ImageAsset.status == "pending",
+            ImageAsset.created_at < cutoff
+        ).order_by(ImageAsset.created_at).limit(limit).with_for_update(skip_locked=True).all()
+        for asset in stale:
+            storage.delete(asset.file_path)
+            db.delete(asset)
+        db.commit()
+        return len(stale)
+    finally:
+        db.close()
+
+
+def run_worker(poll_seconds: float = IMAGE_WORKER_POLL_SECONDS) -> None:
+    while True:
+        if not process_queued_assets():
+            try:
+                cleanup_pending_assets()
+            except Exception:
+                logger.exception("Cleaning up pending uploads failed")
+            time.sleep(poll_seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process finalized image uploads")
+    parser.add_argument("--once", action="store_true", help="Drain the queue and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.once:
+        print(f"Processed {process_queued_assets()} image assets")
+        print(f"Removed {cleanup_pending_assets()} uploads never finalized")
+    else:
+        run_worker()
@@ -0,0 +1,128 @@
+"""
+Keyword intent matcher for character chat replies
+
+IntentResponder is built from one table of (intent, keywords, replies)
+rows in priority order, so matching and replies are configured together.
+
+With many keywords, IntentMatcher builds an Aho-Corasick automaton once, so
+a message is scanned a single time however many intents are configured.
+Below NAIVE_SCAN_MAX_KEYWORDS a per-keyword substring scan is faster: each
+`in` check runs in C, while the automaton steps through the message in
+Python. The crossover comes from benchmarks/bench_intent_matcher.py. Both
+paths return the same intent.
+"""
+import random
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Keyword count up to which the substring scan beats the automaton
+NAIVE_SCAN_MAX_KEYWORDS = 128
+
+
+class IntentMatcher:
+    """Match messages against an ordered list of (intent, keywords)
+
+    Intents listed earlier win when several match, which keeps the
+    precedence of the old if/elif chain. `compiled` forces the automaton on
+    or off; by default it is used above NAIVE_SCAN_MAX_KEYWORDS keywords.
+    """
+
+    def __init__(self, intents: Sequence[Tuple[str, Iterable[str]]], compiled: Optional[bool] = None):
+        self.intent_names: List[str] = []
+        # (priority, keyword) in priority order, for the substring scan
+        self._keywords: List[Tuple[int, str]] = []
+        # Trie nodes: goto transitions, failure link, best (lowest) priority output
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[int]] = [None]
+
+        for priority, (name, keywords) in enumerate(intents):
+            self.intent_names.append(name)
+            for keyword in keywords:
+                if keyword:
+                    self._keywords.append((priority, keyword.lower()))
+
+        self.compiled = len(self._keywords) > NAIVE_SCAN_MAX_KEYWORDS if compiled is None else compiled
+        if self.compiled:
+            for priority, keyword in self._keywords:
+                self._add_keyword(keyword, priority)
+            self._build_failure_links()
+
+    def _add_keyword(self, keyword: str, priority: int) -> None:
+        if not keyword:
+            return
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+            node = next_node
+        self._output[node] = _best(self._output[node], priority)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                # Merge outputs reachable through the failure link
+                self._output[child] = _best(self._output[child], self._output[self._fail[child]])
+
+    def match(self, message: str) -> Optional[str]:
+        """Return the highest-priority intent found in message, or None"""
+        if not self.compiled:
+            message = message.lower()
+            for priority, keyword in self._keywords:
+                if keyword in message:
+                    return self.intent_names[priority]
+            return None
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        best: Optional[int] = None
+        node = 0
+
+        for char in message.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found = output[node]
+            if found is not None and (best is None or found < best):
+                best = found
+                if best == 0:
+                    break
+
+        return self.intent_names[best] if best is not None else None
+
+
+class IntentResponder:
+    """Pick a reply from one (intent, keywords, replies) table, falling back when nothing matches"""
+
+    def __init__(self, intents: Sequence[Tuple[str, Iterable[str], Sequence[str]]], fallback: Sequence[str]):
+        # An intent listed twice keeps the replies of its first (winning) row
+        self.replies: Dict[str, List[str]] = {}
+        for name, _, replies in intents:
+            self.replies.setdefault(name, list(replies))
+        self.fallback = list(fallback)
+        self.matcher = IntentMatcher([(name, keywords) for name, keywords, _ in intents])
+
+    def respond(self, message: str, rng: random.Random = random) -> str:
+        intent = self.matcher.match(message)
+        return rng.choice(self.replies.get(intent) or self.fallback)
+
+
+def _best(current: Optional[int], candidate: Optional[int]) -> Optional[int]:
+    if current is None:
+        return candidate
+    if candidate is None:
+        return current
+    return min(current, candidate)
@@ -1,26 +1,36 @@
 """
 Main FastAPI application (No Auth Version)
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
+import asyncio
 import os
 from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 
-from database import engine, get_db
-from models import Base
-from routers import webtoons_router, scenes_router, interactions_router, chat_router
+from database import engine, replica_engines, get_db, check_schema_revision, check_connection
+from routers import webtoons_router, scenes_router, interactions_router, chat_router, uploads_router
+from session import SessionMiddleware, require_session_secret
+from metrics import MetricsMiddleware, metrics_authorized, metrics_payload
+from compression import CompressionMiddleware
+from static_files import UploadStaticFiles
+import sql_profiler
+import collaborative
+import ranking
 
 load_dotenv()
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Session tokens and upload URLs are signed; refuse to start without a key
+require_session_secret()
 
 # Create FastAPI app
 app = FastAPI(
     title="GLTR Webtoon Platform API",
     description="API for GLTR Webtoon Platform",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson encodes UUID/datetime natively and is much faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -32,25 +42,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Session middleware (parses the session cookie once, sets it only when new)
+app.add_middleware(SessionMiddleware)
+
+# SQL profiler (opt-in via SQL_PROFILING=true)
+if sql_profiler.SQL_PROFILING:
+    sql_profiler.instrument_engine(engine)
+    for replica_engine in replica_engines:
+        sql_profiler.instrument_engine(replica_engine)
+    app.add_middleware(sql_profiler.SQLProfilerMiddleware)
+
+# Brotli/gzip compression for JSON and text responses
+app.add_middleware(CompressionMiddleware)
+
+# Metrics middleware (outermost, so it times the whole request)
+app.add_middleware(MetricsMiddleware)
+
 # Static files
 if not os.path.exists("static"):
     os.makedirs("static")
 if not os.path.exists("static/uploads"):
     os.makedirs("static/uploads")
     
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", UploadStaticFiles(directory="static"), name="static")
 
 # Include routers
 app.include_router(webtoons_router.router, prefix="/api/webtoons", tags=["Webtoons"])
 app.include_router(scenes_router.router, prefix="/api/scenes", tags=["Scenes"])
 app.include_router(interactions_router.router, prefix="/api/interactions", tags=["Interactions"])
 app.include_router(chat_router.router, prefix="/api", tags=["Chat"])
+app.include_router(uploads_router.router, prefix="/api/uploads", tags=["Uploads"])
+
+# Periodic jobs started by this worker, cancelled on shutdown
+background_jobs = []
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    # Tables are already created by Base.metadata.create_all(bind=engine)
-    print("Database initialized")
+    """Refuse to serve against an unmigrated database"""
+    # Schema changes are applied by `alembic upgrade head`, not at startup
+    if os.getenv("SKIP_SCHEMA_CHECK", "false").lower() != "true":
+        check_schema_revision()
+    print("Database schema up to date")
+    
+    # Periodic trending score recompute (one worker at a time via advisory lock)
+    if ranking.TRENDING_REFRESH_SECONDS > 0:
+        background_jobs.append(asyncio.create_task(ranking.run_periodically()))
+    
+    # Periodic co-like neighbour rebuild, same locking scheme
+    if collaborative.CO_LIKE_REFRESH_SECONDS > 0:
+        background_jobs.append(asyncio.create_task(collaborative.run_periodically()))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Runs after in-flight requests and their background tasks have drained
+
+    Nothing is buffered in memory: requests and the periodic jobs commit
+    their own writes, so draining them and closing connections is all the
+    shutdown there is.
+    """
+    for job in background_jobs:
+        job.cancel()
+    await asyncio.gather(*background_jobs, return_exceptions=True)
+    
+    # Close pooled connections cleanly instead of dropping them at exit
+    for db_engine in (engine, *replica_engines):
+        db_engine.dispose()
 
 @app.get("/")
 async def root():
@@ -62,6 +118,27 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 unless the primary database answers"""
+    try:
+        await run_in_threadpool(check_connection)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable"
+        )
+    return {"status": "ready"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics endpoint; see metrics.py for access"""
+    # Hidden rather than 401 so it is not advertised to the public
+    if not metrics_authorized(request.headers.get("authorization")):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8001, reload=True)
\ No newline at end of file
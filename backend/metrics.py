@@ -0,0 +1,202 @@
+"""
+Prometheus metrics for the API
+
+Exposes per-route request counts, latency and in-flight gauges, database
+pool and statement metrics, and upload byte counters.
+
+Under gunicorn each worker is its own process. gunicorn.conf.py sets
+PROMETHEUS_MULTIPROC_DIR, where every worker writes its samples to
+memory-mapped files, and a scrape aggregates all of them through
+MultiProcessCollector. Gauges declare how workers combine ("livesum": the
+total across live workers). The master serves that aggregate on the
+internal-only METRICS_BIND address. Without the variable (uvicorn in
+development) the default registry of this one process is exposed.
+
+`/metrics` in main.py is only answered for `Authorization: Bearer
+$METRICS_TOKEN`, and is hidden (404) when no token is configured.
+"""
+import hmac
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+
+REQUEST_COUNT = Counter(
+    "http_requests_total", "HTTP requests handled",
+    ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled",
+    ["method"], multiprocess_mode="livesum"
+)
+DB_STATEMENTS = Histogram(
+    "db_statements_per_request", "SQL statements executed per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool",
+    ["pool"]
+)
+DB_POOL_CONNECTS = Counter(
+    "db_pool_connections_created_total", "New DBAPI connections opened by the pool",
+    ["pool"]
+)
+DB_POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations_total", "Pooled connections discarded as broken or stale",
+    ["pool"]
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT"
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+UPLOAD_BYTES = Counter(
+    "upload_bytes_total", "Bytes received through upload endpoints",
+    ["kind"]
+)
+
+# Pool occupancy, refreshed whenever a connection is checked out or returned
+POOL_GAUGES = [
+    (Gauge(name, doc, ["pool"], multiprocess_mode="livesum"), attr)
+    for name, attr, doc in (
+        ("db_pool_size", "size", "Configured pool size"),
+        ("db_pool_checked_out", "checkedout", "Connections currently checked out"),
+        ("db_pool_checked_in", "checkedin", "Idle connections in the pool"),
+        ("db_pool_overflow", "overflow", "Connections opened beyond pool_size"),
+    )
+]
+DB_POOL_MAX_CONNECTIONS = Gauge(
+    "db_pool_max_connections", "pool_size + max_overflow",
+    ["pool"], multiprocess_mode="livesum"
+)
+
+# Statement counter for the request being handled, if any
+_statement_count: ContextVar[Optional[list]] = ContextVar("statement_count", default=None)
+
+
+def update_pool_gauges(engine, pool: str, returning: int = 0) -> None:
+    """Record the engine's pool occupancy, counting `returning` connections as already checked in"""
+    adjust = {"checkedout": -returning, "checkedin": returning}
+    for gauge, attr in POOL_GAUGES:
+        method = getattr(engine.pool, attr, None)
+        if callable(method):  # SingletonThreadPool.size is a plain int
+            gauge.labels(pool=pool).set(method() + adjust.get(attr, 0))
+
+    # Ceiling for capacity planning: connections this process may open
+    max_overflow = getattr(engine.pool, "_max_overflow", None)
+    if max_overflow is not None and max_overflow >= 0:
+        DB_POOL_MAX_CONNECTIONS.labels(pool=pool).set(engine.pool.size() + max_overflow)
+
+
+def instrument_engine(engine, pool: str = "primary") -> None:
+    """Attach pool and statement listeners to a SQLAlchemy engine"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        counter = _statement_count.get()
+        if counter is not None:
+            counter[0] += 1
+
+    @event.listens_for(engine.pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.labels(pool=pool).inc()
+        update_pool_gauges(engine, pool)
+
+    @event.listens_for(engine.pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        # Fires just before the pool takes the connection back
+        update_pool_gauges(engine, pool, returning=1)
+
+    @event.listens_for(engine.pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTS.labels(pool=pool).inc()
+
+    @event.listens_for(engine.pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATIONS.labels(pool=pool).inc()
+
+    update_pool_gauges(engine, pool)
+
+
+def observe_checkout_wait(seconds: float) -> None:
+    DB_POOL_WAIT.observe(seconds)
+
+
+def record_checkout_timeout() -> None:
+    DB_POOL_TIMEOUTS.inc()
+
+
+def record_upload(kind: str, size: int) -> None:
+    UPLOAD_BYTES.labels(kind=kind).inc(size)
+
+
+def metrics_registry():
+    """Every worker's samples under gunicorn, otherwise this process's"""
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_payload():
+    """Return the exposition body and its content type"""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def metrics_authorized(authorization: Optional[str]) -> bool:
+    """True for the METRICS_TOKEN bearer token; always False when no token is set"""
+    token = os.getenv("METRICS_TOKEN", "")
+    return bool(token) and hmac.compare_digest(authorization or "", f"Bearer {token}")
+
+
+class MetricsMiddleware:
+    """Record request count, latency, in-flight and DB statements per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        counter = [0]
+        token = _statement_count.set(counter)
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.labels(method=method).inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.labels(method=method).dec()
+            _statement_count.reset(token)
+
+            # Use the route template, not the raw path, to keep label cardinality bounded
+            route = getattr(scope.get("route"), "path", None)
+            if route is None:
+                route = "/static" if scope["path"].startswith("/static/") else "unmatched"
+            REQUEST_COUNT.labels(method=method, route=route, status=str(status_code)).inc()
+            REQUEST_LATENCY.labels(method=method, route=route).observe(elapsed)
+            DB_STATEMENTS.labels(route=route).observe(counter[0])
@@ -0,0 +1,68 @@
+"""
+Alembic environment
+
+Uses DATABASE_URL (same as the app) unless the config sets sqlalchemy.url
+(tests point it at a scratch database), and models.Base metadata, so
+`alembic revision --autogenerate` diffs against models.py.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from database import DATABASE_URL
+from models import Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+url = config.get_main_option("sqlalchemy.url") or DATABASE_URL
+
+# Maintained by migrations and triggers only (see 0004_full_text_search)
+UNMAPPED_COLUMNS = {"search_vector"}
+UNMAPPED_INDEX_SUFFIXES = ("_search", "_trgm")
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Keep autogenerate from dropping database-owned search objects"""
+    if type_ == "column" and reflected and name in UNMAPPED_COLUMNS:
+        return False
+    if type_ == "index" and reflected and compare_to is None and name.endswith(UNMAPPED_INDEX_SUFFIXES):
+        return False
+    return True
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout (`alembic upgrade head --sql`)"""
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connectable = create_engine(url, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        # One transaction per revision, so autocommit_block() (CREATE INDEX
+        # CONCURRENTLY) only commits the revisions applied before it
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            transaction_per_migration=True
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,199 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Only the baseline tables, as models.py defined them before the read-state
+and archive work. Anything added since lives in a later revision.
+
+An existing database created by Base.metadata.create_all holds these
+tables, so stamp it at this revision and upgrade from there:
+
+    alembic stamp 0001 && alembic upgrade head
+
+0002 and 0008 skip indexes and tables that already exist. That covers a
+database where create_all also built the chat read-state tables. A database
+built from database/schema.sql uses other index names, so compare it
+against this file before stamping.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def uuid_pk():
+    return sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True)
+
+
+def upgrade():
+    op.create_table(
+        'webtoons',
+        uuid_pk(),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('summary', sa.Text()),
+        sa.Column('description', sa.Text()),
+        sa.Column('thumbnail_url', sa.String(500)),
+        sa.Column('author_name', sa.String(100)),
+        sa.Column('genre', sa.String(50)),
+        sa.Column('theme', sa.String(100)),
+        sa.Column('story_style', sa.String(100)),
+        sa.Column('number_of_cuts', sa.Integer()),
+        sa.Column('status', sa.String(20)),
+        sa.Column('view_count', sa.Integer()),
+        sa.Column('like_count', sa.Integer()),
+        sa.Column('session_id', sa.String(100)),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_index('ix_webtoons_id', 'webtoons', ['id'])
+
+    op.create_table(
+        'scenes',
+        uuid_pk(),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id', ondelete='CASCADE')),
+        sa.Column('scene_number', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(500)),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('scene_description', sa.Text()),
+        sa.Column('image_url', sa.String(500)),
+        sa.Column('narration', sa.Text()),
+        sa.Column('character_positions', sa.JSON()),
+        sa.Column('panel_layout', sa.String(50)),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.UniqueConstraint('webtoon_id', 'scene_number'),
+    )
+    op.create_index('ix_scenes_id', 'scenes', ['id'])
+    op.create_index('idx_scenes_order', 'scenes', ['webtoon_id', 'scene_number'])
+
+    op.create_table(
+        'dialogues',
+        uuid_pk(),
+        sa.Column('scene_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('scenes.id', ondelete='CASCADE')),
+        sa.Column('who_speaks', sa.String(100), nullable=False),
+        sa.Column('dialogue', sa.Text(), nullable=False),
+        sa.Column('fact_or_fiction', sa.String(20)),
+        sa.Column('dialogue_order', sa.Integer()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.UniqueConstraint('scene_id', 'dialogue_order'),
+    )
+    op.create_index('ix_dialogues_id', 'dialogues', ['id'])
+    op.create_index('idx_dialogues_order', 'dialogues', ['scene_id', 'dialogue_order'])
+
+    op.create_table(
+        'characters',
+        uuid_pk(),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id', ondelete='CASCADE')),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('appearance', sa.Text()),
+        sa.Column('personality', sa.Text()),
+        sa.Column('role', sa.String(50)),
+        sa.Column('image_url', sa.String(500)),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_index('ix_characters_id', 'characters', ['id'])
+
+    op.create_table(
+        'edit_history',
+        uuid_pk(),
+        sa.Column('scene_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('scenes.id', ondelete='CASCADE')),
+        sa.Column('session_id', sa.String(100)),
+        sa.Column('edit_type', sa.String(50)),
+        sa.Column('original_content', sa.JSON()),
+        sa.Column('edited_content', sa.JSON()),
+        sa.Column('edit_command', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_index('ix_edit_history_id', 'edit_history', ['id'])
+
+    op.create_table(
+        'comments',
+        uuid_pk(),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id', ondelete='CASCADE')),
+        sa.Column('scene_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('scenes.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('author_name', sa.String(100)),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('parent_comment_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('comments.id'), nullable=True),
+        sa.Column('session_id', sa.String(100)),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_index('ix_comments_id', 'comments', ['id'])
+
+    op.create_table(
+        'generation_sessions',
+        uuid_pk(),
+        sa.Column('session_id', sa.String(100), nullable=False),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id'), nullable=True),
+        sa.Column('input_text', sa.Text()),
+        sa.Column('generation_result', sa.JSON()),
+        sa.Column('summary', sa.Text()),
+        sa.Column('theme', sa.String(200)),
+        sa.Column('story_style', sa.String(100)),
+        sa.Column('story_title', sa.String(200)),
+        sa.Column('number_of_cuts', sa.Integer()),
+        sa.Column('original_language', sa.String(10)),
+        sa.Column('llm_model', sa.String(50)),
+        sa.Column('status', sa.String(20)),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_index('ix_generation_sessions_id', 'generation_sessions', ['id'])
+    op.create_index('ix_generation_sessions_session_id', 'generation_sessions', ['session_id'])
+
+    op.create_table(
+        'image_assets',
+        uuid_pk(),
+        sa.Column('file_path', sa.String(500), nullable=False),
+        sa.Column('file_name', sa.String(200), nullable=False),
+        sa.Column('file_size', sa.Integer()),
+        sa.Column('mime_type', sa.String(50)),
+        sa.Column('width', sa.Integer()),
+        sa.Column('height', sa.Integer()),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id'), nullable=True),
+        sa.Column('scene_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('scenes.id'), nullable=True),
+        sa.Column('asset_type', sa.String(50)),
+        sa.Column('session_id', sa.String(100)),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_index('ix_image_assets_id', 'image_assets', ['id'])
+
+    op.create_table(
+        'likes',
+        uuid_pk(),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id', ondelete='CASCADE')),
+        sa.Column('session_id', sa.String(100), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.UniqueConstraint('webtoon_id', 'session_id'),
+    )
+    op.create_index('ix_likes_id', 'likes', ['id'])
+
+    op.create_table(
+        'chat_messages',
+        uuid_pk(),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id', ondelete='CASCADE')),
+        sa.Column('scene_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('scenes.id'), nullable=True),
+        sa.Column('sender_type', sa.String(20), nullable=False),
+        sa.Column('sender_name', sa.String(100)),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('session_id', sa.String(100)),
+        sa.Column('is_read', sa.Boolean()),
+        sa.Column('character_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('characters.id'), nullable=True),
+        sa.Column('parent_message_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('chat_messages.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_index('ix_chat_messages_id', 'chat_messages', ['id'])
+
+
+def downgrade():
+    for table in (
+        'chat_messages', 'likes', 'image_assets', 'generation_sessions', 'comments', 'edit_history',
+        'characters', 'dialogues', 'scenes', 'webtoons',
+    ):
+        op.drop_table(table)
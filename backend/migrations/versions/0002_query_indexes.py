@@ -0,0 +1,66 @@
+"""composite and partial indexes for hot queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Replaces single-column indexes with ones matching how the routers filter
+and sort:
+
+- webtoon list: status = 'published' OR session_id = ?, newest first
+- comments: roots by (webtoon_id, parent_comment_id) ordered by created_at,
+  replies by parent_comment_id ordered by created_at
+- chat history: roots by (webtoon_id, parent_message_id) ordered by
+  created_at, replies by parent_message_id ordered by created_at
+- likes: session_id, webtoon_id lookups
+
+Indexes are built with CREATE INDEX CONCURRENTLY outside the migration
+transaction, so writes to these tables are not blocked while they build.
+
+Check plans with `python benchmarks/check_index_usage.py`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    ('idx_webtoons_published_created', 'webtoons', [sa.text('created_at DESC')], "status = 'published'"),
+    ('idx_webtoons_session_created', 'webtoons', ['session_id', sa.text('created_at DESC')], None),
+    ('idx_comments_thread', 'comments', ['webtoon_id', 'parent_comment_id', 'created_at'], None),
+    ('idx_comments_replies', 'comments', ['parent_comment_id', 'created_at'], 'parent_comment_id IS NOT NULL'),
+    ('idx_chat_messages_thread', 'chat_messages', ['webtoon_id', 'parent_message_id', 'created_at'], None),
+    ('idx_chat_messages_replies', 'chat_messages', ['parent_message_id', 'created_at'], 'parent_message_id IS NOT NULL'),
+    ('idx_likes_session_webtoon', 'likes', ['session_id', 'webtoon_id'], None),
+]
+
+# Single-column indexes from database/schema.sql made redundant by the above
+REPLACED = [
+    ('idx_webtoons_session', 'webtoons', ['session_id']),
+    ('idx_comments_webtoon', 'comments', ['webtoon_id']),
+    ('idx_chat_messages_parent', 'chat_messages', ['parent_message_id']),
+    ('idx_likes_session', 'likes', ['session_id']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, if_not_exists=True, postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None
+            )
+        for name, table, _ in REPLACED:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
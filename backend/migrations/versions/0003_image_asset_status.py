@@ -0,0 +1,24 @@
+"""image asset status and variants for direct uploads
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # server_default backfills existing rows without a table rewrite (PG 11+)
+    op.add_column('image_assets', sa.Column('status', sa.String(20), server_default='ready'))
+    op.add_column('image_assets', sa.Column('variants', sa.JSON()))
+
+
+def downgrade():
+    op.drop_column('image_assets', 'variants')
+    op.drop_column('image_assets', 'status')
@@ -0,0 +1,127 @@
+"""full-text search vectors, triggers and trigram indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Adds a search_vector tsvector column to webtoons, scenes and dialogues,
+kept current by BEFORE INSERT/UPDATE triggers and indexed with GIN.
+Postgres ships no Korean text search configuration, so vectors use the
+'simple' config (no stemming); pg_trgm indexes on title and summary cover
+partial words such as a noun with a particle attached ("편지를" vs "편지").
+
+Existing rows are backfilled after the triggers are committed, outside the
+migration transaction, in batches of BACKFILL_BATCH ids walked in key
+order. Each batch commits on its own, so row locks are held for one batch
+rather than for the whole table, as with the concurrent index builds in
+0002. Rows written during the backfill get their vector from the trigger.
+
+search_vector is owned by the database and deliberately not mapped in
+models.py (env.py excludes it from autogenerate). PostgreSQL only; on other
+databases search.py uses an in-process index instead.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# table -> tsvector expression over NEW
+VECTORS = {
+    'webtoons': (
+        "setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(NEW.summary, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C') || "
+        "setweight(to_tsvector('simple', coalesce(NEW.genre, '') || ' ' || coalesce(NEW.theme, '')), 'D')"
+    ),
+    'scenes': (
+        "setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'B') || "
+        "to_tsvector('simple', coalesce(NEW.scene_description, '') || ' ' || coalesce(NEW.narration, ''))"
+    ),
+    'dialogues': "to_tsvector('simple', coalesce(NEW.dialogue, ''))",
+}
+
+BACKFILL_BATCH = 5000
+
+TRIGRAM_INDEXES = [
+    ('idx_webtoons_title_trgm', 'webtoons', 'title'),
+    ('idx_webtoons_summary_trgm', 'webtoons', 'summary'),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, expression in VECTORS.items():
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {expression};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_search_vector_trigger
+            BEFORE INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+        """)
+
+    with op.get_context().autocommit_block():
+        for table in VECTORS:
+            backfill(table)
+        for table in VECTORS:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table}_search "
+                f"ON {table} USING GIN (search_vector)"
+            )
+        for name, table, column in TRIGRAM_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} USING GIN ({column} gin_trgm_ops)"
+            )
+
+
+def backfill(table: str) -> None:
+    """Fire the trigger for existing rows, one committed batch at a time"""
+    if op.get_context().as_sql:
+        # Offline (--sql) scripts cannot loop on results
+        op.execute(f"UPDATE {table} SET id = id")
+        return
+
+    connection = op.get_bind()
+    statement = sa.text(f"""
+        WITH batch AS (
+            SELECT id FROM {table}
+            WHERE CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)
+            ORDER BY id
+            LIMIT :limit
+        )
+        UPDATE {table} SET id = {table}.id FROM batch WHERE {table}.id = batch.id
+        RETURNING {table}.id
+    """)
+    after = None
+    while True:
+        ids = connection.execute(statement, {"after": after, "limit": BACKFILL_BATCH}).scalars().all()
+        if not ids:
+            return
+        after = str(max(ids))
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, _, _ in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for table in VECTORS:
+        op.execute(f"DROP INDEX IF EXISTS idx_{table}_search")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,53 @@
+"""trending scores and activity indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# Let each recompute read only activity since its checkpoint
+ACTIVITY_INDEXES = [
+    ('idx_webtoons_updated', 'webtoons', 'updated_at'),
+    ('idx_comments_created', 'comments', 'created_at'),
+    ('idx_chat_messages_created', 'chat_messages', 'created_at'),
+]
+
+
+def upgrade():
+    op.create_table(
+        'webtoon_scores',
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('views_seen', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('likes_seen', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_index('idx_webtoon_scores_rank', 'webtoon_scores', [sa.text('score DESC'), 'webtoon_id'])
+
+    op.create_table(
+        'score_checkpoints',
+        sa.Column('name', sa.String(50), primary_key=True),
+        sa.Column('checkpoint', sa.DateTime(), nullable=False),
+    )
+
+    with op.get_context().autocommit_block():
+        for name, table, column in ACTIVITY_INDEXES:
+            op.create_index(name, table, [column], if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in ACTIVITY_INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    op.drop_table('score_checkpoints')
+    op.drop_index('idx_webtoon_scores_rank', table_name='webtoon_scores')
+    op.drop_table('webtoon_scores')
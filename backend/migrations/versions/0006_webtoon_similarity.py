@@ -0,0 +1,44 @@
+"""content-similarity vectors and precomputed neighbours
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+Populate after upgrading with `python recommendations.py`; publishes and
+edits keep it current from then on.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'webtoon_vectors',
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+
+    op.create_table(
+        'webtoon_similarities',
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('similar_webtoon_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+    )
+    op.create_index('idx_webtoon_similarities_rank', 'webtoon_similarities', ['webtoon_id', 'rank'])
+
+
+def downgrade():
+    op.drop_index('idx_webtoon_similarities_rank', table_name='webtoon_similarities')
+    op.drop_table('webtoon_similarities')
+    op.drop_table('webtoon_vectors')
@@ -0,0 +1,36 @@
+"""co-like neighbour lists
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+Populated by collaborative.py (periodically in the app, or
+`python collaborative.py`).
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'webtoon_co_likes',
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('similar_webtoon_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('co_likes', sa.Integer(), nullable=False),
+    )
+    op.create_index('idx_webtoon_co_likes_rank', 'webtoon_co_likes', ['webtoon_id', 'rank'])
+
+
+def downgrade():
+    op.drop_index('idx_webtoon_co_likes_rank', table_name='webtoon_co_likes')
+    op.drop_table('webtoon_co_likes')
@@ -0,0 +1,75 @@
+"""chat unread counters, read markers and message archive
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+Before this migration series existed, create_all at import could already
+have built these tables. Every statement here is IF NOT EXISTS, so such a
+database can be stamped at 0001 and upgraded like any other.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def uuid_pk():
+    return sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True)
+
+
+def upgrade():
+    op.create_table(
+        'chat_messages_archive',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id', ondelete='CASCADE')),
+        sa.Column('scene_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('sender_type', sa.String(20), nullable=False),
+        sa.Column('sender_name', sa.String(100)),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('session_id', sa.String(100)),
+        sa.Column('is_read', sa.Boolean()),
+        sa.Column('character_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('parent_message_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('archived_at', sa.DateTime()),
+        if_not_exists=True,
+    )
+    op.create_index(
+        'idx_chat_messages_archive_thread', 'chat_messages_archive',
+        ['webtoon_id', 'parent_message_id', 'created_at'], if_not_exists=True
+    )
+
+    op.create_table(
+        'chat_unread_counters',
+        uuid_pk(),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('session_id', sa.String(100), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.UniqueConstraint('webtoon_id', 'session_id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_chat_unread_counters_id', 'chat_unread_counters', ['id'], if_not_exists=True)
+
+    op.create_table(
+        'chat_read_markers',
+        uuid_pk(),
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('webtoons.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('session_id', sa.String(100), nullable=False),
+        sa.Column('last_read_message_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('last_read_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.UniqueConstraint('webtoon_id', 'session_id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_chat_read_markers_id', 'chat_read_markers', ['id'], if_not_exists=True)
+
+
+def downgrade():
+    for table in ('chat_read_markers', 'chat_unread_counters', 'chat_messages_archive'):
+        op.drop_table(table)
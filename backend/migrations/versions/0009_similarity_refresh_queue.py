@@ -0,0 +1,29 @@
+"""similarity refresh queue
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+Published and edited webtoons are queued here and indexed by
+`python recommendations.py --worker`, outside the API workers.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'similarity_refresh_queue',
+        sa.Column('webtoon_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('queued_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('similarity_refresh_queue')
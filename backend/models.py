@@ -1,7 +1,7 @@
 """
 Database models for GLTR Webtoon Platform (Updated for Text2Cuts)
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, ForeignKey, Boolean, JSON, LargeBinary, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -38,6 +38,14 @@ class Webtoon(Base):
     images = relationship("ImageAsset", back_populates="webtoon")
     likes = relationship("Like", back_populates="webtoon", cascade="all, delete-orphan")
     chat_messages = relationship("ChatMessage", back_populates="webtoon", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # 목록: status = 'published' OR session_id = ?, 최신순
+        Index('idx_webtoons_published_created', text('created_at DESC'),
+              postgresql_where=text("status = 'published'")),
+        Index('idx_webtoons_session_created', 'session_id', text('created_at DESC')),
+        Index('idx_webtoons_updated', 'updated_at'),
+    )
 
 
 class Scene(Base):
@@ -141,6 +149,13 @@ class Comment(Base):
     webtoon = relationship("Webtoon", back_populates="comments")
     scene = relationship("Scene", back_populates="comments")
     replies = relationship("Comment", backref="parent", remote_side=[id])
+    
+    __table_args__ = (
+        Index('idx_comments_thread', 'webtoon_id', 'parent_comment_id', 'created_at'),
+        Index('idx_comments_replies', 'parent_comment_id', 'created_at',
+              postgresql_where=text('parent_comment_id IS NOT NULL')),
+        Index('idx_comments_created', 'created_at'),
+    )
 
 
 class GenerationSession(Base):
@@ -179,6 +194,8 @@ class ImageAsset(Base):
     scene_id = Column(UUID(as_uuid=True), ForeignKey('scenes.id'), nullable=True)
     asset_type = Column(String(50))
     session_id = Column(String(100))
+    status = Column(String(20), default='ready')  # pending, processing, ready, failed
+    variants = Column(JSON)  # 변형 이미지 이름 -> URL
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -199,6 +216,7 @@ class Like(Base):
     
     __table_args__ = (
         UniqueConstraint('webtoon_id', 'session_id'),
+        Index('idx_likes_session_webtoon', 'session_id', 'webtoon_id'),
     )
 
 
@@ -221,4 +239,131 @@ class ChatMessage(Base):
     webtoon = relationship("Webtoon", back_populates="chat_messages")
     scene = relationship("Scene", back_populates="chat_messages")
     character = relationship("Character", back_populates="chat_messages")
-    replies = relationship("ChatMessage", backref="parent", remote_side=[id])
\ No newline at end of file
+    replies = relationship("ChatMessage", backref="parent", remote_side=[id])
+    
+    __table_args__ = (
+        Index('idx_chat_messages_thread', 'webtoon_id', 'parent_message_id', 'created_at'),
+        Index('idx_chat_messages_replies', 'parent_message_id', 'created_at',
+              postgresql_where=text('parent_message_id IS NOT NULL')),
+        Index('idx_chat_messages_created', 'created_at'),
+    )
+
+
+class ChatMessageArchive(Base):
+    """Cold storage for old chat threads moved out of chat_messages"""
+    __tablename__ = 'chat_messages_archive'
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'))
+    scene_id = Column(UUID(as_uuid=True), nullable=True)
+    sender_type = Column(String(20), nullable=False)
+    sender_name = Column(String(100))
+    message = Column(Text, nullable=False)
+    session_id = Column(String(100))
+    is_read = Column(Boolean, default=False)
+    character_id = Column(UUID(as_uuid=True), nullable=True)
+    parent_message_id = Column(UUID(as_uuid=True), nullable=True)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_chat_messages_archive_thread', 'webtoon_id', 'parent_message_id', 'created_at'),
+    )
+
+class ChatUnreadCounter(Base):
+    __tablename__ = 'chat_unread_counters'
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'), nullable=False)
+    session_id = Column(String(100), nullable=False)  # 답장을 받는 독자 세션
+    unread_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('webtoon_id', 'session_id'),
+    )
+
+
+class ChatReadMarker(Base):
+    __tablename__ = 'chat_read_markers'
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'), nullable=False)
+    session_id = Column(String(100), nullable=False)
+    last_read_message_id = Column(UUID(as_uuid=True), nullable=True)
+    last_read_at = Column(DateTime, nullable=False)  # 이 시각까지의 메시지는 모두 읽음
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('webtoon_id', 'session_id'),
+    )
+
+
+class WebtoonScore(Base):
+    """Time-decayed popularity, kept in log space (see ranking.py)"""
+    __tablename__ = 'webtoon_scores'
+    
+    webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True)
+    score = Column(Float, nullable=False)  # log(Σ 가중치 × e^(λ·(t - 기준시각)))
+    views_seen = Column(Integer, default=0, nullable=False)  # 마지막 반영 시점의 view_count
+    likes_seen = Column(Integer, default=0, nullable=False)  # 마지막 반영 시점의 like_count
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_webtoon_scores_rank', text('score DESC'), 'webtoon_id'),
+    )
+
+
+class ScoreCheckpoint(Base):
+    """Named high-water marks of periodic jobs (see ranking.py, collaborative.py)"""
+    __tablename__ = 'score_checkpoints'
+    
+    name = Column(String(50), primary_key=True)
+    checkpoint = Column(DateTime, nullable=False)
+
+
+class WebtoonVector(Base):
+    """Hashed n-gram term counts for content similarity (see recommendations.py)"""
+    __tablename__ = 'webtoon_vectors'
+    
+    webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True)
+    vector = Column(LargeBinary, nullable=False)  # float32 × VECTOR_DIM
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class WebtoonSimilarity(Base):
+    """Precomputed top-k most similar webtoons per webtoon"""
+    __tablename__ = 'webtoon_similarities'
+    
+    webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True)
+    similar_webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True)
+    rank = Column(Integer, nullable=False)  # 1 = 가장 유사
+    score = Column(Float, nullable=False)  # 코사인 유사도
+    
+    __table_args__ = (
+        Index('idx_webtoon_similarities_rank', 'webtoon_id', 'rank'),
+    )
+
+
+class SimilarityRefresh(Base):
+    """Webtoons waiting for the similarity worker (see recommendations.py)"""
+    __tablename__ = 'similarity_refresh_queue'
+    
+    # 외래 키 없음: 삭제된 웹툰도 다른 웹툰의 이웃 목록에서 빠져야 함
+    webtoon_id = Column(UUID(as_uuid=True), primary_key=True)
+    queued_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # 마지막으로 대기열에 넣은 시각
+
+
+class WebtoonCoLike(Base):
+    """Precomputed "readers who liked this also liked" lists (see collaborative.py)"""
+    __tablename__ = 'webtoon_co_likes'
+    
+    webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True)
+    similar_webtoon_id = Column(UUID(as_uuid=True), ForeignKey('webtoons.id', ondelete='CASCADE'), primary_key=True)
+    rank = Column(Integer, nullable=False)  # 1 = 가장 관련 높음
+    score = Column(Float, nullable=False)  # 축소 보정한 코사인 유사도
+    co_likes = Column(Integer, nullable=False)  # 두 웹툰을 모두 좋아요한 세션 수
+    
+    __table_args__ = (
+        Index('idx_webtoon_co_likes_rank', 'webtoon_id', 'rank'),
+    )
@@ -0,0 +1,33 @@
+"""
+Opaque cursors for keyset pagination
+
+A cursor is the sort key of the last item on a page, JSON-encoded and
+base64url-wrapped so clients treat it as an opaque string. The next page
+is then one indexed range scan instead of an OFFSET that rescans every
+skipped row.
+"""
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([str(v) if not isinstance(v, (int, float)) else v for v in values],
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor holding `size` values; 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
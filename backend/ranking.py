@@ -0,0 +1,160 @@
+"""
+Trending scores
+
+Each unit of activity (view, like, comment, reader chat message) adds
+weight × e^(-λ·age) to a webtoon's popularity, so activity loses half its
+value every TRENDING_HALF_LIFE_HOURS. Rather than decaying every row on each
+run, scores are stored in a fixed reference frame:
+
+    score = log Σ weight × e^(λ·(t - EPOCH))
+
+Ordering by this value is the same as ordering by the decayed sum at any
+instant. Old rows never need rewriting, and a recompute only touches
+webtoons with activity since the last checkpoint. View and like counts
+are read as deltas against the counts already folded in. Comments and chat
+messages are read by created_at from the checkpoint forward.
+
+Runs every TRENDING_REFRESH_SECONDS inside the app (0 disables). It can
+also run from cron with `python ranking.py`.
+"""
+import asyncio
+import logging
+import math
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal
+from models import ChatMessage, Comment, ScoreCheckpoint, Webtoon, WebtoonScore
+
+logger = logging.getLogger(__name__)
+
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+TRENDING_REFRESH_SECONDS = int(os.getenv("TRENDING_REFRESH_SECONDS", "60"))
+
+DECAY = math.log(2) / (TRENDING_HALF_LIFE_HOURS * 3600)  # λ, per second
+EPOCH = datetime(2024, 1, 1)
+
+PUBLISH_WEIGHT = 10.0
+VIEW_WEIGHT = 1.0
+LIKE_WEIGHT = 8.0
+COMMENT_WEIGHT = 12.0
+CHAT_WEIGHT = 4.0
+
+CHECKPOINT_NAME = "trending"
+# Leave in-flight transactions time to commit before their rows are counted
+COMMIT_LAG = timedelta(seconds=5)
+ADVISORY_LOCK_ID = 44_044  # Only one worker recomputes at a time on Postgres
+CHUNK_SIZE = 500
+
+
+def log_weight(weight: float, at: datetime) -> float:
+    return math.log(weight) + DECAY * (at - EPOCH).total_seconds()
+
+
+def logaddexp(a, b):
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def recompute_trending(db: Session, now: datetime = None) -> int:
+    """Fold activity since the last checkpoint into webtoon_scores; returns webtoons updated"""
+    now = now or datetime.utcnow()
+    until = now - COMMIT_LAG
+
+    checkpoint = db.query(ScoreCheckpoint).filter(ScoreCheckpoint.name == CHECKPOINT_NAME).first()
+    since = checkpoint.checkpoint if checkpoint else None
+
+    terms = defaultdict(list)
+
+    # View/like counters: deltas are exact regardless of the window
+    counters = db.query(Webtoon.id, Webtoon.view_count, Webtoon.like_count, Webtoon.created_at)
+    if since is not None:
+        counters = counters.filter(Webtoon.updated_at > since)
+    counters = {row.id: row for row in counters}
+
+    # Comments and reader chat messages, decayed from when they were written
+    for model, weight, criteria in (
+        (Comment, COMMENT_WEIGHT, ()),
+        (ChatMessage, CHAT_WEIGHT, (ChatMessage.sender_type == "user",)),
+    ):
+        query = db.query(model.webtoon_id, model.created_at).filter(model.created_at <= until, *criteria)
+        if since is not None:
+            query = query.filter(model.created_at > since)
+        for webtoon_id, created_at in query:
+            if webtoon_id is not None and created_at is not None:
+                terms[webtoon_id].append(log_weight(weight, created_at))
+
+    affected = list(set(counters) | set(terms))
+    for start in range(0, len(affected), CHUNK_SIZE):
+        chunk = affected[start:start + CHUNK_SIZE]
+        scores = {
+            score.webtoon_id: score
+            for score in db.query(WebtoonScore).filter(WebtoonScore.webtoon_id.in_(chunk))
+        }
+        for webtoon_id in chunk:
+            db_score = scores.get(webtoon_id)
+            counter = counters.get(webtoon_id)
+            value = db_score.score if db_score else None
+
+            if db_score is None:
+                db_score = WebtoonScore(webtoon_id=webtoon_id, views_seen=0, likes_seen=0)
+                if counter is not None and counter.created_at is not None:
+                    # New webtoons start with a small boost from their publish time
+                    value = log_weight(PUBLISH_WEIGHT, counter.created_at)
+                db.add(db_score)
+
+            if counter is not None:
+                new_views = (counter.view_count or 0) - db_score.views_seen
+                new_likes = (counter.like_count or 0) - db_score.likes_seen
+                if new_views > 0:
+                    terms[webtoon_id].append(log_weight(VIEW_WEIGHT * new_views, now))
+                if new_likes > 0:
+                    terms[webtoon_id].append(log_weight(LIKE_WEIGHT * new_likes, now))
+                db_score.views_seen = counter.view_count or 0
+                db_score.likes_seen = counter.like_count or 0
+
+            for term in terms.get(webtoon_id, ()):
+                value = logaddexp(value, term)
+            db_score.score = value if value is not None else log_weight(PUBLISH_WEIGHT, now)
+
+    if checkpoint is None:
+        db.add(ScoreCheckpoint(name=CHECKPOINT_NAME, checkpoint=until))
+    else:
+        checkpoint.checkpoint = until
+    db.commit()
+    return len(affected)
+
+
+def refresh_trending() -> int:
+    """Recompute in a fresh session, skipping if another worker holds the lock"""
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            locked = db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID}).scalar()
+            if not locked:
+                return 0
+        return recompute_trending(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(interval: int = TRENDING_REFRESH_SECONDS):
+    """Background loop started by main.py"""
+    while True:
+        try:
+            updated = await run_in_threadpool(refresh_trending)
+            logger.debug("Trending scores updated for %d webtoons", updated)
+        except Exception:
+            logger.exception("Trending recompute failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    print(f"Updated trending scores for {refresh_trending()} webtoons")
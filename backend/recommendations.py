@@ -0,0 +1,367 @@
+"""
+Content-based "similar webtoons"
+
+Each published webtoon gets a hashed n-gram vector built from its title,
+summary, genre, theme, story_style and scene text (description, narration
+and dialogue lines). Character bigrams and
+trigrams inside each word let Korean words match across particles
+("편지를" / "편지"). Raw term counts are stored per webtoon in
+webtoon_vectors. TF-IDF weighting is applied when similarities are
+computed, so IDF always reflects the current corpus.
+
+The top SIMILAR_TOP_K neighbours per webtoon are precomputed into
+webtoon_similarities, and /api/webtoons/{id}/similar is a single indexed
+lookup.
+
+- rebuild_similarities(): full batch rebuild (cron or `python recommendations.py`);
+  cosine similarity in row blocks with NumPy
+- refresh_webtoons(): incremental update for queued webtoons; one
+  matrix-vector product each, then only the neighbour lists a webtoon
+  enters or leaves are rewritten
+
+Publishing a webtoon, editing one of its SIMILARITY_FIELDS, or writing
+its scenes or dialogues only queues it in similarity_refresh_queue as part
+of the request's transaction. The
+API workers never compute vectors. A separate process drains the queue,
+loading the vector matrix once per batch:
+
+    cd backend && python recommendations.py --worker   # poll forever
+    cd backend && python recommendations.py --once     # drain the queue and exit
+
+Batches and full rebuilds hold a Postgres advisory lock, so only one runs
+at a time. NumPy is imported inside the functions that use it; the
+routers import this module only to queue.
+"""
+import argparse
+import logging
+import os
+import re
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, upsert
+from models import Dialogue, Scene, SimilarityRefresh, Webtoon, WebtoonSimilarity, WebtoonVector
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DIM = 2048  # hashed feature space; float32 → 8 KiB per webtoon
+SIMILAR_TOP_K = int(os.getenv("SIMILAR_TOP_K", "12"))
+BLOCK_SIZE = 512
+SCENE_TEXT_LIMIT = 5000  # characters of scene text per webtoon
+
+TEXT_FIELDS = (("title", 3.0), ("summary", 2.0))
+CATEGORY_FIELDS = (("genre", 2.0), ("theme", 1.5), ("story_style", 1.0))
+SCENE_WEIGHT = 1.0
+
+# Webtoon columns whose change can move it in the index
+SIMILARITY_FIELDS = frozenset(field for field, _ in TEXT_FIELDS + CATEGORY_FIELDS) | {"status"}
+# Scene and dialogue columns that feed the scene text (order decides what SCENE_TEXT_LIMIT keeps)
+SCENE_TEXT_FIELDS = frozenset({"scene_description", "narration", "scene_number"})
+DIALOGUE_TEXT_FIELDS = frozenset({"dialogue", "dialogue_order"})
+
+SIMILARITY_WORKER_POLL_SECONDS = float(os.getenv("SIMILARITY_WORKER_POLL_SECONDS", "5"))
+QUEUE_BATCH = 200
+ADVISORY_LOCK_ID = 45_045
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def features(text: Optional[str]):
+    """Words plus in-word character bigrams and trigrams"""
+    for token in TOKEN_RE.findall(text.lower()) if text else ():
+        yield token
+        for n in (2, 3):
+            for i in range(len(token) - n + 1):
+                yield f"#{token[i:i + n]}"
+
+
+def bucket(feature: str) -> int:
+    # crc32 rather than hash(): stable across processes and restarts
+    return zlib.crc32(feature.encode("utf-8")) % VECTOR_DIM
+
+
+def raw_vector(webtoon, scene_text: str = ""):
+    import numpy as np
+    
+    vector = np.zeros(VECTOR_DIM, dtype=np.float32)
+    for field, weight in TEXT_FIELDS:
+        for feature in features(getattr(webtoon, field)):
+            vector[bucket(feature)] += weight
+    for field, weight in CATEGORY_FIELDS:
+        value = getattr(webtoon, field)
+        if value:
+            vector[bucket(f"{field}={value.strip().lower()}")] += weight
+    for feature in features(scene_text[:SCENE_TEXT_LIMIT]):
+        vector[bucket(feature)] += SCENE_WEIGHT
+    return vector
+
+
+def scene_texts(db: Session, webtoon_ids) -> Dict:
+    texts, seen_scenes = {}, set()
+    rows = db.query(
+        Scene.webtoon_id, Scene.id, Scene.scene_description, Scene.narration, Dialogue.dialogue
+    ).outerjoin(Dialogue, Dialogue.scene_id == Scene.id).filter(
+        Scene.webtoon_id.in_(webtoon_ids)
+    ).order_by(Scene.webtoon_id, Scene.scene_number, Dialogue.dialogue_order)
+    for webtoon_id, scene_id, description, narration, line in rows:
+        parts = texts.setdefault(webtoon_id, [])
+        if scene_id not in seen_scenes:
+            seen_scenes.add(scene_id)
+            parts.append(description or "")
+            parts.append(narration or "")
+        parts.append(line or "")
+    return {webtoon_id: " ".join(parts) for webtoon_id, parts in texts.items()}
+
+
+def tfidf(counts):
+    """Sublinear TF × smoothed IDF, rows L2-normalised"""
+    import numpy as np
+    
+    df = np.count_nonzero(counts, axis=0).astype(np.float32)
+    idf = np.log((1 + counts.shape[0]) / (1 + df)) + 1
+    weighted = np.log1p(counts) * idf
+    norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return weighted / norms
+
+
+def load_vectors(db: Session):
+    """(ids, counts matrix) for every published webtoon with a stored vector"""
+    import numpy as np
+    
+    rows = db.query(WebtoonVector.webtoon_id, WebtoonVector.vector).join(
+        Webtoon, Webtoon.id == WebtoonVector.webtoon_id
+    ).filter(Webtoon.status == "published").all()
+    ids = [webtoon_id for webtoon_id, _ in rows]
+    counts = np.zeros((len(rows), VECTOR_DIM), dtype=np.float32)
+    for i, (_, vector) in enumerate(rows):
+        counts[i] = np.frombuffer(vector, dtype=np.float32)
+    return ids, counts
+
+
+def top_k(similarities, k: int):
+    """Column indices of the k largest values per row, best first"""
+    import numpy as np
+    
+    k = min(k, similarities.shape[1])
+    if k <= 0:
+        return np.empty((similarities.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(similarities, part, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(part, order, axis=1)
+
+
+def write_neighbours(db: Session, webtoon_id, neighbours) -> List:
+    """Replace one webtoon's list with [(similar_id, score), ...] in rank order; returns what was kept"""
+    db.query(WebtoonSimilarity).filter(WebtoonSimilarity.webtoon_id == webtoon_id).delete(
+        synchronize_session=False
+    )
+    kept = [(similar_id, score) for similar_id, score in neighbours if score > 0]
+    db.add_all([
+        WebtoonSimilarity(webtoon_id=webtoon_id, similar_webtoon_id=similar_id, rank=rank, score=score)
+        for rank, (similar_id, score) in enumerate(kept, start=1)
+    ])
+    return kept
+
+
+def store_vectors(db: Session, webtoons) -> None:
+    texts = scene_texts(db, [webtoon.id for webtoon in webtoons])
+    existing = {
+        vector.webtoon_id: vector
+        for vector in db.query(WebtoonVector).filter(WebtoonVector.webtoon_id.in_([w.id for w in webtoons]))
+    }
+    for webtoon in webtoons:
+        data = raw_vector(webtoon, texts.get(webtoon.id, "")).tobytes()
+        db_vector = existing.get(webtoon.id)
+        if db_vector is None:
+            db.add(WebtoonVector(webtoon_id=webtoon.id, vector=data, updated_at=datetime.utcnow()))
+        else:
+            db_vector.vector = data
+            db_vector.updated_at = datetime.utcnow()
+
+
+def rebuild_similarities(db: Session, k: int = SIMILAR_TOP_K) -> int:
+    """Recompute every vector and neighbour list; returns webtoons indexed"""
+    import numpy as np
+    
+    webtoons = db.query(Webtoon).filter(Webtoon.status == "published").all()
+    for start in range(0, len(webtoons), BLOCK_SIZE):
+        store_vectors(db, webtoons[start:start + BLOCK_SIZE])
+    db.flush()
+
+    ids, counts = load_vectors(db)
+    matrix = tfidf(counts)
+
+    db.query(WebtoonSimilarity).delete(synchronize_session=False)
+    for start in range(0, len(ids), BLOCK_SIZE):
+        block = matrix[start:start + BLOCK_SIZE] @ matrix.T
+        # Never recommend a webtoon for itself
+        block[np.arange(block.shape[0]), np.arange(start, start + block.shape[0])] = -1
+        for row, neighbours in enumerate(top_k(block, k)):
+            write_neighbours(db, ids[start + row], [(ids[j], float(block[row, j])) for j in neighbours])
+    db.commit()
+    return len(ids)
+
+
+def place_webtoon(db: Session, webtoon_id, ids, matrix, index: Optional[int], current: Dict, k: int) -> None:
+    """
+    Move one webtoon to where it now belongs in the neighbour lists.
+
+    ids and matrix are the TF-IDF rows of every published webtoon, index is
+    this webtoon's row (None once it is unpublished or deleted), and
+    current holds every list as {owner: [(similar_id, score), ...]}. It is
+    kept in step with what gets written.
+    """
+    # Drop it from every list it appears in; re-added below if still eligible
+    affected = {
+        owner for owner, neighbours in current.items()
+        if owner != webtoon_id and any(similar_id == webtoon_id for similar_id, _ in neighbours)
+    }
+
+    if index is None:
+        current.pop(webtoon_id, None)
+    else:
+        similarities = matrix @ matrix[index]
+        similarities[index] = -1
+        current[webtoon_id] = write_neighbours(
+            db, webtoon_id, [(ids[j], float(similarities[j])) for j in top_k(similarities[None, :], k)[0]]
+        )
+
+        # Lists it should now enter: its score beats their current k-th neighbour
+        for j, owner in enumerate(ids):
+            if j == index or similarities[j] <= 0:
+                continue
+            neighbours = [n for n in current.get(owner, []) if n[0] != webtoon_id]
+            if len(neighbours) < k or similarities[j] > neighbours[-1][1] or owner in affected:
+                neighbours.append((webtoon_id, float(similarities[j])))
+                neighbours.sort(key=lambda n: n[1], reverse=True)
+                current[owner] = write_neighbours(db, owner, neighbours[:k])
+                affected.discard(owner)
+
+    # Lists it left: removed without a replacement until the next full rebuild
+    for owner in affected:
+        current[owner] = write_neighbours(db, owner, [n for n in current[owner] if n[0] != webtoon_id])
+
+    # The next webtoon in the batch may rewrite the same lists
+    db.flush()
+
+
+def refresh_webtoons(db: Session, webtoon_ids, k: int = SIMILAR_TOP_K) -> None:
+    """Update the given webtoons' vectors and their places in the neighbour lists; caller commits"""
+    webtoons = db.query(Webtoon).filter(Webtoon.id.in_(webtoon_ids)).all()
+    published = [webtoon for webtoon in webtoons if webtoon.status == "published"]
+    withdrawn = set(webtoon_ids) - {webtoon.id for webtoon in published}
+
+    if withdrawn:
+        db.query(WebtoonVector).filter(WebtoonVector.webtoon_id.in_(withdrawn)).delete(synchronize_session=False)
+        db.query(WebtoonSimilarity).filter(WebtoonSimilarity.webtoon_id.in_(withdrawn)).delete(
+            synchronize_session=False
+        )
+    if published:
+        store_vectors(db, published)
+    db.flush()
+
+    # One matrix for the whole batch
+    ids, counts = load_vectors(db)
+    matrix = tfidf(counts)
+    positions = {webtoon_id: i for i, webtoon_id in enumerate(ids)}
+
+    current = {}
+    for owner, similar_id, score in db.query(
+        WebtoonSimilarity.webtoon_id, WebtoonSimilarity.similar_webtoon_id, WebtoonSimilarity.score
+    ).order_by(WebtoonSimilarity.webtoon_id, WebtoonSimilarity.rank):
+        current.setdefault(owner, []).append((similar_id, score))
+
+    for webtoon_id in webtoon_ids:
+        place_webtoon(db, webtoon_id, ids, matrix, positions.get(webtoon_id), current, k)
+
+
+def queue_refresh(db: Session, webtoon_id) -> None:
+    """Queue a webtoon for the similarity worker, inside the caller's transaction"""
+    statement = upsert(db, SimilarityRefresh).values(webtoon_id=webtoon_id, queued_at=datetime.utcnow())
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[SimilarityRefresh.webtoon_id],
+        set_={"queued_at": statement.excluded.queued_at}
+    ))
+
+
+def acquire_lock(db: Session) -> bool:
+    """Transaction-scoped advisory lock on Postgres; other databases run a single worker"""
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID}).scalar()
+
+
+def process_queue(limit: int = QUEUE_BATCH) -> int:
+    """Refresh up to `limit` queued webtoons in one batch; returns how many were handled"""
+    db = SessionLocal()
+    try:
+        if not acquire_lock(db):
+            return 0
+        queued = db.query(SimilarityRefresh.webtoon_id, SimilarityRefresh.queued_at).order_by(
+            SimilarityRefresh.queued_at
+        ).limit(limit).all()
+        if not queued:
+            return 0
+
+        refresh_webtoons(db, [webtoon_id for webtoon_id, _ in queued])
+
+        # A webtoon edited again meanwhile has a newer queued_at and stays queued
+        for webtoon_id, queued_at in queued:
+            db.query(SimilarityRefresh).filter(
+                SimilarityRefresh.webtoon_id == webtoon_id,
+                SimilarityRefresh.queued_at == queued_at
+            ).delete(synchronize_session=False)
+        db.commit()
+        return len(queued)
+    finally:
+        db.close()
+
+
+def rebuild() -> int:
+    """Full rebuild in a fresh session, skipping if a batch or another rebuild holds the lock"""
+    db = SessionLocal()
+    try:
+        if not acquire_lock(db):
+            return 0
+        return rebuild_similarities(db)
+    finally:
+        db.close()
+
+
+def run_worker(poll_seconds: float = SIMILARITY_WORKER_POLL_SECONDS) -> None:
+    while True:
+        try:
+            handled = process_queue()
+        except Exception:
+            logger.exception("Similarity refresh failed")
+            handled = 0
+        if not handled:
+            time.sleep(poll_seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build similar-webtoon neighbour lists")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--worker", action="store_true", help="Process queued webtoons forever")
+    group.add_argument("--once", action="store_true", help="Drain the queue and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.worker:
+        run_worker()
+    elif args.once:
+        handled = 0
+        while True:
+            batch = process_queue()
+            if not batch:
+                break
+            handled += batch
+        print(f"Refreshed {handled} queued webtoons")
+    else:
+        print(f"Indexed {rebuild()} webtoons")
@@ -2,67 +2,146 @@
 Chat router for character interactions
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, case, and_, select
 from typing import List, Optional
 import random
+import uuid
 from datetime import datetime
 
-from database import get_db
-from models import ChatMessage, Webtoon, Character, Scene
+from database import get_db, get_read_db, upsert
+from models import ChatMessage, Webtoon, Character, Scene, ChatUnreadCounter, ChatReadMarker
 from schemas import (
     ChatMessageCreate, ChatMessageUpdate, 
-    ChatMessageResponse, CharacterResponse
+    ChatMessageResponse, CharacterResponse,
+    ChatReadMarkerUpdate, ChatReadMarkerResponse
 )
-from session import get_or_create_session_id, get_session_id, check_ownership
+from serializers import row_to_dict
+from session import get_or_create_session_id, get_session_id, check_ownership, set_read_cache_headers
+from intent_matcher import IntentResponder
 
 router = APIRouter()
 
-# Predefined AI responses for demo
-AI_RESPONSES = {
-    "greeting": [
+# Maximum number of ids sent to the database in one IN (...) list
+READ_BATCH_CHUNK_SIZE = 500
+
+# Predefined AI replies for demo: (intent, keywords, replies) in priority order.
+# Earlier intents win when several match; unmatched messages get CHAT_FALLBACK.
+CHAT_INTENTS = [
+    ("greeting", ["안녕", "하이", "hello", "hi"], [
         "안녕하세요! 저는 이 웹툰의 주인공입니다. 궁금한 점이 있으면 물어보세요!",
         "반가워요! 오늘은 어떤 이야기를 나누고 싶으신가요?",
         "안녕하세요! 제 이야기를 읽어주셔서 감사합니다."
-    ],
-    "story": [
+    ]),
+    ("story", ["이야기", "스토리", "줄거리", "story"], [
         "이 장면에서 제가 느낀 감정은 정말 복잡했어요. 더 자세히 이야기해드릴게요.",
         "작가님이 이 부분을 그리실 때 특별히 신경 쓰신 부분이에요.",
         "이 에피소드는 제 인생의 전환점이었죠. 많은 고민 끝에 내린 결정이었어요."
-    ],
-    "question": [
+    ]),
+    ("question", ["?", "왜", "어떻게", "무엇", "누가"], [
         "흥미로운 질문이네요! 제 생각을 말씀드리자면...",
         "그 부분은 다음 에피소드에서 더 자세히 다뤄질 예정이에요!",
         "좋은 관찰이세요! 사실 그 장면에는 숨겨진 의미가 있어요."
+    ]),
+]
+
+CHAT_FALLBACK = [
+    "더 자세히 알고 싶으시다면 다음 에피소드를 기대해주세요!",
+    "저도 그 장면을 연기하면서 많은 생각이 들었어요.",
+    "독자님의 해석이 정말 흥미롭네요! 저도 비슷한 생각을 했어요."
+]
+
+# Intents for characters with a given role, matched before the shared CHAT_INTENTS
+CHARACTER_INTENTS = {
+    "악역": [
+        ("greeting", ["안녕", "하이", "hello", "hi"], [
+            "흥, 나를 찾아오다니 용기가 대단하군.",
+            "또 너로군. 이번엔 무슨 용건이지?"
+        ]),
+        ("plan", ["계획", "목적", "음모"], [
+            "내 계획을 그렇게 쉽게 알려줄 것 같나?",
+            "곧 알게 될 거다. 모든 게 내 뜻대로 움직이고 있으니까."
+        ]),
     ],
-    "general": [
-        "더 자세히 알고 싶으시다면 다음 에피소드를 기대해주세요!",
-        "저도 그 장면을 연기하면서 많은 생각이 들었어요.",
-        "독자님의 해석이 정말 흥미롭네요! 저도 비슷한 생각을 했어요."
-    ]
+    "조연": [
+        ("hero", ["주인공", "친구"], [
+            "그 친구 말이죠? 겉으론 강해 보여도 속은 여린 사람이에요.",
+            "제가 옆에서 지켜본 주인공은 누구보다 진심이었어요."
+        ]),
+    ],
+}
+
+# Built once at import
+default_responder = IntentResponder(CHAT_INTENTS, CHAT_FALLBACK)
+character_responders = {
+    role: IntentResponder(intents + CHAT_INTENTS, CHAT_FALLBACK)
+    for role, intents in CHARACTER_INTENTS.items()
 }
 
-def generate_ai_response(message: str) -> str:
-    """Generate AI response based on user message"""
-    message_lower = message.lower()
+def generate_ai_response(message: str, role: Optional[str] = None) -> str:
+    """Generate AI response based on user message, in the voice of a character role"""
+    return character_responders.get(role, default_responder).respond(message)
+
+def adjust_unread_count(db: Session, webtoon_id, session_id: str, delta: int) -> None:
+    """Apply delta to the unread counter of a (webtoon, session) pair, never going below zero
     
-    if any(word in message_lower for word in ["안녕", "하이", "hello", "hi"]):
-        return random.choice(AI_RESPONSES["greeting"])
-    elif any(word in message_lower for word in ["이야기", "스토리", "줄거리", "story"]):
-        return random.choice(AI_RESPONSES["story"])
-    elif "?" in message or any(word in message_lower for word in ["왜", "어떻게", "무엇", "누가"]):
-        return random.choice(AI_RESPONSES["question"])
-    else:
-        return random.choice(AI_RESPONSES["general"])
+    A single INSERT ... ON CONFLICT DO UPDATE, so concurrent first replies
+    cannot both insert the row and the increment is applied in SQL.
+    """
+    if not delta:
+        return
+    
+    statement = upsert(db, ChatUnreadCounter).values(
+        id=uuid.uuid4(),
+        webtoon_id=webtoon_id,
+        session_id=session_id,
+        unread_count=max(delta, 0),
+        updated_at=datetime.utcnow()
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[ChatUnreadCounter.webtoon_id, ChatUnreadCounter.session_id],
+        set_={
+            "unread_count": case(
+                (ChatUnreadCounter.unread_count + delta > 0, ChatUnreadCounter.unread_count + delta),
+                else_=0
+            ),
+            "updated_at": statement.excluded.updated_at
+        }
+    ))
+
+def count_unread_replies(db: Session, session_id: str, *criteria) -> dict:
+    """Count unread character replies in the session's threads per webtoon
+    
+    Replies older than the session's read marker for that webtoon count as read.
+    """
+    root = aliased(ChatMessage)
+    rows = db.query(
+        ChatMessage.webtoon_id, func.count(ChatMessage.id)
+    ).join(
+        root, ChatMessage.parent_message_id == root.id
+    ).outerjoin(
+        ChatReadMarker, and_(
+            ChatReadMarker.webtoon_id == ChatMessage.webtoon_id,
+            ChatReadMarker.session_id == session_id
+        )
+    ).filter(
+        root.session_id == session_id,
+        ChatMessage.sender_type == "character",
+        ChatMessage.is_read == False,
+        (ChatReadMarker.last_read_at == None) | (ChatMessage.created_at > ChatReadMarker.last_read_at),
+        *criteria
+    ).group_by(ChatMessage.webtoon_id).all()
+    
+    return dict(rows)
 
 @router.post("/chat/messages", response_model=ChatMessageResponse)
 async def create_chat_message(
     message: ChatMessageCreate,
     request: Request,
-    response: Response,
     db: Session = Depends(get_db)
 ):
     """Create a new chat message"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_or_create_session_id(request)
     
     # Check if webtoon exists
     db_webtoon = db.query(Webtoon).filter(Webtoon.id == message.webtoon_id).first()
@@ -97,11 +176,11 @@ async def create_chat_message(
             ).first()
         
         # Generate AI response
-        ai_response_text = generate_ai_response(message.message)
+        ai_response_text = generate_ai_response(message.message, main_character.role if main_character else None)
         
         ai_message = ChatMessage(
             webtoon_id=message.webtoon_id,
-            episode_id=message.episode_id,
+            scene_id=db_message.scene_id,
             sender_type="character",
             sender_name=main_character.name if main_character else "주인공",
             message=ai_response_text,
@@ -111,45 +190,83 @@ async def create_chat_message(
             parent_message_id=db_message.id
         )
         db.add(ai_message)
+        
+        # The reply is unread for the session that asked
+        adjust_unread_count(db, message.webtoon_id, session_id, 1)
         db.commit()
     
     # Prepare response
-    message_dict = db_message.__dict__
+    message_dict = row_to_dict(db_message)
     message_dict['is_owner'] = True
     message_dict['replies'] = []
     
-    return ChatMessageResponse(**message_dict)
+    return message_dict
 
 @router.get("/chat/messages/webtoon/{webtoon_id}", response_model=List[ChatMessageResponse])
 async def get_webtoon_chat_messages(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     request: Request,
     response: Response,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db)
+    before: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get chat messages for a webtoon"""
-    session_id = get_or_create_session_id(request, response)
+    """Get chat messages for a webtoon
     
-    # Get messages
-    messages = db.query(ChatMessage).filter(
+    Pass the id of the oldest message already loaded as `before` to page
+    backwards without an offset scan.
+    """
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
+    
+    query = db.query(ChatMessage).filter(
         ChatMessage.webtoon_id == webtoon_id,
         ChatMessage.parent_message_id == None
-    ).order_by(ChatMessage.created_at.desc()).limit(limit).offset(offset).all()
+    )
+    
+    if before:
+        cursor = db.query(ChatMessage).filter(
+            ChatMessage.id == before,
+            ChatMessage.webtoon_id == webtoon_id
+        ).first()
+        
+        if not cursor:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cursor message not found"
+            )
+        
+        # Keyset condition on (created_at, id) served by idx_chat_messages_thread
+        query = query.filter(
+            (ChatMessage.created_at < cursor.created_at) |
+            ((ChatMessage.created_at == cursor.created_at) & (ChatMessage.id < cursor.id))
+        )
+        offset = 0
+    
+    read_marker = session_id and db.query(ChatReadMarker.last_read_at).filter(
+        ChatReadMarker.webtoon_id == webtoon_id,
+        ChatReadMarker.session_id == session_id
+    ).scalar()
+    
+    # Get messages
+    messages = query.order_by(
+        ChatMessage.created_at.desc(), ChatMessage.id.desc()
+    ).limit(limit).offset(offset).all()
     
     # Prepare responses with ownership flags
     message_responses = []
     for msg in messages:
-        message_dict = msg.__dict__
+        message_dict = row_to_dict(msg)
         message_dict['is_owner'] = check_ownership(session_id, msg.session_id)
+        message_dict['is_read'] = msg.is_read or (read_marker is not None and msg.created_at <= read_marker)
         message_dict['replies'] = []
         
         # Get character info if it's a character message
         if msg.character_id:
             character = db.query(Character).filter(Character.id == msg.character_id).first()
             if character:
-                message_dict['character'] = CharacterResponse(**character.__dict__)
+                message_dict['character'] = row_to_dict(character)
         
         # Get replies
         replies = db.query(ChatMessage).filter(
@@ -157,17 +274,18 @@ async def get_webtoon_chat_messages(
         ).order_by(ChatMessage.created_at).all()
         
         for reply in replies:
-            reply_dict = reply.__dict__
+            reply_dict = row_to_dict(reply)
             reply_dict['is_owner'] = check_ownership(session_id, reply.session_id)
+            reply_dict['is_read'] = reply.is_read or (read_marker is not None and reply.created_at <= read_marker)
             
             if reply.character_id:
                 character = db.query(Character).filter(Character.id == reply.character_id).first()
                 if character:
-                    reply_dict['character'] = CharacterResponse(**character.__dict__)
+                    reply_dict['character'] = row_to_dict(character)
             
-            message_dict['replies'].append(ChatMessageResponse(**reply_dict))
+            message_dict['replies'].append(reply_dict)
         
-        message_responses.append(ChatMessageResponse(**message_dict))
+        message_responses.append(message_dict)
     
     # Reverse to show oldest first
     message_responses.reverse()
@@ -176,7 +294,7 @@ async def get_webtoon_chat_messages(
 
 @router.put("/chat/messages/{message_id}/read", response_model=ChatMessageResponse)
 async def mark_message_as_read(
-    message_id: str,
+    message_id: uuid.UUID,
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -189,7 +307,13 @@ async def mark_message_as_read(
             detail="Session not found"
         )
     
-    db_message = db.query(ChatMessage).filter(ChatMessage.id == message_id).first()
+    # Same scope as the batch endpoint: the caller's messages and replies in their threads
+    root = aliased(ChatMessage)
+    own_thread_ids = select(root.id).where(root.session_id == session_id)
+    db_message = db.query(ChatMessage).filter(
+        ChatMessage.id == message_id,
+        (ChatMessage.session_id == session_id) | ChatMessage.parent_message_id.in_(own_thread_ids)
+    ).first()
     
     if not db_message:
         raise HTTPException(
@@ -198,43 +322,51 @@ async def mark_message_as_read(
         )
     
     # Mark as read
+    if count_unread_replies(db, session_id, ChatMessage.id == db_message.id):
+        adjust_unread_count(db, db_message.webtoon_id, session_id, -1)
     db_message.is_read = True
     db.commit()
     db.refresh(db_message)
     
     # Prepare response
-    message_dict = db_message.__dict__
+    message_dict = row_to_dict(db_message)
     message_dict['is_owner'] = check_ownership(session_id, db_message.session_id)
     message_dict['replies'] = []
     
-    return ChatMessageResponse(**message_dict)
+    return message_dict
 
 @router.get("/chat/unread-count/webtoon/{webtoon_id}")
 async def get_unread_count(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get count of unread messages for a webtoon"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
+    if not session_id:
+        return {"unread_count": 0}
     
-    # Count unread character messages (not from the current user)
-    unread_count = db.query(ChatMessage).filter(
-        ChatMessage.webtoon_id == webtoon_id,
-        ChatMessage.sender_type == "character",
-        ChatMessage.is_read == False
-    ).count()
+    # Read the maintained counter instead of counting messages
+    unread_count = db.query(ChatUnreadCounter.unread_count).filter(
+        ChatUnreadCounter.webtoon_id == webtoon_id,
+        ChatUnreadCounter.session_id == session_id
+    ).scalar()
     
-    return {"unread_count": unread_count}
+    return {"unread_count": unread_count or 0}
 
 @router.post("/chat/messages/batch-read")
 async def mark_messages_as_read(
-    message_ids: List[str],
+    message_ids: List[uuid.UUID],
     request: Request,
     db: Session = Depends(get_db)
 ):
-    """Mark multiple messages as read"""
+    """Mark multiple messages as read
+    
+    Only messages in the caller's own threads are touched. Prefer the read
+    marker endpoint when marking everything up to a point as read.
+    """
     session_id = get_session_id(request)
     
     if not session_id:
@@ -243,11 +375,112 @@ async def mark_messages_as_read(
             detail="Session not found"
         )
     
-    # Update all messages
-    db.query(ChatMessage).filter(
-        ChatMessage.id.in_(message_ids)
-    ).update({"is_read": True}, synchronize_session=False)
+    root = aliased(ChatMessage)
+    own_thread_ids = select(root.id).where(root.session_id == session_id)
+    
+    for start in range(0, len(message_ids), READ_BATCH_CHUNK_SIZE):
+        chunk = message_ids[start:start + READ_BATCH_CHUNK_SIZE]
+        
+        # Count unread replies per webtoon before flipping them
+        unread_by_webtoon = count_unread_replies(db, session_id, ChatMessage.id.in_(chunk))
+        
+        db.query(ChatMessage).filter(
+            ChatMessage.id.in_(chunk),
+            (ChatMessage.session_id == session_id) | ChatMessage.parent_message_id.in_(own_thread_ids)
+        ).update({"is_read": True}, synchronize_session=False)
+        
+        for webtoon_id, count in unread_by_webtoon.items():
+            adjust_unread_count(db, webtoon_id, session_id, -count)
     
     db.commit()
     
-    return {"message": "Messages marked as read", "count": len(message_ids)}
\ No newline at end of file
+    return {"message": "Messages marked as read", "count": len(message_ids)}
+
+@router.put("/chat/read-marker/webtoon/{webtoon_id}", response_model=ChatReadMarkerResponse)
+async def update_read_marker(
+    webtoon_id: uuid.UUID,
+    marker: ChatReadMarkerUpdate,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Mark everything up to a message (and its replies) as read for this session
+    
+    Stores a single high-water mark per (webtoon, session) instead of
+    updating every message row. The unread counter drops by the replies the
+    mark newly covers rather than being recounted.
+    """
+    session_id = get_session_id(request)
+    
+    if not session_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session not found"
+        )
+    
+    db_message = db.query(ChatMessage).filter(
+        ChatMessage.id == marker.message_id,
+        ChatMessage.webtoon_id == webtoon_id
+    ).first()
+    
+    if not db_message:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Message not found"
+        )
+    
+    # A root message covers the replies in its thread
+    read_until = db.query(func.max(ChatMessage.created_at)).filter(
+        (ChatMessage.id == db_message.id) | (ChatMessage.parent_message_id == db_message.id)
+    ).scalar()
+    
+    # Replies still unread under the current mark that the new mark covers
+    newly_read = sum(count_unread_replies(
+        db, session_id,
+        ChatMessage.webtoon_id == db_message.webtoon_id,
+        ChatMessage.created_at <= read_until
+    ).values())
+    
+    # The mark only moves forward
+    statement = upsert(db, ChatReadMarker).values(
+        id=uuid.uuid4(),
+        webtoon_id=db_message.webtoon_id,
+        session_id=session_id,
+        last_read_message_id=db_message.id,
+        last_read_at=read_until,
+        updated_at=datetime.utcnow()
+    )
+    moves_forward = statement.excluded.last_read_at > ChatReadMarker.last_read_at
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[ChatReadMarker.webtoon_id, ChatReadMarker.session_id],
+        set_={
+            "last_read_message_id": case(
+                (moves_forward, statement.excluded.last_read_message_id),
+                else_=ChatReadMarker.last_read_message_id
+            ),
+            "last_read_at": case(
+                (moves_forward, statement.excluded.last_read_at),
+                else_=ChatReadMarker.last_read_at
+            ),
+            "updated_at": statement.excluded.updated_at
+        }
+    ))
+    adjust_unread_count(db, db_message.webtoon_id, session_id, -newly_read)
+    db.commit()
+    
+    last_read_message_id, last_read_at = db.query(
+        ChatReadMarker.last_read_message_id, ChatReadMarker.last_read_at
+    ).filter(
+        ChatReadMarker.webtoon_id == db_message.webtoon_id,
+        ChatReadMarker.session_id == session_id
+    ).one()
+    unread_count = db.query(ChatUnreadCounter.unread_count).filter(
+        ChatUnreadCounter.webtoon_id == db_message.webtoon_id,
+        ChatUnreadCounter.session_id == session_id
+    ).scalar()
+    
+    return ChatReadMarkerResponse(
+        webtoon_id=db_message.webtoon_id,
+        last_read_message_id=last_read_message_id,
+        last_read_at=last_read_at,
+        unread_count=unread_count or 0
+    )
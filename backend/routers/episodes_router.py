@@ -3,8 +3,8 @@ Episodes router (No Auth Version)
 """
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Request
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-import os
 import uuid
 
 from database import get_db
@@ -13,6 +13,9 @@ from schemas import (
     EpisodeCreate, EpisodeUpdate, EpisodeResponse,
     EditHistoryCreate, EditHistoryResponse
 )
+from metrics import record_upload
+from image_processing import IMAGE_EXTENSIONS
+from storage import get_storage
 from session import get_session_id, check_ownership
 
 router = APIRouter()
@@ -220,28 +223,23 @@ async def upload_episode_image(
             detail="Not authorized to update this episode"
         )
     
-    # Validate file type
-    if not file.content_type.startswith("image/"):
+    # Validate file type; the extension comes from the allow-list, never the client's file name
+    file_extension = IMAGE_EXTENSIONS.get(file.content_type)
+    if not file_extension:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be an image"
         )
     
     # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = f"static/uploads/episodes/{unique_filename}"
-    
-    # Create directory if not exists
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    key = f"uploads/episodes/{uuid.uuid4()}{file_extension}"
     
     # Save image
     contents = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    record_upload("episode", len(contents))
     
-    # Update episode image URL
-    db_episode.image_url = f"/static/uploads/episodes/{unique_filename}"
+    # Store and update episode image URL
+    db_episode.image_url = await run_in_threadpool(get_storage().save, key, contents, file.content_type)
     db.commit()
     
     return {"image_url": db_episode.image_url}
@@ -4,26 +4,27 @@ User interactions router (No Auth Version)
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
+import uuid
 
-from database import get_db
+from database import get_db, get_read_db
 from models import Like, Webtoon, Comment
 from schemas import (
     LikeCreate, LikeResponse,
     CommentCreate, CommentUpdate, CommentResponse
 )
-from session import get_or_create_session_id, get_session_id, check_ownership
+from serializers import row_to_dict
+from session import get_or_create_session_id, get_session_id, check_ownership, set_read_cache_headers
 
 router = APIRouter()
 
 @router.post("/like", response_model=LikeResponse)
 async def toggle_like(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     request: Request,
-    response: Response,
     db: Session = Depends(get_db)
 ):
     """Toggle like for a webtoon"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_or_create_session_id(request)
     
     # Check if webtoon exists
     db_webtoon = db.query(Webtoon).filter(Webtoon.id == webtoon_id).first()
@@ -56,16 +57,19 @@ async def toggle_like(
         db_webtoon.like_count += 1
         db.commit()
         db.refresh(new_like)
-        return {"message": "Liked", "liked": True, **new_like.__dict__}
+        return {"message": "Liked", "liked": True, **row_to_dict(new_like)}
 
 @router.get("/likes", response_model=List[LikeResponse])
 async def get_my_likes(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get current session's likes"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
+    if not session_id:
+        return []
     
     likes = db.query(Like).filter(
         Like.session_id == session_id
@@ -78,11 +82,10 @@ async def get_my_likes(
 async def create_comment(
     comment: CommentCreate,
     request: Request,
-    response: Response,
     db: Session = Depends(get_db)
 ):
     """Create a comment"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_or_create_session_id(request)
     
     # Check if webtoon exists
     db_webtoon = db.query(Webtoon).filter(Webtoon.id == comment.webtoon_id).first()
@@ -101,20 +104,21 @@ async def create_comment(
     db.refresh(db_comment)
     
     # Add ownership flag
-    comment_dict = db_comment.__dict__
+    comment_dict = row_to_dict(db_comment)
     comment_dict['is_owner'] = True
     
-    return CommentResponse(**comment_dict)
+    return comment_dict
 
 @router.get("/comments/webtoon/{webtoon_id}", response_model=List[CommentResponse])
 async def get_webtoon_comments(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get comments for a webtoon"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
     
     comments = db.query(Comment).filter(
         Comment.webtoon_id == webtoon_id,
@@ -124,7 +128,7 @@ async def get_webtoon_comments(
     # Add ownership flags
     comment_responses = []
     for comment in comments:
-        comment_dict = comment.__dict__
+        comment_dict = row_to_dict(comment)
         comment_dict['is_owner'] = check_ownership(session_id, comment.session_id)
         comment_dict['replies'] = []
         
@@ -134,17 +138,17 @@ async def get_webtoon_comments(
         ).order_by(Comment.created_at).all()
         
         for reply in replies:
-            reply_dict = reply.__dict__
+            reply_dict = row_to_dict(reply)
             reply_dict['is_owner'] = check_ownership(session_id, reply.session_id)
-            comment_dict['replies'].append(CommentResponse(**reply_dict))
+            comment_dict['replies'].append(reply_dict)
         
-        comment_responses.append(CommentResponse(**comment_dict))
+        comment_responses.append(comment_dict)
     
     return comment_responses
 
 @router.put("/comments/{comment_id}", response_model=CommentResponse)
 async def update_comment(
-    comment_id: str,
+    comment_id: uuid.UUID,
     comment_update: CommentUpdate,
     request: Request,
     db: Session = Depends(get_db)
@@ -178,15 +182,15 @@ async def update_comment(
     db.refresh(db_comment)
     
     # Add ownership flag
-    comment_dict = db_comment.__dict__
+    comment_dict = row_to_dict(db_comment)
     comment_dict['is_owner'] = True
     comment_dict['replies'] = []
     
-    return CommentResponse(**comment_dict)
+    return comment_dict
 
 @router.delete("/comments/{comment_id}")
 async def delete_comment(
-    comment_id: str,
+    comment_id: uuid.UUID,
     request: Request,
     db: Session = Depends(get_db)
 ):
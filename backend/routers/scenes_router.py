@@ -3,25 +3,30 @@ Scenes router (Updated for Text2Cuts)
 """
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Request
 from sqlalchemy.orm import Session, joinedload
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-import os
 import uuid
 
-from database import get_db
+from database import commit_for_webtoon, get_db, get_read_db
 from models import Scene, Dialogue, Webtoon, EditHistory
 from schemas import (
     SceneCreate, SceneUpdate, SceneResponse,
     DialogueCreate, DialogueUpdate, DialogueResponse,
     EditHistoryCreate, EditHistoryResponse
 )
-from session import get_session_id, check_ownership
+from metrics import record_upload
+from recommendations import DIALOGUE_TEXT_FIELDS, SCENE_TEXT_FIELDS, queue_refresh
+from image_processing import IMAGE_EXTENSIONS
+from storage import get_storage
+from serializers import json_response
+from session import get_session_id, check_ownership, has_ownership_claim, PUBLIC_CACHE_CONTROL
 
 router = APIRouter()
 
 @router.get("/webtoon/{webtoon_id}", response_model=List[SceneResponse])
 async def get_webtoon_scenes(
-    webtoon_id: str,
-    db: Session = Depends(get_db)
+    webtoon_id: uuid.UUID,
+    db: Session = Depends(get_read_db)
 ):
     """Get scenes of a webtoon with dialogues"""
     scenes = db.query(Scene).options(
@@ -32,12 +37,15 @@ async def get_webtoon_scenes(
         Scene.scene_number
     ).all()
     
-    return scenes
+    return json_response(
+        List[SceneResponse], scenes,
+        headers={"Cache-Control": PUBLIC_CACHE_CONTROL}
+    )
 
 @router.get("/{scene_id}", response_model=SceneResponse)
 async def get_scene(
-    scene_id: str,
-    db: Session = Depends(get_db)
+    scene_id: uuid.UUID,
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific scene with dialogues"""
     scene = db.query(Scene).options(
@@ -50,7 +58,10 @@ async def get_scene(
             detail="Scene not found"
         )
     
-    return scene
+    return json_response(
+        SceneResponse, scene,
+        headers={"Cache-Control": PUBLIC_CACHE_CONTROL}
+    )
 
 @router.post("/", response_model=SceneResponse)
 async def create_scene(
@@ -67,31 +78,34 @@ async def create_scene(
             detail="Session not found"
         )
     
-    # Check webtoon exists and user owns it
-    db_webtoon = db.query(Webtoon).filter(Webtoon.id == scene.webtoon_id).first()
-    
-    if not db_webtoon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Webtoon not found"
-        )
-    
-    if not check_ownership(session_id, db_webtoon.session_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to add scenes to this webtoon"
-        )
+    # A signed ownership claim answers the owner check without a query; otherwise
+    # check the webtoon exists and the user owns it
+    if not has_ownership_claim(request, scene.webtoon_id):
+        db_webtoon = db.query(Webtoon.session_id).filter(Webtoon.id == scene.webtoon_id).first()
+        
+        if not db_webtoon:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Webtoon not found"
+            )
+        
+        if not check_ownership(session_id, db_webtoon.session_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to add scenes to this webtoon"
+            )
     
     db_scene = Scene(**scene.dict())
     db.add(db_scene)
-    db.commit()
+    queue_refresh(db, scene.webtoon_id)  # scene text feeds the similarity vectors
+    commit_for_webtoon(db, scene.webtoon_id)
     db.refresh(db_scene)
     
     return db_scene
 
 @router.put("/{scene_id}", response_model=SceneResponse)
 async def update_scene(
-    scene_id: int,
+    scene_id: uuid.UUID,
     scene_update: SceneUpdate,
     request: Request,
     db: Session = Depends(get_db)
@@ -145,6 +159,9 @@ async def update_scene(
     )
     db.add(edit_history)
     
+    if update_data.keys() & SCENE_TEXT_FIELDS:
+        queue_refresh(db, db_scene.webtoon_id)
+    
     db.commit()
     db.refresh(db_scene)
     
@@ -152,7 +169,7 @@ async def update_scene(
 
 @router.delete("/{scene_id}")
 async def delete_scene(
-    scene_id: int,
+    scene_id: uuid.UUID,
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -181,6 +198,7 @@ async def delete_scene(
             detail="Not authorized to delete this scene"
         )
     
+    queue_refresh(db, db_scene.webtoon_id)
     db.delete(db_scene)
     db.commit()
     
@@ -189,7 +207,7 @@ async def delete_scene(
 # Dialogue endpoints
 @router.post("/{scene_id}/dialogues", response_model=DialogueResponse)
 async def create_dialogue(
-    scene_id: int,
+    scene_id: uuid.UUID,
     dialogue: DialogueCreate,
     request: Request,
     db: Session = Depends(get_db)
@@ -225,6 +243,7 @@ async def create_dialogue(
     dialogue_data['scene_id'] = scene_id
     db_dialogue = Dialogue(**dialogue_data)
     db.add(db_dialogue)
+    queue_refresh(db, db_scene.webtoon_id)
     db.commit()
     db.refresh(db_dialogue)
     
@@ -232,7 +251,7 @@ async def create_dialogue(
 
 @router.put("/dialogues/{dialogue_id}", response_model=DialogueResponse)
 async def update_dialogue(
-    dialogue_id: int,
+    dialogue_id: uuid.UUID,
     dialogue_update: DialogueUpdate,
     request: Request,
     db: Session = Depends(get_db)
@@ -269,6 +288,9 @@ async def update_dialogue(
     for field, value in update_data.items():
         setattr(db_dialogue, field, value)
     
+    if update_data.keys() & DIALOGUE_TEXT_FIELDS:
+        queue_refresh(db, db_scene.webtoon_id)
+    
     db.commit()
     db.refresh(db_dialogue)
     
@@ -276,7 +298,7 @@ async def update_dialogue(
 
 @router.delete("/dialogues/{dialogue_id}")
 async def delete_dialogue(
-    dialogue_id: int,
+    dialogue_id: uuid.UUID,
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -307,6 +329,7 @@ async def delete_dialogue(
             detail="Not authorized to delete this dialogue"
         )
     
+    queue_refresh(db, db_scene.webtoon_id)
     db.delete(db_dialogue)
     db.commit()
     
@@ -314,7 +337,7 @@ async def delete_dialogue(
 
 @router.post("/{scene_id}/image")
 async def upload_scene_image(
-    scene_id: int,
+    scene_id: uuid.UUID,
     request: Request,
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
@@ -344,28 +367,23 @@ async def upload_scene_image(
             detail="Not authorized to update this scene"
         )
     
-    # Validate file type
-    if not file.content_type.startswith("image/"):
+    # Validate file type; the extension comes from the allow-list, never the client's file name
+    file_extension = IMAGE_EXTENSIONS.get(file.content_type)
+    if not file_extension:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be an image"
         )
     
     # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = f"static/uploads/scenes/{unique_filename}"
-    
-    # Create directory if not exists
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    key = f"uploads/scenes/{uuid.uuid4()}{file_extension}"
     
     # Save image
     contents = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    record_upload("scene", len(contents))
     
-    # Update scene image URL
-    db_scene.image_url = f"/static/uploads/scenes/{unique_filename}"
+    # Store and update scene image URL
+    db_scene.image_url = await run_in_threadpool(get_storage().save, key, contents, file.content_type)
     db.commit()
     
     return {"image_url": db_scene.image_url}
@@ -399,20 +417,22 @@ async def create_scenes_batch(
             detail="All scenes must be for the same webtoon"
         )
     
-    # Check webtoon exists and user owns it
-    db_webtoon = db.query(Webtoon).filter(Webtoon.id == webtoon_id).first()
-    
-    if not db_webtoon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Webtoon not found"
-        )
-    
-    if not check_ownership(session_id, db_webtoon.session_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to add scenes to this webtoon"
-        )
+    # A signed ownership claim answers the owner check without a query; otherwise
+    # check the webtoon exists and the user owns it
+    if not has_ownership_claim(request, webtoon_id):
+        db_webtoon = db.query(Webtoon.session_id).filter(Webtoon.id == webtoon_id).first()
+        
+        if not db_webtoon:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Webtoon not found"
+            )
+        
+        if not check_ownership(session_id, db_webtoon.session_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to add scenes to this webtoon"
+            )
     
     # Create all scenes
     db_scenes = []
@@ -420,8 +440,9 @@ async def create_scenes_batch(
         db_scene = Scene(**scene.dict())
         db.add(db_scene)
         db_scenes.append(db_scene)
+    queue_refresh(db, webtoon_id)
     
-    db.commit()
+    commit_for_webtoon(db, webtoon_id)
     
     # Refresh all scenes
     for db_scene in db_scenes:
@@ -431,8 +452,8 @@ async def create_scenes_batch(
 
 @router.get("/{scene_id}/history", response_model=List[EditHistoryResponse])
 async def get_scene_edit_history(
-    scene_id: int,
-    db: Session = Depends(get_db)
+    scene_id: uuid.UUID,
+    db: Session = Depends(get_read_db)
 ):
     """Get edit history of a scene"""
     history = db.query(EditHistory).filter(
@@ -0,0 +1,214 @@
+"""
+Direct upload router
+
+Two-step image upload that keeps image bytes off the API workers:
+
+1. POST /presign returns a short-lived signed PUT for a new ImageAsset
+2. the client PUTs the file straight to storage, under the unserved
+   PENDING_UPLOAD_PREFIX
+3. POST /{asset_id}/finalize queues the asset for the image worker
+   (image_processing.py), which validates it and publishes it
+
+With the local storage backend the signed PUT targets /local/{key}, a
+stand-in for object storage used in development and tests.
+"""
+import os
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import get_db
+from image_processing import IMAGE_EXTENSIONS, MAX_FILE_SIZE
+from models import ImageAsset, Scene, Webtoon
+from schemas import ImageAssetResponse, UploadPresignRequest, UploadPresignResponse, UploadTarget
+from serializers import row_to_dict
+from session import check_ownership, get_session_id
+from storage import FileTooLarge, LocalStorage, PENDING_UPLOAD_PREFIX, UPLOAD_URL_EXPIRES, get_storage
+
+router = APIRouter()
+
+# Narrowing only: types outside IMAGE_EXTENSIONS (e.g. SVG) are never accepted
+ALLOWED_IMAGE_TYPES = [
+    content_type for content_type in os.getenv(
+        "ALLOWED_IMAGE_TYPES", "image/jpeg,image/png,image/gif,image/webp"
+    ).split(",")
+    if content_type in IMAGE_EXTENSIONS
+]
+
+
+def require_session(request: Request) -> str:
+    session_id = get_session_id(request)
+    if not session_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session not found"
+        )
+    return session_id
+
+
+@router.post("/presign", response_model=UploadPresignResponse)
+async def presign_upload(
+    upload: UploadPresignRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Create a pending image asset and a signed URL to upload it to"""
+    session_id = require_session(request)
+
+    if upload.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be an image"
+        )
+
+    if upload.target == UploadTarget.THUMBNAIL:
+        webtoon_id, scene_id = upload.target_id, None
+    else:
+        db_scene = db.query(Scene).filter(Scene.id == upload.target_id).first()
+        if not db_scene:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scene not found"
+            )
+        webtoon_id, scene_id = db_scene.webtoon_id, db_scene.id
+
+    db_webtoon = db.query(Webtoon).filter(Webtoon.id == webtoon_id).first()
+    if not db_webtoon:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webtoon not found"
+        )
+
+    if not check_ownership(session_id, db_webtoon.session_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this webtoon"
+        )
+
+    # The client's file name is kept for display only; the public key is chosen by the worker
+    asset_id = uuid.uuid4()
+    key = f"{PENDING_UPLOAD_PREFIX}/{asset_id}"
+
+    db_asset = ImageAsset(
+        id=asset_id,
+        file_path=key,
+        file_name=upload.file_name,
+        mime_type=upload.content_type,
+        webtoon_id=webtoon_id,
+        scene_id=scene_id,
+        asset_type=upload.target.value,
+        session_id=session_id,
+        status="pending"
+    )
+    db.add(db_asset)
+    db.commit()
+
+    instructions = await run_in_threadpool(
+        get_storage().presign_upload, key, upload.content_type, UPLOAD_URL_EXPIRES
+    )
+    return {"asset_id": asset_id, "upload": instructions, "expires_in": UPLOAD_URL_EXPIRES}
+
+
+@router.put("/local/{key:path}", status_code=status.HTTP_204_NO_CONTENT)
+async def receive_local_upload(
+    key: str,
+    request: Request,
+    expires: int = Query(...),
+    signature: str = Query(...)
+):
+    """Accept a presigned PUT for the local storage backend"""
+    storage = get_storage()
+    content_type = request.headers.get("content-type", "")
+
+    if not isinstance(storage, LocalStorage) or not key.startswith(f"{PENDING_UPLOAD_PREFIX}/"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload target not found"
+        )
+
+    if not storage.verify_upload(key, content_type, expires, signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired upload signature"
+        )
+
+    try:
+        await storage.save_stream(key, request.stream(), MAX_FILE_SIZE)
+    except FileTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File too large"
+        )
+
+
+@router.post("/{asset_id}/finalize", response_model=ImageAssetResponse, status_code=status.HTTP_202_ACCEPTED)
+async def finalize_upload(
+    asset_id: uuid.UUID,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Confirm an upload and queue it for the image worker"""
+    session_id = require_session(request)
+
+    db_asset = db.query(ImageAsset).filter(ImageAsset.id == asset_id).first()
+    if not db_asset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image asset not found"
+        )
+
+    if not check_ownership(session_id, db_asset.session_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to finalize this upload"
+        )
+
+    if db_asset.status != "pending":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload already finalized"
+        )
+
+    storage = get_storage()
+    if not await run_in_threadpool(storage.exists, db_asset.file_path):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File has not been uploaded"
+        )
+
+    # Presigned S3 PUTs cannot cap the body size, so check it here
+    db_asset.file_size = await run_in_threadpool(storage.size, db_asset.file_path)
+    if db_asset.file_size > MAX_FILE_SIZE:
+        db_asset.status = "failed"
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File too large"
+        )
+
+    # Picked up by the image worker (python image_processing.py)
+    db_asset.status = "processing"
+    db.commit()
+
+    return row_to_dict(db_asset)
+
+
+@router.get("/{asset_id}", response_model=ImageAssetResponse)
+async def get_upload(
+    asset_id: uuid.UUID,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Get the processing status of an uploaded image"""
+    session_id = require_session(request)
+
+    db_asset = db.query(ImageAsset).filter(ImageAsset.id == asset_id).first()
+    if not db_asset or not check_ownership(session_id, db_asset.session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image asset not found"
+        )
+
+    return row_to_dict(db_asset)
@@ -2,21 +2,33 @@
 Webtoons router (No Auth Version)
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, Request, Response
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session, joinedload
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-import os
+from decimal import Decimal, InvalidOperation
 import uuid
-from PIL import Image
 import io
 
-from database import get_db
-from models import Webtoon, Scene, Character, Like
+from database import commit_for_webtoon, get_db, get_read_db
+from models import Webtoon, Scene, Character, Like, WebtoonScore, WebtoonSimilarity, WebtoonCoLike
 from schemas import (
-    WebtoonCreate, WebtoonUpdate, WebtoonResponse, WebtoonListResponse,
+    WebtoonCreate, WebtoonUpdate, WebtoonResponse, WebtoonListResponse, WebtoonRankedListResponse,
     CharacterCreate, CharacterResponse, CharacterUpdate,
     PaginationParams
 )
-from session import get_or_create_session_id, get_session_id, check_ownership
+from metrics import record_upload
+from pagination import encode_cursor, decode_cursor
+from recommendations import SIMILARITY_FIELDS, queue_refresh
+import search
+from image_processing import IMAGE_EXTENSIONS
+from storage import get_storage
+from serializers import row_to_dict
+from session import (
+    get_or_create_session_id, get_session_id, check_ownership,
+    has_ownership_claim, add_ownership_claim, remove_ownership_claim,
+    set_read_cache_headers, PRIVATE_CACHE_CONTROL, PUBLIC_CACHE_CONTROL
+)
 
 router = APIRouter()
 
@@ -28,10 +40,11 @@ async def get_webtoons(
     per_page: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
     genre: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get list of webtoons with pagination"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
     
     query = db.query(Webtoon)
     
@@ -41,27 +54,30 @@ async def get_webtoons(
         query = query.filter(Webtoon.genre == genre)
     
     # Show only published webtoons or user's own webtoons
-    query = query.filter(
-        (Webtoon.status == "published") | (Webtoon.session_id == session_id)
-    )
+    if session_id:
+        query = query.filter(
+            (Webtoon.status == "published") | (Webtoon.session_id == session_id)
+        )
+    else:
+        query = query.filter(Webtoon.status == "published")
     
     total = query.count()
-    webtoons = query.offset((page - 1) * per_page).limit(per_page).all()
+    webtoons = query.order_by(Webtoon.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
     
     # Add ownership and like status
     webtoon_responses = []
     for webtoon in webtoons:
-        webtoon_dict = webtoon.__dict__
+        webtoon_dict = row_to_dict(webtoon)
         webtoon_dict['is_owner'] = check_ownership(session_id, webtoon.session_id)
         
         # Check if liked
-        like = db.query(Like).filter(
+        like = session_id and db.query(Like).filter(
             Like.webtoon_id == webtoon.id,
             Like.session_id == session_id
         ).first()
-        webtoon_dict['is_liked'] = like is not None
+        webtoon_dict['is_liked'] = bool(like)
         
-        webtoon_responses.append(WebtoonResponse(**webtoon_dict))
+        webtoon_responses.append(webtoon_dict)
     
     return {
         "webtoons": webtoon_responses,
@@ -74,34 +90,193 @@ async def get_webtoons(
 async def get_my_webtoons(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get current session's webtoons"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
+    if not session_id:
+        return []
     
     webtoons = db.query(Webtoon).filter(
         Webtoon.session_id == session_id
-    ).all()
+    ).order_by(Webtoon.created_at.desc()).all()
     
     # Add ownership flag
     webtoon_responses = []
     for webtoon in webtoons:
-        webtoon_dict = webtoon.__dict__
+        webtoon_dict = row_to_dict(webtoon)
         webtoon_dict['is_owner'] = True
         webtoon_dict['is_liked'] = False
-        webtoon_responses.append(WebtoonResponse(**webtoon_dict))
+        webtoon_responses.append(webtoon_dict)
     
     return webtoon_responses
 
+def ranked_page(db: Session, session_id: str, page, next_cursor):
+    """Response for a page of (webtoon, score) pairs in rank order"""
+    liked = {
+        webtoon_id for (webtoon_id,) in db.query(Like.webtoon_id).filter(
+            Like.session_id == session_id,
+            Like.webtoon_id.in_([webtoon.id for webtoon, _ in page])
+        )
+    } if session_id else set()
+    
+    webtoons = [
+        row_to_dict(
+            webtoon,
+            is_owner=check_ownership(session_id, webtoon.session_id),
+            is_liked=webtoon.id in liked,
+            score=float(score)
+        )
+        for webtoon, score in page
+    ]
+    return {"webtoons": webtoons, "next_cursor": next_cursor}
+
+@router.get("/search", response_model=WebtoonRankedListResponse)
+async def search_webtoons(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Search webtoons by title, summary, scene text and dialogue"""
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
+    
+    after = None
+    if cursor:
+        cursor_score, cursor_id = decode_cursor(cursor, 2)
+        try:
+            after = (Decimal(cursor_score), str(uuid.UUID(cursor_id)))
+        except (InvalidOperation, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    # Fetch one extra row to know whether another page exists
+    hits = search.search_webtoons(db, q.strip(), session_id, limit + 1, after)
+    page = hits[:limit]
+    
+    webtoons = {
+        str(webtoon.id): webtoon
+        for webtoon in db.query(Webtoon).filter(
+            Webtoon.id.in_([uuid.UUID(webtoon_id) for webtoon_id, _ in page])
+        )
+    }
+    
+    next_cursor = None
+    if len(hits) > limit:
+        last_id, last_score = page[-1]
+        next_cursor = encode_cursor(str(last_score), last_id)
+    
+    page = [(webtoons[webtoon_id], score) for webtoon_id, score in page if webtoon_id in webtoons]
+    return ranked_page(db, session_id, page, next_cursor)
+
+@router.get("/trending", response_model=WebtoonRankedListResponse)
+async def get_trending_webtoons(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Published webtoons by time-decayed popularity (see ranking.py)"""
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
+    
+    query = db.query(Webtoon, WebtoonScore.score).join(
+        WebtoonScore, WebtoonScore.webtoon_id == Webtoon.id
+    ).filter(Webtoon.status == "published")
+    
+    if cursor:
+        cursor_score, cursor_id = decode_cursor(cursor, 2)
+        try:
+            cursor_score, cursor_id = float(cursor_score), uuid.UUID(cursor_id)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.filter(or_(
+            WebtoonScore.score < cursor_score,
+            and_(WebtoonScore.score == cursor_score, WebtoonScore.webtoon_id > cursor_id)
+        ))
+    
+    rows = query.order_by(WebtoonScore.score.desc(), WebtoonScore.webtoon_id).limit(limit + 1).all()
+    page = rows[:limit]
+    
+    next_cursor = None
+    if len(rows) > limit:
+        last_webtoon, last_score = page[-1]
+        next_cursor = encode_cursor(last_score, last_webtoon.id)
+    
+    return ranked_page(db, session_id, page, next_cursor)
+
+@router.get("/{webtoon_id}/similar", response_model=WebtoonRankedListResponse)
+async def get_similar_webtoons(
+    webtoon_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    limit: int = Query(6, ge=1, le=20),
+    db: Session = Depends(get_read_db)
+):
+    """Published webtoons most similar in content (see recommendations.py)"""
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
+    
+    page = db.query(Webtoon, WebtoonSimilarity.score).join(
+        WebtoonSimilarity, WebtoonSimilarity.similar_webtoon_id == Webtoon.id
+    ).filter(
+        WebtoonSimilarity.webtoon_id == webtoon_id,
+        Webtoon.status == "published"
+    ).order_by(WebtoonSimilarity.rank).limit(limit).all()
+    
+    if not page:
+        # Not indexed yet (new or unpublished): fall back to trending
+        page = db.query(Webtoon, WebtoonScore.score).join(
+            WebtoonScore, WebtoonScore.webtoon_id == Webtoon.id
+        ).filter(
+            Webtoon.status == "published",
+            Webtoon.id != webtoon_id
+        ).order_by(WebtoonScore.score.desc(), WebtoonScore.webtoon_id).limit(limit).all()
+    
+    return ranked_page(db, session_id, page, None)
+
+@router.get("/{webtoon_id}/also-liked", response_model=WebtoonRankedListResponse)
+async def get_also_liked_webtoons(
+    webtoon_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    limit: int = Query(6, ge=1, le=20),
+    db: Session = Depends(get_read_db)
+):
+    """Published webtoons liked by readers who liked this one (see collaborative.py)"""
+    session_id = get_session_id(request)
+    set_read_cache_headers(response, session_id)
+    
+    page = db.query(Webtoon, WebtoonCoLike.score).join(
+        WebtoonCoLike, WebtoonCoLike.similar_webtoon_id == Webtoon.id
+    ).filter(
+        WebtoonCoLike.webtoon_id == webtoon_id,
+        Webtoon.status == "published"
+    ).order_by(WebtoonCoLike.rank).limit(limit).all()
+    
+    return ranked_page(db, session_id, page, None)
+
 @router.get("/{webtoon_id}", response_model=WebtoonResponse)
 async def get_webtoon(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     request: Request,
     response: Response,
     db: Session = Depends(get_db)
 ):
     """Get a specific webtoon"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_session_id(request)
+    # Every request counts a view, so no shared cache may answer it
+    response.headers["Cache-Control"] = PRIVATE_CACHE_CONTROL
     
     webtoon = db.query(Webtoon).filter(Webtoon.id == webtoon_id).first()
     
@@ -116,27 +291,26 @@ async def get_webtoon(
     db.commit()
     
     # Prepare response
-    webtoon_dict = webtoon.__dict__
+    webtoon_dict = row_to_dict(webtoon)
     webtoon_dict['is_owner'] = check_ownership(session_id, webtoon.session_id)
     
     # Check if liked
-    like = db.query(Like).filter(
+    like = session_id and db.query(Like).filter(
         Like.webtoon_id == webtoon.id,
         Like.session_id == session_id
     ).first()
-    webtoon_dict['is_liked'] = like is not None
+    webtoon_dict['is_liked'] = bool(like)
     
-    return WebtoonResponse(**webtoon_dict)
+    return webtoon_dict
 
 @router.post("/", response_model=WebtoonResponse)
 async def create_webtoon(
     webtoon: WebtoonCreate,
     request: Request,
-    response: Response,
     db: Session = Depends(get_db)
 ):
     """Create a new webtoon"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_or_create_session_id(request)
     
     db_webtoon = Webtoon(
         **webtoon.dict(exclude={'session_id'}),
@@ -144,26 +318,30 @@ async def create_webtoon(
         status="published"
     )
     db.add(db_webtoon)
+    db.flush()
+    queue_refresh(db, db_webtoon.id)  # indexed by the similarity worker
     db.commit()
     db.refresh(db_webtoon)
     
+    # Remember ownership in the signed session token
+    add_ownership_claim(request, session_id, db_webtoon.id)
+    
     # Prepare response
-    webtoon_dict = db_webtoon.__dict__
+    webtoon_dict = row_to_dict(db_webtoon)
     webtoon_dict['is_owner'] = True
     webtoon_dict['is_liked'] = False
     
-    return WebtoonResponse(**webtoon_dict)
+    return webtoon_dict
 
 @router.put("/{webtoon_id}", response_model=WebtoonResponse)
 async def update_webtoon(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     webtoon_update: WebtoonUpdate,
     request: Request,
-    response: Response,
     db: Session = Depends(get_db)
 ):
     """Update a webtoon"""
-    session_id = get_or_create_session_id(request, response)
+    session_id = get_or_create_session_id(request)
     
     db_webtoon = db.query(Webtoon).filter(Webtoon.id == webtoon_id).first()
     
@@ -182,14 +360,19 @@ async def update_webtoon(
     
     # Update fields
     update_data = webtoon_update.dict(exclude_unset=True)
+    changed = {field for field, value in update_data.items() if getattr(db_webtoon, field) != value}
     for field, value in update_data.items():
         setattr(db_webtoon, field, value)
     
+    # Re-index only when text or publish status actually changed
+    if changed & SIMILARITY_FIELDS:
+        queue_refresh(db, db_webtoon.id)
+    
     db.commit()
     db.refresh(db_webtoon)
     
     # Prepare response
-    webtoon_dict = db_webtoon.__dict__
+    webtoon_dict = row_to_dict(db_webtoon)
     webtoon_dict['is_owner'] = True
     
     # Check if liked
@@ -199,11 +382,11 @@ async def update_webtoon(
     ).first()
     webtoon_dict['is_liked'] = like is not None
     
-    return WebtoonResponse(**webtoon_dict)
+    return webtoon_dict
 
 @router.delete("/{webtoon_id}")
 async def delete_webtoon(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -234,11 +417,13 @@ async def delete_webtoon(
     db.delete(db_webtoon)
     db.commit()
     
+    remove_ownership_claim(request, webtoon_id)
+    
     return {"message": "Webtoon deleted successfully"}
 
 @router.post("/{webtoon_id}/thumbnail")
 async def upload_thumbnail(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     request: Request,
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
@@ -267,31 +452,34 @@ async def upload_thumbnail(
             detail="Not authorized to update this webtoon"
         )
     
-    # Validate file type
-    if not file.content_type.startswith("image/"):
+    # Validate file type; the extension comes from the allow-list, never the client's file name
+    file_extension = IMAGE_EXTENSIONS.get(file.content_type)
+    if not file_extension:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be an image"
         )
     
     # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = f"static/uploads/thumbnails/{unique_filename}"
+    key = f"uploads/thumbnails/{uuid.uuid4()}{file_extension}"
     
-    # Create directory if not exists
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    # Resize image (Pillow is imported here rather than at worker boot)
+    from PIL import Image
     
-    # Save and resize image
     contents = await file.read()
+    record_upload("thumbnail", len(contents))
     image = Image.open(io.BytesIO(contents))
+    image_format = image.format
     
     # Resize to thumbnail size (400x600 for webtoon thumbnail)
     image.thumbnail((400, 600), Image.Resampling.LANCZOS)
-    image.save(file_path)
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
     
-    # Update webtoon thumbnail URL
-    db_webtoon.thumbnail_url = f"/static/uploads/thumbnails/{unique_filename}"
+    # Store and update webtoon thumbnail URL
+    db_webtoon.thumbnail_url = await run_in_threadpool(
+        get_storage().save, key, buffer.getvalue(), file.content_type
+    )
     db.commit()
     
     return {"thumbnail_url": db_webtoon.thumbnail_url}
@@ -299,10 +487,13 @@ async def upload_thumbnail(
 # Character endpoints
 @router.get("/{webtoon_id}/characters", response_model=List[CharacterResponse])
 async def get_webtoon_characters(
-    webtoon_id: str,
-    db: Session = Depends(get_db)
+    webtoon_id: uuid.UUID,
+    response: Response,
+    db: Session = Depends(get_read_db)
 ):
     """Get characters of a webtoon"""
+    response.headers["Cache-Control"] = PUBLIC_CACHE_CONTROL
+    
     characters = db.query(Character).filter(
         Character.webtoon_id == webtoon_id
     ).all()
@@ -311,7 +502,7 @@ async def get_webtoon_characters(
 
 @router.post("/{webtoon_id}/characters", response_model=CharacterResponse)
 async def create_character(
-    webtoon_id: str,
+    webtoon_id: uuid.UUID,
     character: CharacterCreate,
     request: Request,
     db: Session = Depends(get_db)
@@ -325,35 +516,37 @@ async def create_character(
             detail="Session not found"
         )
     
-    # Check webtoon exists and user owns it
-    db_webtoon = db.query(Webtoon).filter(Webtoon.id == webtoon_id).first()
-    
-    if not db_webtoon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Webtoon not found"
-        )
-    
-    if not check_ownership(session_id, db_webtoon.session_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to add characters to this webtoon"
-        )
+    # A signed ownership claim answers the owner check without a query; otherwise
+    # check the webtoon exists and the user owns it
+    if not has_ownership_claim(request, webtoon_id):
+        db_webtoon = db.query(Webtoon.session_id).filter(Webtoon.id == webtoon_id).first()
+        
+        if not db_webtoon:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Webtoon not found"
+            )
+        
+        if not check_ownership(session_id, db_webtoon.session_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to add characters to this webtoon"
+            )
     
     db_character = Character(
-        **character.dict(),
+        **character.dict(exclude={'webtoon_id'}),
         webtoon_id=webtoon_id
     )
     db.add(db_character)
-    db.commit()
+    commit_for_webtoon(db, webtoon_id)
     db.refresh(db_character)
     
     return db_character
 
 @router.put("/{webtoon_id}/characters/{character_id}", response_model=CharacterResponse)
 async def update_character(
-    webtoon_id: str,
-    character_id: str,
+    webtoon_id: uuid.UUID,
+    character_id: uuid.UUID,
     character_update: CharacterUpdate,
     request: Request,
     db: Session = Depends(get_db)
@@ -56,7 +56,6 @@ class WebtoonInDB(WebtoonBase):
     status: WebtoonStatus
     view_count: int
     like_count: int
-    session_id: Optional[str]
     created_at: datetime
     updated_at: datetime
     
@@ -74,6 +73,14 @@ class WebtoonListResponse(BaseModel):
     page: int
     per_page: int
 
+class WebtoonRankedResponse(WebtoonResponse):
+    score: float
+
+class WebtoonRankedListResponse(BaseModel):
+    """Search results or trending feed, paged by keyset cursor"""
+    webtoons: List[WebtoonRankedResponse]
+    next_cursor: Optional[str] = None
+
 # Dialogue schemas (신규)
 class DialogueBase(BaseModel):
     who_speaks: str = Field(..., max_length=100)
@@ -110,6 +117,7 @@ class SceneBase(BaseModel):
 
 class SceneCreate(SceneBase):
     webtoon_id: UUID
+    description: str  # NOT NULL in the scenes table
     image_url: Optional[str] = None
     character_positions: Optional[Dict[str, Any]] = None
 
@@ -197,7 +205,7 @@ class CommentBase(BaseModel):
 
 class CommentCreate(CommentBase):
     webtoon_id: UUID
-    scene_id: Optional[int] = None  # episode_id를 scene_id로 변경
+    scene_id: Optional[UUID] = None  # episode_id를 scene_id로 변경
     parent_comment_id: Optional[UUID] = None
     session_id: Optional[str] = None
 
@@ -207,9 +215,8 @@ class CommentUpdate(BaseModel):
 class CommentInDB(CommentBase):
     id: UUID
     webtoon_id: UUID
-    scene_id: Optional[int]
+    scene_id: Optional[UUID]
     parent_comment_id: Optional[UUID]
-    session_id: Optional[str]
     created_at: datetime
     updated_at: datetime
     
@@ -241,9 +248,9 @@ class ChatMessageBase(BaseModel):
 
 class ChatMessageCreate(ChatMessageBase):
     webtoon_id: UUID
-    scene_id: Optional[int] = None  # episode_id를 scene_id로 변경
+    scene_id: Optional[UUID] = None  # episode_id를 scene_id로 변경
     sender_type: str = Field(..., pattern="^(user|character)$")
-    character_id: Optional[int] = None
+    character_id: Optional[UUID] = None
     parent_message_id: Optional[UUID] = None
     session_id: Optional[str] = None
 
@@ -253,11 +260,10 @@ class ChatMessageUpdate(BaseModel):
 class ChatMessageInDB(ChatMessageBase):
     id: UUID
     webtoon_id: UUID
-    scene_id: Optional[int]
+    scene_id: Optional[UUID]
     sender_type: str
-    session_id: Optional[str]
     is_read: bool
-    character_id: Optional[int]
+    character_id: Optional[UUID]
     parent_message_id: Optional[UUID]
     created_at: datetime
     
@@ -269,6 +275,15 @@ class ChatMessageResponse(ChatMessageInDB):
     replies: List['ChatMessageResponse'] = []
     is_owner: Optional[bool] = False
 
+class ChatReadMarkerUpdate(BaseModel):
+    message_id: UUID
+
+class ChatReadMarkerResponse(BaseModel):
+    webtoon_id: UUID
+    last_read_message_id: Optional[UUID]
+    last_read_at: datetime
+    unread_count: int
+
 # Image Asset schemas
 class ImageAssetBase(BaseModel):
     asset_type: str = Field(..., max_length=50)
@@ -280,8 +295,8 @@ class ImageAssetCreate(ImageAssetBase):
     mime_type: Optional[str] = Field(None, max_length=50)
     width: Optional[int] = None
     height: Optional[int] = None
-    webtoon_id: Optional[int] = None
-    scene_id: Optional[int] = None  # episode_id를 scene_id로 변경
+    webtoon_id: Optional[UUID] = None
+    scene_id: Optional[UUID] = None  # episode_id를 scene_id로 변경
     session_id: Optional[str] = None
 
 class ImageAssetInDB(ImageAssetBase):
@@ -292,9 +307,11 @@ class ImageAssetInDB(ImageAssetBase):
     mime_type: Optional[str]
     width: Optional[int]
     height: Optional[int]
-    webtoon_id: Optional[int]
-    scene_id: Optional[int]
+    webtoon_id: Optional[UUID]
+    scene_id: Optional[UUID]
     session_id: Optional[str]
+    status: Optional[str] = None
+    variants: Optional[Dict[str, str]] = None
     created_at: datetime
     
     class Config:
@@ -303,6 +320,27 @@ class ImageAssetInDB(ImageAssetBase):
 class ImageAssetResponse(ImageAssetInDB):
     pass
 
+# Direct upload schemas
+class UploadTarget(str, Enum):
+    THUMBNAIL = "thumbnail"
+    SCENE = "scene"
+
+class UploadPresignRequest(BaseModel):
+    target: UploadTarget
+    target_id: UUID  # webtoon id for thumbnails, scene id for scene images
+    file_name: str = Field(..., max_length=200)
+    content_type: str = Field(..., max_length=50)
+
+class UploadInstructions(BaseModel):
+    method: str
+    url: str
+    headers: Dict[str, str]
+
+class UploadPresignResponse(BaseModel):
+    asset_id: UUID
+    upload: UploadInstructions
+    expires_in: int
+
 # Generation Session schemas
 class GenerationSessionCreate(BaseModel):
     input_text: str
@@ -0,0 +1,238 @@
+"""
+Webtoon search
+
+On PostgreSQL, search runs against the trigger-maintained search_vector
+columns (migration 0004). Matches in the webtoon itself, its scenes and
+its dialogues are ranked with ts_rank and weighted per source. Trigram
+matches on the title and summary catch partial Korean words that the
+'simple' tokenizer misses.
+
+Other databases (SQLite in local runs and benchmarks) use
+InMemorySearchIndex. It builds the same weighted postings in process and
+rebuilds lazily after any flush that touches a webtoon, scene or dialogue.
+
+Both backends return (webtoon_id, score) pages ordered by score, then id,
+with a keyset cursor on that pair.
+"""
+import re
+import threading
+from collections import defaultdict
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import Webtoon, Scene, Dialogue
+
+# Relative weight of a match in each source; mirrored by both backends
+SCENE_WEIGHT = 0.5
+DIALOGUE_WEIGHT = 0.3
+TRIGRAM_WEIGHT = 0.5
+
+SCORE_PLACES = 6
+
+POSTGRES_SEARCH = """
+WITH query AS (SELECT websearch_to_tsquery('simple', :q) AS tsq),
+hits AS (
+    SELECT w.id AS webtoon_id, 'webtoon' AS source, ts_rank(w.search_vector, query.tsq) AS rank
+    FROM webtoons w, query
+    WHERE w.search_vector @@ query.tsq
+    UNION ALL
+    SELECT w.id, 'trigram', greatest(word_similarity(:q, w.title), word_similarity(:q, w.summary)) * :trigram_weight
+    FROM webtoons w
+    WHERE w.title ILIKE :pattern OR w.summary ILIKE :pattern OR :q <% w.title
+    UNION ALL
+    SELECT s.webtoon_id, 'scene', ts_rank(s.search_vector, query.tsq) * :scene_weight
+    FROM scenes s, query
+    WHERE s.search_vector @@ query.tsq
+    UNION ALL
+    SELECT s.webtoon_id, 'dialogue', ts_rank(d.search_vector, query.tsq) * :dialogue_weight
+    FROM dialogues d JOIN scenes s ON s.id = d.scene_id, query
+    WHERE d.search_vector @@ query.tsq
+),
+best AS (
+    SELECT webtoon_id, source, max(rank) AS rank FROM hits GROUP BY webtoon_id, source
+),
+scored AS (
+    SELECT webtoon_id, round(sum(rank)::numeric, :places) AS score FROM best GROUP BY webtoon_id
+)
+SELECT scored.webtoon_id, scored.score
+FROM scored JOIN webtoons w ON w.id = scored.webtoon_id
+WHERE (w.status = 'published' OR w.session_id = :session_id) {cursor_clause}
+ORDER BY scored.score DESC, scored.webtoon_id
+LIMIT :limit
+"""
+
+POSTGRES_CURSOR_CLAUSE = """
+    AND (scored.score < :cursor_score
+         OR (scored.score = :cursor_score AND scored.webtoon_id > CAST(:cursor_id AS uuid)))
+"""
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return TOKEN_RE.findall(value.lower()) if value else []
+
+
+def trigrams(token: str) -> set:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def after_cursor(score: Decimal, webtoon_id: str, cursor: Optional[Tuple[Decimal, str]]) -> bool:
+    if cursor is None:
+        return True
+    cursor_score, cursor_id = cursor
+    return score < cursor_score or (score == cursor_score and webtoon_id > cursor_id)
+
+
+class InMemorySearchIndex:
+    """Weighted token and trigram postings for databases without tsvector"""
+
+    FIELDS = (("title", 1.0), ("summary", 0.4), ("description", 0.2), ("genre", 0.1), ("theme", 0.1))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stale = True
+        self._postings = {}
+        self._trigrams = {}
+        self._visibility = {}
+
+    def invalidate(self):
+        self._stale = True
+
+    def _build(self, db: Session):
+        postings = defaultdict(dict)
+        visibility = {}
+
+        def add(webtoon_id, value, weight):
+            for token in tokenize(value):
+                if postings[token].get(webtoon_id, 0.0) < weight:
+                    postings[token][webtoon_id] = weight
+
+        for webtoon in db.query(Webtoon.id, Webtoon.status, Webtoon.session_id,
+                                *(getattr(Webtoon, name) for name, _ in self.FIELDS)):
+            webtoon_id = str(webtoon.id)
+            visibility[webtoon_id] = (webtoon.status, webtoon.session_id)
+            for name, weight in self.FIELDS:
+                add(webtoon_id, getattr(webtoon, name), weight)
+
+        for scene in db.query(Scene.webtoon_id, Scene.title, Scene.scene_description, Scene.narration):
+            for value in (scene.title, scene.scene_description, scene.narration):
+                add(str(scene.webtoon_id), value, SCENE_WEIGHT)
+
+        for row in db.query(Scene.webtoon_id, Dialogue.dialogue).join(Dialogue, Dialogue.scene_id == Scene.id):
+            add(str(row.webtoon_id), row.dialogue, DIALOGUE_WEIGHT)
+
+        trigram_index = defaultdict(set)
+        for token in postings:
+            for gram in trigrams(token):
+                trigram_index[gram].add(token)
+
+        self._postings = dict(postings)
+        self._trigrams = dict(trigram_index)
+        self._visibility = visibility
+
+    def _ensure_fresh(self):
+        if not self._stale:
+            return
+        with self._lock:
+            if self._stale:
+                # Clear first so writes during the build mark it stale again
+                self._stale = False
+                db = SessionLocal()
+                try:
+                    self._build(db)
+                except Exception:
+                    self._stale = True
+                    raise
+                finally:
+                    db.close()
+
+    def _matches(self, query_token: str):
+        """Indexed tokens matching query_token, with a similarity in (0, 1]"""
+        if query_token in self._postings:
+            yield query_token, 1.0
+        query_grams = trigrams(query_token)
+        candidates = set()
+        for gram in query_grams:
+            candidates |= self._trigrams.get(gram, set())
+        for token in candidates:
+            if token == query_token:
+                continue
+            if query_token in token:
+                # Substring: "편지" in "편지를"
+                yield token, TRIGRAM_WEIGHT * 2 * len(query_token) / (len(query_token) + len(token))
+                continue
+            grams = trigrams(token)
+            similarity = len(query_grams & grams) / len(query_grams | grams)
+            if similarity >= 0.3:
+                yield token, similarity * TRIGRAM_WEIGHT
+
+    def search(self, q: str, session_id: Optional[str], limit: int,
+               cursor: Optional[Tuple[Decimal, str]] = None) -> List[Tuple[str, Decimal]]:
+        self._ensure_fresh()
+
+        scores = defaultdict(float)
+        for query_token in set(tokenize(q)):
+            best = {}
+            for token, similarity in self._matches(query_token):
+                for webtoon_id, weight in self._postings[token].items():
+                    best[webtoon_id] = max(best.get(webtoon_id, 0.0), similarity * weight)
+            for webtoon_id, score in best.items():
+                scores[webtoon_id] += score
+
+        results = []
+        for webtoon_id, score in scores.items():
+            webtoon_status, owner = self._visibility.get(webtoon_id, (None, None))
+            if webtoon_status != "published" and (not session_id or owner != session_id):
+                continue
+            score = round(Decimal(score), SCORE_PLACES)
+            if after_cursor(score, webtoon_id, cursor):
+                results.append((webtoon_id, score))
+
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit]
+
+
+memory_index = InMemorySearchIndex()
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_memory_index(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Webtoon, Scene, Dialogue)):
+            memory_index.invalidate()
+            return
+
+
+def search_webtoons(db: Session, q: str, session_id: Optional[str], limit: int,
+                    cursor: Optional[Tuple[Decimal, str]] = None) -> List[Tuple[str, Decimal]]:
+    """Ranked (webtoon_id, score) matches visible to session_id, after cursor"""
+    if db.get_bind().dialect.name != "postgresql":
+        return memory_index.search(q, session_id, limit, cursor)
+
+    params = {
+        "q": q,
+        "pattern": like_pattern(q),
+        "session_id": session_id,
+        "limit": limit,
+        "places": SCORE_PLACES,
+        "scene_weight": SCENE_WEIGHT,
+        "dialogue_weight": DIALOGUE_WEIGHT,
+        "trigram_weight": TRIGRAM_WEIGHT,
+    }
+    cursor_clause = ""
+    if cursor is not None:
+        params["cursor_score"], params["cursor_id"] = cursor
+        cursor_clause = POSTGRES_CURSOR_CLAUSE
+    rows = db.execute(text(POSTGRES_SEARCH.format(cursor_clause=cursor_clause)), params)
+    return [(str(row.webtoon_id), row.score) for row in rows]
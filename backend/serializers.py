@@ -0,0 +1,63 @@
+"""
+Response serialization helpers
+
+Handlers return plain dicts built from column values and let FastAPI
+validate them once against the route's `response_model`. Building a
+pydantic model in the handler first means FastAPI dumps it and validates it
+again, so the work is paid twice (see benchmarks/test_serialization.py).
+
+For the heaviest read endpoints `json_response` goes one step further:
+it validates ORM objects once and encodes them straight to JSON bytes in
+pydantic-core, skipping FastAPI's response_model pass entirely. Its ETag
+lets CompressionMiddleware compress each content version only once.
+"""
+import hashlib
+from functools import lru_cache
+from typing import Any, Tuple
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import inspect
+
+
+@lru_cache(maxsize=None)
+def _column_keys(model_class) -> Tuple[str, ...]:
+    return tuple(attr.key for attr in inspect(model_class).column_attrs)
+
+
+def row_to_dict(obj, **extra) -> dict:
+    """Column values of an ORM object as a new dict
+
+    Unlike `obj.__dict__` this never mutates the instance, includes
+    expired columns (reloading them) and skips relationships, so no lazy
+    loads are triggered.
+    """
+    data = {key: getattr(obj, key) for key in _column_keys(type(obj))}
+    data.update(extra)
+    return data
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def json_response(response_type, content: Any, status_code: int = 200, headers: dict = None) -> Response:
+    """Validate content against response_type once and return it as encoded JSON
+
+    Use with the same type as the route's response_model, which is then
+    kept for the OpenAPI schema only.
+    """
+    adapter = _type_adapter(response_type)
+    validated = adapter.validate_python(content, from_attributes=True)
+    body = adapter.dump_json(validated)
+    
+    headers = dict(headers or {})
+    headers["ETag"] = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
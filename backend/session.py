@@ -1,35 +1,186 @@
 """
 Session management utilities
+
+Session cookies carry an HMAC-signed token:
+
+    <session_id>.<issued_at>.<owned webtoon ids>.<signature>
+
+The signature is checked in-process, so forged or expired cookies are
+rejected before any database access, and ownership of recently created
+webtoons can be answered from the token claims alone. Writes covered by a
+claim skip the owner lookup; the foreign key to webtoons still rejects a
+webtoon deleted since the claim was signed.
+
+Unsigned cookies from before tokens were signed are accepted and re-issued
+signed while SESSION_ALLOW_LEGACY is on (the default), so existing readers
+keep their session and their webtoons. Turn it off once those cookies have
+been upgraded or expired.
+
+SESSION_SECRET is required; the app refuses to start without it.
+
+SessionMiddleware parses the cookie once per request into `request.state`
+and writes `Set-Cookie` only when a handler issued or changed the token, so
+responses that never touch the session stay cacheable.
+
+Successful writes also set a short-lived `last_write` cookie. While it is
+fresh, get_read_db sends the client's reads to the primary instead of a
+replica (read-your-writes). A cookie works across workers, which a
+per-process map would not.
 """
 from fastapi import Request, Response
-import uuid
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+import base64
 import hashlib
-from typing import Optional
+import hmac
+import os
+import time
+import uuid
+from typing import NamedTuple, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
 
 COOKIE_NAME = "session_id"
 COOKIE_MAX_AGE = 60 * 60 * 24 * 30  # 30 days
 
-def get_or_create_session_id(request: Request, response: Response) -> str:
+SESSION_SECRET = os.getenv("SESSION_SECRET", "").encode()
+# Accept unsigned cookies issued before tokens were signed; they are re-issued signed
+SESSION_ALLOW_LEGACY = os.getenv("SESSION_ALLOW_LEGACY", "true").lower() == "true"
+# Cap on owned-webtoon claims kept in the cookie (oldest are dropped first)
+MAX_OWNED_CLAIMS = 20
+# Reads stay on the primary this long after a client's last write
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+WRITE_COOKIE_NAME = "last_write"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Cache-Control for public reads that do not depend on the session
+# (shared caches may reuse them briefly; browsers always revalidate)
+PUBLIC_CACHE_CONTROL = "public, max-age=0, s-maxage=30"
+# Cache-Control for reads personalised for a session (is_owner, is_liked, drafts)
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+class SessionToken(NamedTuple):
+    session_id: str
+    issued_at: int
+    owned_webtoons: Tuple[str, ...] = ()
+    signed: bool = True
+
+def require_session_secret() -> bytes:
+    """The HMAC key for session tokens and upload URLs; there is no fallback"""
+    if not SESSION_SECRET:
+        raise RuntimeError(
+            "SESSION_SECRET is not set. Generate one with "
+            "`python -c \"import secrets; print(secrets.token_urlsafe(32))\"`"
+        )
+    return SESSION_SECRET
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(require_session_secret(), payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+def _is_legacy_session_id(value: str) -> bool:
+    return len(value) == 32 and all(c in "0123456789abcdef" for c in value)
+
+def _normalize_webtoon_id(webtoon_id) -> str:
+    return uuid.UUID(str(webtoon_id)).hex
+
+def sign_session_token(session_id: str, owned_webtoons=(), issued_at: Optional[int] = None) -> str:
+    """Build a signed session token"""
+    if issued_at is None:
+        issued_at = int(time.time())
+    claims = ",".join(owned_webtoons)
+    payload = f"{session_id}.{issued_at}.{claims}"
+    return f"{payload}.{_sign(payload)}"
+
+def parse_session_token(token: Optional[str]) -> Optional[SessionToken]:
+    """Verify a session token, returning None if it is missing, forged or expired"""
+    if not token:
+        return None
+
+    parts = token.split(".")
+    if len(parts) != 4:
+        if SESSION_ALLOW_LEGACY and _is_legacy_session_id(token):
+            return SessionToken(session_id=token, issued_at=0, signed=False)
+        return None
+
+    session_id, issued_at, claims, signature = parts
+    if not hmac.compare_digest(signature, _sign(f"{session_id}.{issued_at}.{claims}")):
+        return None
+
+    try:
+        issued_at = int(issued_at)
+    except ValueError:
+        return None
+    if issued_at + COOKIE_MAX_AGE < time.time():
+        return None
+
+    owned = tuple(claims.split(",")) if claims else ()
+    return SessionToken(session_id=session_id, issued_at=issued_at, owned_webtoons=owned)
+
+def _session_cookie_header(token: SessionToken) -> str:
+    response = Response()
+    response.set_cookie(
+        key=COOKIE_NAME,
+        value=sign_session_token(token.session_id, token.owned_webtoons, token.issued_at),
+        max_age=COOKIE_MAX_AGE,
+        httponly=True,
+        samesite="lax"
+    )
+    return response.headers["set-cookie"]
+
+def _write_cookie_header() -> str:
+    response = Response()
+    response.set_cookie(
+        key=WRITE_COOKIE_NAME,
+        value=str(int(time.time())),
+        max_age=READ_YOUR_WRITES_SECONDS,
+        httponly=True,
+        samesite="lax"
+    )
+    return response.headers["set-cookie"]
+
+def wrote_recently(request: Request) -> bool:
+    """Whether this client made a successful write within READ_YOUR_WRITES_SECONDS"""
+    try:
+        last_write = int(request.cookies.get(WRITE_COOKIE_NAME, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write < READ_YOUR_WRITES_SECONDS
+
+def _issue_session_token(request: Request, token: SessionToken) -> None:
+    """Make token the request's session and have SessionMiddleware send it as a cookie"""
+    request.state.session_token = token
+    request.state.session_cookie = token
+
+def get_session_token(request: Request) -> Optional[SessionToken]:
+    """Get the verified session token, parsing the cookie at most once per request"""
+    if not hasattr(request.state, "session_token"):
+        request.state.session_token = parse_session_token(request.cookies.get(COOKIE_NAME))
+    return request.state.session_token
+
+def get_or_create_session_id(request: Request) -> str:
     """Get existing session ID from cookie or create a new one"""
-    session_id = request.cookies.get(COOKIE_NAME)
-    
-    if not session_id:
+    token = get_session_token(request)
+
+    if not token:
         # Generate new session ID
-        session_id = generate_session_id()
-        # Set cookie
-        response.set_cookie(
-            key=COOKIE_NAME,
-            value=session_id,
-            max_age=COOKIE_MAX_AGE,
-            httponly=True,
-            samesite="lax"
-        )
-    
-    return session_id
+        token = SessionToken(session_id=generate_session_id(), issued_at=int(time.time()))
+        _issue_session_token(request, token)
+    elif not token.signed:
+        # Upgrade a legacy cookie to a signed token, keeping the same ID
+        _issue_session_token(request, token._replace(issued_at=int(time.time()), signed=True))
+
+    return token.session_id
 
 def get_session_id(request: Request) -> Optional[str]:
     """Get session ID from cookie"""
-    return request.cookies.get(COOKIE_NAME)
+    token = get_session_token(request)
+    return token.session_id if token else None
+
+def set_read_cache_headers(response: Response, session_id: Optional[str]) -> None:
+    """Public reads are shareable for anonymous clients and private once personalised"""
+    response.headers["Cache-Control"] = PRIVATE_CACHE_CONTROL if session_id else PUBLIC_CACHE_CONTROL
+    response.headers.add_vary_header("Cookie")
 
 def generate_session_id() -> str:
     """Generate a unique session ID"""
@@ -38,6 +189,71 @@ def generate_session_id() -> str:
 
 def check_ownership(session_id: str, owner_session_id: Optional[str]) -> bool:
     """Check if the current session owns the resource"""
-    if not owner_session_id:
+    if not owner_session_id or not session_id:
+        return False
+    return hmac.compare_digest(session_id, owner_session_id)
+
+def has_ownership_claim(request: Request, webtoon_id) -> bool:
+    """Check the signed token for an ownership claim on a webtoon (no database access)"""
+    token = get_session_token(request)
+    if not token or not token.owned_webtoons:
+        return False
+    try:
+        return _normalize_webtoon_id(webtoon_id) in token.owned_webtoons
+    except ValueError:
         return False
-    return session_id == owner_session_id
\ No newline at end of file
+
+def add_ownership_claim(request: Request, session_id: str, webtoon_id) -> None:
+    """Re-issue the session cookie with an ownership claim for a newly created webtoon"""
+    token = get_session_token(request)
+    if not token or token.session_id != session_id:
+        token = SessionToken(session_id=session_id, issued_at=int(time.time()))
+
+    claim = _normalize_webtoon_id(webtoon_id)
+    owned = tuple(w for w in token.owned_webtoons if w != claim) + (claim,)
+    _issue_session_token(request, token._replace(
+        issued_at=int(time.time()),
+        owned_webtoons=owned[-MAX_OWNED_CLAIMS:],
+        signed=True
+    ))
+
+def remove_ownership_claim(request: Request, webtoon_id) -> None:
+    """Re-issue the session cookie without the claim for a deleted webtoon"""
+    token = get_session_token(request)
+    if not token:
+        return
+
+    claim = _normalize_webtoon_id(webtoon_id)
+    if claim not in token.owned_webtoons:
+        return
+
+    _issue_session_token(request, token._replace(
+        owned_webtoons=tuple(w for w in token.owned_webtoons if w != claim),
+        signed=True
+    ))
+
+class SessionMiddleware:
+    """Resolve the session once per request, emit Set-Cookie only when it changed, and mark writes"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["session_token"] = parse_session_token(HTTPConnection(scope).cookies.get(COOKIE_NAME))
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start":
+                token = state.get("session_cookie")
+                if token is not None:
+                    MutableHeaders(scope=message).append("set-cookie", _session_cookie_header(token))
+                if (READ_YOUR_WRITES_SECONDS > 0 and scope["method"] not in SAFE_METHODS
+                        and message["status"] < 400):
+                    MutableHeaders(scope=message).append("set-cookie", _write_cookie_header())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,116 @@
+"""
+Opt-in SQL statement profiler and N+1 detector
+
+Enable with SQL_PROFILING=true. For every request it records the number of
+statements, total database time and how often each statement shape was
+repeated, logs a warning when one shape repeats more than
+SQL_N_PLUS_ONE_THRESHOLD times (the usual sign of a per-row query in a
+loop), and with SQL_SERVER_TIMING=true adds a `Server-Timing` header that
+browser devtools show next to the request.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILING = os.getenv("SQL_PROFILING", "false").lower() == "true"
+SQL_SERVER_TIMING = os.getenv("SQL_SERVER_TIMING", "true").lower() == "true"
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+class RequestProfile:
+    """Statements executed while handling one request"""
+
+    def __init__(self):
+        self.statement_count = 0
+        self.total_time = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statement_count += 1
+        self.total_time += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int):
+        """Statement shapes executed more than threshold times"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > threshold]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so queries differing only in literals compare equal"""
+    return _LITERALS.sub("?", _WHITESPACE.sub(" ", statement).strip())
+
+
+def instrument_engine(engine) -> None:
+    """Attach timing listeners to a SQLAlchemy engine"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sql_profiler_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["sql_profiler_start"].pop()
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, time.perf_counter() - start)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # after_cursor_execute never fires for a failed statement; drop its start time
+        conn = context.connection
+        if conn is not None and conn.info.get("sql_profiler_start"):
+            conn.info["sql_profiler_start"].pop()
+
+
+class SQLProfilerMiddleware:
+    """Collect a RequestProfile per request, log N+1 patterns and emit Server-Timing"""
+
+    def __init__(self, app, threshold: int = SQL_N_PLUS_ONE_THRESHOLD, server_timing: bool = SQL_SERVER_TIMING):
+        self.app = app
+        self.threshold = threshold
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                MutableHeaders(scope=message).append(
+                    "server-timing",
+                    f'db;dur={profile.total_time * 1000:.1f};desc="{profile.statement_count} queries"'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+
+            for statement, count in profile.repeated(self.threshold):
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times: %s",
+                    scope["method"], scope["path"], count, statement[:200]
+                )
+            logger.debug(
+                "%s %s: %d statements, %.1f ms in database",
+                scope["method"], scope["path"], profile.statement_count, profile.total_time * 1000
+            )
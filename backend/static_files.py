@@ -0,0 +1,87 @@
+"""
+Static file serving tuned for uploads
+
+- Upload names are random UUIDs (or content hashes) and are never
+  overwritten, so they are served with `Cache-Control: immutable` and a
+  one-year max-age; anything else must revalidate with its ETag.
+- A precompressed `<file>.br` / `<file>.gz` sibling is served instead of
+  the original when the client accepts that encoding.
+- Unvalidated direct uploads under storage.PENDING_UPLOAD_PREFIX are never
+  served.
+- ETag, Last-Modified and conditional 304s come from Starlette's
+  FileResponse, which also uses the `http.response.pathsend` extension
+  (zero-copy send) when the ASGI server offers it.
+"""
+import mimetypes
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.staticfiles import StaticFiles
+
+from compression import choose_encoding
+from storage import PENDING_UPLOAD_PREFIX
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+# uuid4 names written by the upload handlers, or hex content hashes
+_HASHED_NAME = re.compile(
+    r"^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{16,})(?:\.[0-9a-z]+)*$",
+    re.IGNORECASE
+)
+
+PRECOMPRESSED_EXTENSIONS = {"br": ".br", "gzip": ".gz"}
+
+
+def is_content_hashed(path: str) -> bool:
+    return bool(_HASHED_NAME.match(os.path.basename(path)))
+
+
+class UploadStaticFiles(StaticFiles):
+    """StaticFiles with immutable caching and precompressed variants"""
+
+    async def get_response(self, path: str, scope):
+        if os.path.normpath(path).split(os.sep)[0] == PENDING_UPLOAD_PREFIX:
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        encoding, variant = self._precompressed_variant(full_path, scope)
+
+        if variant is not None:
+            variant_path, variant_stat = variant
+            response = super().file_response(variant_path, variant_stat, scope, status_code)
+            media_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+            response.headers["content-type"] = media_type
+            response.headers["content-encoding"] = encoding
+        else:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+
+        response.headers.add_vary_header("Accept-Encoding")
+        response.headers["cache-control"] = (
+            IMMUTABLE_CACHE_CONTROL if is_content_hashed(str(full_path)) else REVALIDATE_CACHE_CONTROL
+        )
+        return response
+
+    def _precompressed_variant(self, full_path, scope):
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if not accept_encoding:
+            return None, None
+
+        available = {}
+        for encoding, extension in PRECOMPRESSED_EXTENSIONS.items():
+            candidate = f"{full_path}{extension}"
+            try:
+                available[encoding] = (candidate, os.stat(candidate))
+            except OSError:
+                continue
+
+        if not available:
+            return None, None
+
+        encoding = choose_encoding(accept_encoding, candidates=list(available))
+        if encoding is None:
+            return None, None
+        return encoding, available[encoding]
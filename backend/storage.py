@@ -0,0 +1,228 @@
+"""
+Object storage backends for uploaded images
+
+Routers store files through `get_storage()` instead of writing to
+`static/uploads/...` directly, so uploads can live on shared object storage
+when the API runs on several nodes.
+
+STORAGE_BACKEND=local  files under STATIC_ROOT, served from /static (default)
+STORAGE_BACKEND=s3     an S3-compatible bucket (AWS, or MinIO/moto locally
+                       via S3_ENDPOINT_URL)
+
+Both backends can presign a direct upload, letting clients send image bytes
+straight to storage instead of through an API worker. Presigned uploads land
+under PENDING_UPLOAD_PREFIX, which is never served: the image worker copies
+an object to its public `uploads/...` key only after validating it. With S3,
+expose only `uploads/` in the bucket policy.
+"""
+import abc
+import base64
+import contextlib
+import hashlib
+import hmac
+import os
+import time
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlencode
+
+from dotenv import load_dotenv
+
+from session import require_session_secret
+
+load_dotenv()
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STATIC_ROOT = os.getenv("STATIC_ROOT", "static")
+STATIC_URL = os.getenv("STATIC_URL", "/static")
+UPLOAD_URL_EXPIRES = int(os.getenv("UPLOAD_URL_EXPIRES", "600"))  # seconds
+
+# Route that receives presigned uploads for the local backend
+LOCAL_UPLOAD_PATH = "/api/uploads/local"
+# Unvalidated direct uploads; not served by /static
+PENDING_UPLOAD_PREFIX = "incoming"
+
+
+class FileTooLarge(Exception):
+    """A streamed upload exceeded its size limit"""
+
+
+class Storage(abc.ABC):
+    """Interface shared by the storage backends"""
+
+    @abc.abstractmethod
+    def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        """Store data under key and return its public URL"""
+
+    @abc.abstractmethod
+    def read(self, key: str) -> bytes:
+        ...
+
+    @abc.abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def size(self, key: str) -> int:
+        ...
+
+    @abc.abstractmethod
+    def url_for(self, key: str) -> str:
+        ...
+
+    @abc.abstractmethod
+    def presign_upload(self, key: str, content_type: str, expires: int = UPLOAD_URL_EXPIRES) -> dict:
+        """Return {"method", "url", "headers"} for a direct PUT of key"""
+
+
+class LocalStorage(Storage):
+    """Files on the local disk, served by the /static mount"""
+
+    def __init__(self, root: str = STATIC_ROOT, base_url: str = STATIC_URL, secret: bytes = None):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        self.secret = secret or require_session_secret()
+
+    def path_for(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return self.url_for(key)
+
+    async def save_stream(self, key: str, chunks, max_size: int) -> int:
+        """Write an async iterable of bytes to key without buffering it; returns the size"""
+        import aiofiles
+
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.part"
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_size:
+                        raise FileTooLarge(key)
+                    await f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+        return size
+
+    def read(self, key: str) -> bytes:
+        with open(self.path_for(key), "rb") as f:
+            return f.read()
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path_for(key))
+
+    def delete(self, key: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path_for(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self.path_for(key))
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def sign(self, key: str, content_type: str, expires_at: int) -> str:
+        payload = f"{key}\n{content_type}\n{expires_at}".encode()
+        digest = hmac.new(self.secret, payload, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def verify_upload(self, key: str, content_type: str, expires_at: int, signature: str) -> bool:
+        if expires_at < time.time():
+            return False
+        return hmac.compare_digest(signature, self.sign(key, content_type, expires_at))
+
+    def presign_upload(self, key: str, content_type: str, expires: int = UPLOAD_URL_EXPIRES) -> dict:
+        expires_at = int(time.time()) + expires
+        query = urlencode({"expires": expires_at, "signature": self.sign(key, content_type, expires_at)})
+        return {
+            "method": "PUT",
+            "url": f"{LOCAL_UPLOAD_PATH}/{key}?{query}",
+            "headers": {"Content-Type": content_type},
+        }
+
+
+class S3Storage(Storage):
+    """S3-compatible bucket (AWS S3, MinIO, moto server)"""
+
+    def __init__(self, bucket: str, region: Optional[str] = None, endpoint_url: Optional[str] = None,
+                 public_base_url: Optional[str] = None):
+        import boto3  # Only needed when the S3 backend is selected
+
+        self.bucket = bucket
+        self.client = boto3.client("s3", region_name=region, endpoint_url=endpoint_url)
+        if public_base_url:
+            self.public_base_url = public_base_url.rstrip("/")
+        elif endpoint_url:
+            self.public_base_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            # boto3 resolves the region from AWS_REGION, AWS_DEFAULT_REGION or ~/.aws/config
+            resolved = self.client.meta.region_name
+            host = f"s3.{resolved}.amazonaws.com" if resolved else "s3.amazonaws.com"
+            self.public_base_url = f"https://{bucket}.{host}"
+
+    def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+        extra = {"ContentType": content_type} if content_type else {}
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, **extra)
+        return self.url_for(key)
+
+    def read(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def url_for(self, key: str) -> str:
+        return f"{self.public_base_url}/{key}"
+
+    def presign_upload(self, key: str, content_type: str, expires: int = UPLOAD_URL_EXPIRES) -> dict:
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket, "Key": key, "ContentType": content_type},
+            ExpiresIn=expires
+        )
+        return {"method": "PUT", "url": url, "headers": {"Content-Type": content_type}}
+
+
+@lru_cache(maxsize=None)
+def get_storage() -> Storage:
+    """Storage backend selected by STORAGE_BACKEND"""
+    if STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=os.getenv("S3_BUCKET_NAME"),
+            region=os.getenv("AWS_REGION"),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+            public_base_url=os.getenv("S3_PUBLIC_BASE_URL") or None
+        )
+    return LocalStorage()
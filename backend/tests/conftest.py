@@ -0,0 +1,82 @@
+"""
+Shared fixtures
+
+Settings are read from the environment when modules are imported, so they
+are set here before anything from the app is imported. Each run gets a
+scratch directory holding a SQLite database and the `static/` upload tree.
+main.py mounts `static` relative to the working directory, so the session
+runs from there. The session secret is fixed and periodic jobs are off.
+"""
+import os
+import tempfile
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="gltr-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(SCRATCH_DIR, 'test.db')}",
+    "SESSION_SECRET": "test-session-secret",
+    "SKIP_SCHEMA_CHECK": "true",
+    "TRENDING_REFRESH_SECONDS": "0",
+    "CO_LIKE_REFRESH_SECONDS": "0",
+})
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+from models import Base
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    previous = os.getcwd()
+    os.chdir(SCRATCH_DIR)
+    database.create_tables_from_models()
+    yield
+    os.chdir(previous)
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+    with database.engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def app():
+    from main import app
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """A reader with their own cookie jar"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def other_client(app):
+    """A second, unrelated reader"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def webtoon(client):
+    """A published webtoon owned by `client`"""
+    response = client.post("/api/webtoons/", json={"title": "테스트 웹툰", "summary": "요약"})
+    assert response.status_code == 200, response.text
+    return response.json()
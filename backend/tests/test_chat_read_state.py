@@ -0,0 +1,67 @@
+import uuid
+
+
+def send(client, webtoon_id, text="안녕하세요"):
+    """Post a reader message; the character replies to it"""
+    response = client.post("/api/chat/messages", json={
+        "webtoon_id": webtoon_id, "sender_type": "user", "sender_name": "독자", "message": text
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def unread(client, webtoon_id):
+    return client.get(f"/api/chat/unread-count/webtoon/{webtoon_id}").json()["unread_count"]
+
+
+def test_each_reply_counts_as_unread(client, other_client, webtoon):
+    for _ in range(3):
+        send(client, webtoon["id"])
+    send(other_client, webtoon["id"])
+
+    assert unread(client, webtoon["id"]) == 3
+    assert unread(other_client, webtoon["id"]) == 1
+
+
+def test_read_marker_covers_thread_and_only_moves_forward(client, webtoon):
+    first, second, third = (send(client, webtoon["id"]) for _ in range(3))
+    url = f"/api/chat/read-marker/webtoon/{webtoon['id']}"
+
+    marker = client.put(url, json={"message_id": second}).json()
+    assert marker["last_read_message_id"] == second
+    assert marker["unread_count"] == 1
+    assert unread(client, webtoon["id"]) == 1
+
+    # An older message leaves the mark and the counter where they are
+    marker = client.put(url, json={"message_id": first}).json()
+    assert marker["last_read_message_id"] == second
+    assert marker["unread_count"] == 1
+
+    marker = client.put(url, json={"message_id": third}).json()
+    assert marker["unread_count"] == 0
+
+
+def test_marking_a_reply_read_twice_decrements_once(client, db, webtoon):
+    from models import ChatMessage
+
+    root = send(client, webtoon["id"])
+    send(client, webtoon["id"])
+    reply = db.query(ChatMessage.id).filter(ChatMessage.parent_message_id == uuid.UUID(root)).scalar()
+
+    for _ in range(2):
+        assert client.put(f"/api/chat/messages/{reply}/read").status_code == 200
+    assert unread(client, webtoon["id"]) == 1
+
+
+def test_readers_cannot_mark_other_threads(client, other_client, db, webtoon):
+    from models import ChatMessage
+
+    root = send(client, webtoon["id"])
+    send(other_client, webtoon["id"])
+    reply = db.query(ChatMessage.id).filter(ChatMessage.parent_message_id == uuid.UUID(root)).scalar()
+
+    assert other_client.put(f"/api/chat/messages/{reply}/read").status_code == 404
+    other_client.post("/api/chat/messages/batch-read", json=[str(root), str(reply)])
+
+    assert unread(client, webtoon["id"]) == 1
+    assert unread(other_client, webtoon["id"]) == 1
@@ -0,0 +1,61 @@
+import uuid
+
+import numpy as np
+
+import collaborative
+from models import Like, Webtoon
+
+
+def add_webtoons(db, *titles):
+    webtoons = [Webtoon(id=uuid.uuid4(), title=title, status="published", session_id="author") for title in titles]
+    db.add_all(webtoons)
+    db.commit()
+    return webtoons
+
+
+def like(db, webtoon, *sessions):
+    db.add_all([Like(webtoon_id=webtoon.id, session_id=session) for session in sessions])
+    db.commit()
+
+
+def test_neighbours_need_enough_shared_readers():
+    # Items 0 and 1 share readers 0 and 1; item 2 shares only reader 0 with them
+    items = np.array([0, 1, 0, 1, 2])
+    sessions = np.array([0, 0, 1, 1, 0])
+    item, neighbour, rank, score, co_likes = collaborative.co_like_neighbours(items, sessions, 3, 2)
+
+    assert sorted(zip(item.tolist(), neighbour.tolist())) == [(0, 1), (1, 0)]
+    assert rank.tolist() == [1, 1]
+    assert co_likes.tolist() == [2, 2]
+    expected = 2 / np.sqrt(2 * 2) * 2 / (2 + collaborative.CO_LIKE_SHRINKAGE)
+    assert np.allclose(score, expected)
+
+
+def test_more_shared_readers_rank_first():
+    items = np.array([0, 1, 0, 1, 0, 1, 0, 2, 0, 2])
+    sessions = np.array([0, 0, 1, 1, 2, 2, 3, 3, 4, 4])
+    item, neighbour, rank, _, _ = collaborative.co_like_neighbours(items, sessions, 3, 5)
+
+    ranked = [n for i, n, r in sorted(zip(item.tolist(), neighbour.tolist(), rank.tolist())) if i == 0]
+    assert ranked == [1, 2]
+
+
+def test_also_liked_after_rebuild(client, db):
+    letter, reply, space = add_webtoons(db, "등대지기의 편지", "등대지기의 답장", "화성 기지")
+    like(db, letter, "a", "b", "c")
+    like(db, reply, "a", "b", "c")
+    like(db, space, "d", "e")
+
+    assert collaborative.refresh_co_likes(max_age=0) == 2
+    response = client.get(f"/api/webtoons/{letter.id}/also-liked")
+    assert [item["title"] for item in response.json()["webtoons"]] == ["등대지기의 답장"]
+
+
+def test_fresh_rebuild_is_skipped(db):
+    letter, reply = add_webtoons(db, "등대지기의 편지", "등대지기의 답장")
+    like(db, letter, "a", "b")
+    like(db, reply, "a", "b")
+
+    assert collaborative.refresh_co_likes(max_age=0) == 2
+    assert collaborative.refresh_co_likes(max_age=3600) == 0
+    assert collaborative.last_rebuild(db) is not None
@@ -0,0 +1,91 @@
+import gzip
+import os
+import uuid
+
+import pytest
+
+from compression import CompressedBodyCache, choose_encoding
+from static_files import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+
+
+def svg(fill: str) -> bytes:
+    shapes = "".join(f'<rect x="{i}" y="{i}" width="10" height="10" fill="{fill}"/>' for i in range(150))
+    return f'<svg xmlns="http://www.w3.org/2000/svg">{shapes}</svg>'.encode()
+
+
+@pytest.fixture
+def static_dir():
+    directory = os.path.join("static", "test-" + uuid.uuid4().hex[:8])
+    os.makedirs(directory)
+    return directory
+
+
+def write(directory: str, name: str, body: bytes, mtime: int = 1_700_000_000) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "wb") as file:
+        file.write(body)
+    os.utime(path, (mtime, mtime))
+    return "/" + path.replace(os.sep, "/")
+
+
+def test_files_sharing_an_etag_get_their_own_compressed_body(client, static_dir):
+    # Same size and mtime, so FileResponse gives both the same ETag
+    red, blue = svg("#ff0000"), svg("#0000ff")
+    assert len(red) == len(blue)
+    red_url = write(static_dir, "red.svg", red)
+    blue_url = write(static_dir, "blue.svg", blue)
+
+    responses = [client.get(url, headers={"Accept-Encoding": "gzip"}) for url in (red_url, blue_url)]
+    assert responses[0].headers["etag"] == responses[1].headers["etag"]
+    for response, body in zip(responses, (red, blue)):
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == body  # httpx decodes gzip
+
+
+def test_compressed_etag_is_weak_and_still_revalidates(client, static_dir):
+    url = write(static_dir, "shape.svg", svg("#00ff00"))
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+
+    revalidated = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+
+def test_small_bodies_are_not_compressed(client, static_dir):
+    url = write(static_dir, "tiny.svg", b'<svg xmlns="http://www.w3.org/2000/svg"/>')
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_precompressed_sibling_is_served(client, static_dir):
+    body = svg("#123456")
+    url = write(static_dir, "sprite.svg", body)
+    write(static_dir, "sprite.svg.gz", gzip.compress(body, compresslevel=9))
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "image/svg+xml"
+    assert response.content == body
+
+
+def test_cache_control_depends_on_the_file_name(client, static_dir):
+    hashed_url = write(static_dir, f"{uuid.uuid4()}.svg", svg("#abcdef"))
+    named_url = write(static_dir, "logo.svg", svg("#abcdef"))
+    assert client.get(hashed_url).headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert client.get(named_url).headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+
+def test_cache_is_keyed_by_path():
+    cache = CompressedBodyCache(max_entries=2)
+    first = cache.get_or_compress("/a", '"tag"', b"a" * 100, "gzip")
+    second = cache.get_or_compress("/b", '"tag"', b"b" * 100, "gzip")
+    assert gzip.decompress(first) == b"a" * 100
+    assert gzip.decompress(second) == b"b" * 100
+    assert cache.get_or_compress("/a", '"tag"', b"ignored", "gzip") is first
+
+
+def test_choose_encoding_honours_q_values():
+    assert choose_encoding("gzip;q=0.5, br;q=0", candidates=["br", "gzip"]) == "gzip"
+    assert choose_encoding("identity", candidates=["br", "gzip"]) is None
+    assert choose_encoding("*", candidates=["gzip"]) == "gzip"
@@ -0,0 +1,93 @@
+"""
+EXPLAIN checks for the hot-query indexes (PostgreSQL only)
+
+Skipped unless TEST_DATABASE_URL names a PostgreSQL database this test may
+take over. The migrations are applied to it and a small data set is
+seeded. Every query in benchmarks/check_index_usage.py must then use its
+index with sequential scans disabled. The schema is downgraded to base
+afterwards.
+"""
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.check_index_usage import CHECKS, check_plans
+from models import ChatMessage, Comment, Like, Webtoon
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="set TEST_DATABASE_URL to a scratch PostgreSQL database"
+)
+
+
+def seed(db: Session, webtoons: int = 30, sessions: int = 40) -> None:
+    rng = random.Random(42)
+    session_ids = [uuid.uuid4().hex for _ in range(sessions)]
+    now = datetime.utcnow()
+
+    for index in range(webtoons):
+        webtoon = Webtoon(
+            id=uuid.uuid4(), title=f"웹툰 {index}", status="published" if index % 3 else "draft",
+            session_id=rng.choice(session_ids), created_at=now - timedelta(hours=index)
+        )
+        db.add(webtoon)
+
+        for _ in range(5):
+            root = Comment(id=uuid.uuid4(), webtoon_id=webtoon.id, content="댓글", session_id=rng.choice(session_ids))
+            db.add(root)
+            db.add(Comment(webtoon_id=webtoon.id, content="답글", parent_comment_id=root.id,
+                           session_id=rng.choice(session_ids)))
+
+        for session_id in rng.sample(session_ids, 10):
+            db.add(Like(webtoon_id=webtoon.id, session_id=session_id))
+
+        for offset in range(5):
+            question = ChatMessage(
+                id=uuid.uuid4(), webtoon_id=webtoon.id, sender_type="user", message="질문",
+                session_id=rng.choice(session_ids), is_read=True, created_at=now + timedelta(minutes=offset)
+            )
+            db.add(question)
+            db.add(ChatMessage(
+                webtoon_id=webtoon.id, sender_type="character", message="답변", session_id="ai_system",
+                is_read=False, parent_message_id=question.id, created_at=now + timedelta(minutes=offset, seconds=1)
+            ))
+    db.commit()
+
+
+@pytest.fixture(scope="module")
+def postgres():
+    from alembic import command
+    from database import _alembic_config
+
+    engine = create_engine(TEST_DATABASE_URL)
+    try:
+        engine.connect().close()
+    except Exception as exc:
+        pytest.skip(f"TEST_DATABASE_URL is unreachable: {exc}")
+
+    config = _alembic_config()
+    config.set_main_option("sqlalchemy.url", TEST_DATABASE_URL)
+    command.upgrade(config, "head")
+    try:
+        with Session(engine) as db:
+            seed(db)
+        yield engine
+    finally:
+        engine.dispose()
+        command.downgrade(config, "base")
+
+
+def test_hot_queries_use_their_indexes(postgres):
+    with postgres.begin() as conn:
+        results = {name: (used, ok) for name, used, _, ok in check_plans(conn)}
+
+    assert set(results) == {name for name, _, _ in CHECKS}
+    missing = {name: sorted(used) for name, (used, ok) in results.items() if not ok}
+    assert not missing, f"expected index not used (indexes in plan): {missing}"
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from intent_matcher import NAIVE_SCAN_MAX_KEYWORDS, IntentMatcher, IntentResponder
+from models import ChatMessage
+from routers.chat_router import CHARACTER_INTENTS, CHAT_FALLBACK, CHAT_INTENTS, generate_ai_response
+
+INTENTS = [
+    ("greeting", ["안녕", "hi"]),
+    ("story", ["이야기", "this story"]),
+    ("question", ["?", "왜"]),
+]
+
+
+@pytest.fixture(params=[False, True], ids=["naive", "compiled"])
+def matcher(request):
+    return IntentMatcher(INTENTS, compiled=request.param)
+
+
+def replies(intent, table=CHAT_INTENTS):
+    return next(rows for name, _, rows in table if name == intent)
+
+
+def test_earlier_intent_wins(matcher):
+    assert matcher.match("왜 그런 이야기를 했나요?") == "story"
+    assert matcher.match("안녕, 왜?") == "greeting"
+
+
+def test_overlapping_keywords(matcher):
+    # "hi" sits inside "this story", so both intents match and greeting wins
+    assert matcher.match("Tell me THIS STORY") == "greeting"
+    assert IntentMatcher([("story", ["this story"]), ("greeting", ["hi"])], matcher.compiled).match("this story") == "story"
+    # A keyword inside a longer one still yields to the earlier intent
+    nested = IntentMatcher([("long", ["abcd"]), ("short", ["bc"])], matcher.compiled)
+    assert nested.match("xabcdx") == "long"
+    assert nested.match("xabcx") == "short"
+
+
+def test_no_match(matcher):
+    assert matcher.match("그냥 지나가요") is None
+    assert matcher.match("") is None
+
+
+def test_automaton_switches_on_above_threshold():
+    assert not IntentMatcher(INTENTS).compiled
+    many = [(f"intent{n}", [f"keyword{n}"]) for n in range(NAIVE_SCAN_MAX_KEYWORDS + 1)]
+    matcher = IntentMatcher(many)
+    assert matcher.compiled
+    assert matcher.match("... keyword7 and keyword70 ...") == "intent7"
+
+
+def test_naive_and_compiled_agree():
+    rng = random.Random(27)
+    alphabet = "abc안녕?"
+    intents = [(f"intent{n}", ["".join(rng.choices(alphabet, k=rng.randint(1, 3))) for _ in range(3)]) for n in range(8)]
+    naive, compiled = IntentMatcher(intents, compiled=False), IntentMatcher(intents, compiled=True)
+    for _ in range(500):
+        message = "".join(rng.choices(alphabet + " x", k=rng.randint(0, 12)))
+        assert naive.match(message) == compiled.match(message), message
+
+
+def test_responder_falls_back_when_nothing_matches():
+    responder = IntentResponder([("greeting", ["안녕"], ["반가워요"])], ["글쎄요"])
+    assert responder.respond("안녕하세요") == "반가워요"
+    assert responder.respond("오늘 날씨") == "글쎄요"
+
+
+def test_character_intents_come_first():
+    assert generate_ai_response("안녕하세요") in replies("greeting")
+    assert generate_ai_response("안녕하세요", "악역") in replies("greeting", CHARACTER_INTENTS["악역"])
+    assert generate_ai_response("네 계획이 뭐야?", "악역") in replies("plan", CHARACTER_INTENTS["악역"])
+    # Shared intents and the fallback still apply to every role
+    assert generate_ai_response("그 이야기 해줘", "악역") in replies("story")
+    assert generate_ai_response("주인공 이야기", "주인공") in replies("story")
+    assert generate_ai_response("음", "조연") in CHAT_FALLBACK
+
+
+def test_chat_reply_uses_the_character_role(client, db, webtoon):
+    response = client.post(f"/api/webtoons/{webtoon['id']}/characters", json={
+        "name": "그림자", "role": "악역", "webtoon_id": webtoon["id"]
+    })
+    assert response.status_code == 200, response.text
+
+    response = client.post("/api/chat/messages", json={
+        "webtoon_id": webtoon["id"], "sender_type": "user", "sender_name": "독자", "message": "무슨 계획이야"
+    })
+    assert response.status_code == 200, response.text
+
+    reply = db.query(ChatMessage).filter(ChatMessage.sender_type == "character").one()
+    assert reply.sender_name == "그림자"
+    assert reply.message in replies("plan", CHARACTER_INTENTS["악역"])
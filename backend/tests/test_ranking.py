@@ -0,0 +1,64 @@
+import math
+import uuid
+from datetime import datetime, timedelta
+
+import ranking
+from models import Comment, Webtoon, WebtoonScore
+
+
+def add_webtoon(db, title, **counts):
+    webtoon = Webtoon(id=uuid.uuid4(), title=title, status="published", session_id="author", **counts)
+    db.add(webtoon)
+    db.commit()
+    return webtoon
+
+
+def trending_titles(client):
+    response = client.get("/api/webtoons/trending")
+    assert response.status_code == 200, response.text
+    return [item["title"] for item in response.json()["webtoons"]]
+
+
+def test_activity_loses_half_its_weight_per_half_life():
+    at = datetime(2025, 1, 1)
+    later = at + timedelta(hours=ranking.TRENDING_HALF_LIFE_HOURS)
+    assert math.isclose(ranking.log_weight(1.0, later) - ranking.log_weight(1.0, at), math.log(2))
+    assert math.isclose(ranking.logaddexp(math.log(2), math.log(3)), math.log(5))
+
+
+def test_views_likes_and_comments_order_trending(client, db):
+    viewed = add_webtoon(db, "조회 많은 웹툰", view_count=50)
+    add_webtoon(db, "조용한 웹툰")
+    ranking.recompute_trending(db)
+    assert trending_titles(client)[0] == "조회 많은 웹툰"
+
+    # Only the new activity is folded in on the next run
+    liked = db.get(Webtoon, add_webtoon(db, "좋아요 많은 웹툰").id)
+    ranking.recompute_trending(db)
+    liked.like_count = 20
+    db.commit()
+    ranking.recompute_trending(db)
+
+    assert trending_titles(client)[:2] == ["좋아요 많은 웹툰", "조회 많은 웹툰"]
+    db.expire_all()
+    assert db.get(WebtoonScore, viewed.id).views_seen == 50
+    assert db.get(WebtoonScore, liked.id).likes_seen == 20
+
+
+def test_comments_count_from_when_they_were_written(client, db):
+    commented = add_webtoon(db, "댓글 많은 웹툰")
+    add_webtoon(db, "댓글 없는 웹툰")
+    written = datetime.utcnow() - timedelta(minutes=1)
+    db.add_all([Comment(webtoon_id=commented.id, content="재밌어요", created_at=written) for _ in range(3)])
+    db.commit()
+
+    ranking.recompute_trending(db)
+    assert trending_titles(client)[0] == "댓글 많은 웹툰"
+
+    # Written inside the commit lag: left for the next run
+    before = db.get(WebtoonScore, commented.id).score
+    db.add(Comment(webtoon_id=commented.id, content="방금", created_at=datetime.utcnow()))
+    db.commit()
+    ranking.recompute_trending(db)
+    db.expire_all()
+    assert db.get(WebtoonScore, commented.id).score == before
@@ -0,0 +1,113 @@
+import pytest
+
+import recommendations
+from models import SimilarityRefresh
+
+
+def queued(db):
+    db.expire_all()
+    return {str(row.webtoon_id) for row in db.query(SimilarityRefresh)}
+
+
+def create_webtoon(client, title, summary=""):
+    response = client.post("/api/webtoons/", json={"title": title, "summary": summary})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_scene(client, webtoon, narration, scene_number=1):
+    response = client.post("/api/scenes/", json={
+        "webtoon_id": webtoon["id"], "scene_number": scene_number,
+        "description": "장면", "narration": narration
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def similar_ids(client, webtoon):
+    response = client.get(f"/api/webtoons/{webtoon['id']}/similar")
+    assert response.status_code == 200, response.text
+    return [item["id"] for item in response.json()["webtoons"]]
+
+
+@pytest.fixture
+def drained(db, webtoon):
+    """`webtoon` indexed and the queue empty"""
+    recommendations.process_queue()
+    assert queued(db) == set()
+    return webtoon
+
+
+def test_scene_writes_queue_the_webtoon(client, db, drained):
+    scene = create_scene(client, drained, "등대지기의 편지")
+    assert queued(db) == {drained["id"]}
+
+    recommendations.process_queue()
+    assert client.put(f"/api/scenes/{scene['id']}", json={"narration": "다른 이야기"}).status_code == 200
+    assert queued(db) == {drained["id"]}
+
+    recommendations.process_queue()
+    assert client.delete(f"/api/scenes/{scene['id']}").status_code == 200
+    assert queued(db) == {drained["id"]}
+
+
+def test_layout_only_scene_edit_is_not_queued(client, db, drained):
+    scene = create_scene(client, drained, "등대지기의 편지")
+    recommendations.process_queue()
+
+    assert client.put(f"/api/scenes/{scene['id']}", json={"panel_layout": "grid"}).status_code == 200
+    assert queued(db) == set()
+
+
+def test_dialogue_writes_queue_the_webtoon(client, db, drained):
+    scene = create_scene(client, drained, "등대지기의 편지")
+    recommendations.process_queue()
+
+    response = client.post(f"/api/scenes/{scene['id']}/dialogues", json={
+        "scene_id": scene["id"], "who_speaks": "등대지기", "dialogue": "편지가 왔어요"
+    })
+    assert response.status_code == 200, response.text
+    assert queued(db) == {drained["id"]}
+
+    recommendations.process_queue()
+    assert client.put(f"/api/scenes/dialogues/{response.json()['id']}", json={"who_speaks": "소녀"}).status_code == 200
+    assert queued(db) == set()
+
+
+def test_batch_scene_create_queues_once(client, db, drained):
+    response = client.post("/api/scenes/batch", json=[
+        {"webtoon_id": drained["id"], "scene_number": n, "description": "장면", "narration": "바다"}
+        for n in (1, 2, 3)
+    ])
+    assert response.status_code == 200, response.text
+    assert queued(db) == {drained["id"]}
+
+
+def test_scene_text_reaches_similar_webtoons(client, other_client, db):
+    lighthouse = create_webtoon(client, "첫 번째 이야기")
+    harbour = create_webtoon(other_client, "두 번째 이야기")
+    unrelated = create_webtoon(other_client, "세 번째 이야기")
+    recommendations.process_queue()
+
+    create_scene(client, lighthouse, "등대지기가 밤바다에 편지를 띄웠다")
+    create_scene(other_client, harbour, "등대지기는 파도에 실려 온 편지를 읽었다")
+    create_scene(other_client, unrelated, "우주선이 화성 기지에 착륙했다")
+    recommendations.process_queue()
+
+    assert similar_ids(client, lighthouse)[0] == harbour["id"]
+
+
+def test_unpublished_webtoon_leaves_the_index(client, other_client, db):
+    first = create_webtoon(client, "등대지기의 편지", "바다 마을 이야기")
+    second = create_webtoon(other_client, "등대지기의 답장", "바다 마을 이야기")
+    recommendations.process_queue()
+    assert second["id"] in similar_ids(client, first)
+
+    response = other_client.put(f"/api/webtoons/{second['id']}", json={"status": "draft"})
+    assert response.status_code == 200, response.text
+    recommendations.process_queue()
+    assert second["id"] not in similar_ids(client, first)
+
+
+def test_features_match_korean_words_across_particles():
+    assert set(recommendations.features("편지를")) & set(recommendations.features("편지"))
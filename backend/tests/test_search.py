@@ -0,0 +1,67 @@
+def create_webtoon(client, title, summary=""):
+    response = client.post("/api/webtoons/", json={"title": title, "summary": summary})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def add_scene(client, webtoon, narration, line=None):
+    scene = client.post("/api/scenes/", json={
+        "webtoon_id": webtoon["id"], "scene_number": 1, "description": "장면", "narration": narration
+    }).json()
+    if line is not None:
+        response = client.post(f"/api/scenes/{scene['id']}/dialogues", json={
+            "scene_id": scene["id"], "who_speaks": "등대지기", "dialogue": line
+        })
+        assert response.status_code == 200, response.text
+    return scene
+
+
+def search(client, q, **params):
+    response = client.get("/api/webtoons/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def titles(page):
+    return [item["title"] for item in page["webtoons"]]
+
+
+def test_title_match_ranks_above_scene_and_dialogue(client):
+    create_webtoon(client, "파도 소리")
+    in_dialogue = create_webtoon(client, "바다 마을")
+    add_scene(client, in_dialogue, "조용한 밤", line="등대 너머로 편지가 왔어요")
+    in_scene = create_webtoon(client, "작은 섬")
+    add_scene(client, in_scene, "등대 아래에서 편지를 읽었다")
+    create_webtoon(client, "등대지기의 편지")
+
+    assert titles(search(client, "편지")) == ["등대지기의 편지", "작은 섬", "바다 마을"]
+
+
+def test_partial_korean_word_matches(client):
+    create_webtoon(client, "편지를 부치다")
+    assert titles(search(client, "편지")) == ["편지를 부치다"]
+
+
+def test_drafts_are_visible_only_to_their_owner(client, other_client):
+    draft = create_webtoon(client, "비밀 편지")
+    assert client.put(f"/api/webtoons/{draft['id']}", json={"status": "draft"}).status_code == 200
+
+    assert titles(search(client, "편지")) == ["비밀 편지"]
+    assert titles(search(other_client, "편지")) == []
+
+
+def test_cursor_pages_do_not_overlap(client):
+    for index in range(5):
+        create_webtoon(client, f"편지 {index}")
+
+    first = search(client, "편지", limit=3)
+    second = search(client, "편지", limit=3, cursor=first["next_cursor"])
+
+    assert len(first["webtoons"]) == 3 and first["next_cursor"]
+    assert len(second["webtoons"]) == 2 and second["next_cursor"] is None
+    assert not set(titles(first)) & set(titles(second))
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/api/webtoons/search", params={"q": "편지", "cursor": "garbage"})
+    assert response.status_code == 400
@@ -0,0 +1,132 @@
+import time
+import uuid
+
+import session
+from models import Webtoon
+from session import COOKIE_NAME, COOKIE_MAX_AGE, parse_session_token, sign_session_token
+
+
+def test_signed_token_round_trip():
+    owned = (uuid.uuid4().hex, uuid.uuid4().hex)
+    token = parse_session_token(sign_session_token("abc123", owned))
+
+    assert token.session_id == "abc123"
+    assert token.owned_webtoons == owned
+    assert token.signed
+
+
+def test_tampered_token_is_rejected():
+    session_id, issued_at, claims, signature = sign_session_token("abc123").split(".")
+
+    assert parse_session_token(f"someone-else.{issued_at}.{claims}.{signature}") is None
+    assert parse_session_token(f"{session_id}.{issued_at}.{uuid.uuid4().hex}.{signature}") is None
+    assert parse_session_token(f"{session_id}.{issued_at}.{claims}.{signature[:-2]}xx") is None
+
+
+def test_expired_token_is_rejected():
+    issued_at = int(time.time()) - COOKIE_MAX_AGE - 1
+    assert parse_session_token(sign_session_token("abc123", issued_at=issued_at)) is None
+
+
+def test_legacy_session_id_only_when_allowed(monkeypatch):
+    legacy = uuid.uuid4().hex
+    token = parse_session_token(legacy)
+    assert token.session_id == legacy
+    assert not token.signed
+
+    monkeypatch.setattr(session, "SESSION_ALLOW_LEGACY", False)
+    assert parse_session_token(legacy) is None
+
+
+def test_legacy_cookie_keeps_its_webtoons(client, db):
+    legacy = uuid.uuid4().hex
+    db.add(Webtoon(id=uuid.uuid4(), title="예전 웹툰", status="published", session_id=legacy))
+    db.commit()
+    webtoon_id = db.query(Webtoon.id).filter(Webtoon.session_id == legacy).scalar()
+
+    client.cookies.set(COOKIE_NAME, legacy, domain="testserver.local")
+    response = client.put(f"/api/webtoons/{webtoon_id}", json={"title": "고친 제목"})
+    assert response.status_code == 200, response.text
+
+    # Re-issued signed, same session
+    token = parse_session_token(client.cookies[COOKIE_NAME])
+    assert token.signed and token.session_id == legacy
+
+
+def test_creating_a_webtoon_claims_ownership(client, webtoon):
+    token = parse_session_token(client.cookies[COOKIE_NAME])
+
+    assert uuid.UUID(webtoon["id"]).hex in token.owned_webtoons
+    assert webtoon["is_owner"]
+
+
+def test_only_the_owner_can_update(client, other_client, webtoon):
+    url = f"/api/webtoons/{webtoon['id']}"
+
+    assert other_client.put(url, json={"title": "가로채기"}).status_code == 403
+    assert client.put(url, json={"title": "새 제목"}).status_code == 200
+
+
+def test_forged_cookie_does_not_grant_ownership(app, client, webtoon):
+    from fastapi.testclient import TestClient
+
+    forged = client.cookies[COOKIE_NAME].rsplit(".", 1)[0] + ".forged"
+    with TestClient(app, cookies={COOKIE_NAME: forged}) as intruder:
+        response = intruder.put(f"/api/webtoons/{webtoon['id']}", json={"title": "가로채기"})
+
+    assert response.status_code == 403
+
+
+def test_anonymous_reads_set_no_cookie(client, webtoon, app):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as anonymous:
+        response = anonymous.get("/api/webtoons/")
+
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+    assert response.headers["cache-control"] == session.PUBLIC_CACHE_CONTROL
+    assert client.get("/api/webtoons/").headers["cache-control"] == session.PRIVATE_CACHE_CONTROL
+
+
+def scene_payload(webtoon):
+    return {"webtoon_id": webtoon["id"], "scene_number": 1, "description": "장면"}
+
+
+def test_ownership_claim_skips_the_webtoon_lookup(client, other_client, webtoon):
+    import database
+    from sqlalchemy import event
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        assert client.post("/api/scenes/", json=scene_payload(webtoon)).status_code == 200
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT") and "FROM webtoons" in s]
+
+    other_client.post("/api/webtoons/", json={"title": "다른 웹툰"})  # a session, but no claim on webtoon
+    assert other_client.post("/api/scenes/", json=scene_payload(webtoon)).status_code == 403
+
+
+def test_claim_on_a_deleted_webtoon_is_not_found(client, db, webtoon):
+    db.query(Webtoon).filter(Webtoon.id == uuid.UUID(webtoon["id"])).delete()
+    db.commit()
+
+    assert client.post("/api/scenes/", json=scene_payload(webtoon)).status_code == 404
+    response = client.post(f"/api/webtoons/{webtoon['id']}/characters", json={"name": "등대지기", "webtoon_id": webtoon["id"]})
+    assert response.status_code == 404
+
+
+def test_webtoon_page_is_never_shared_so_views_are_counted(app, webtoon):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as anonymous:
+        responses = [anonymous.get(f"/api/webtoons/{webtoon['id']}") for _ in range(2)]
+
+    assert responses[0].headers["cache-control"] == session.PRIVATE_CACHE_CONTROL
+    assert responses[1].json()["view_count"] == responses[0].json()["view_count"] + 1
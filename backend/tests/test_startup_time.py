@@ -0,0 +1,37 @@
+"""
+Worker boot budget (see benchmarks/check_startup_time.py)
+
+Each sample imports the app in a fresh interpreter with this session's
+settings. Heavy modules must never load at boot. Import time depends on
+the hardware, so the time budget is checked only when
+STARTUP_BUDGET_SECONDS is set, on the machine the budget was chosen for.
+"""
+import os
+import statistics
+
+import pytest
+
+from benchmarks.check_startup_time import LAZY_MODULES, measure
+
+STARTUP_BUDGET_SECONDS = os.getenv("STARTUP_BUDGET_SECONDS", "")
+RUNS = 5
+
+
+@pytest.fixture(scope="module")
+def samples():
+    return [measure("main") for _ in range(RUNS)]
+
+
+def test_heavy_modules_load_lazily(samples):
+    loaded = sorted({name for sample in samples for name in sample["loaded"]})
+    assert not loaded, f"imported at boot but should load lazily (one of {LAZY_MODULES}): {loaded}"
+
+
+@pytest.mark.skipif(not STARTUP_BUDGET_SECONDS, reason="set STARTUP_BUDGET_SECONDS to check import time")
+def test_import_within_budget(samples):
+    median = statistics.median(sample["seconds"] for sample in samples)
+    budget = float(STARTUP_BUDGET_SECONDS)
+    assert median <= budget, (
+        f"import main: median {median * 1000:.0f} ms over budget {budget * 1000:.0f} ms; "
+        "see benchmarks/profile_imports.py"
+    )
@@ -0,0 +1,130 @@
+import io
+import os
+import uuid
+
+import pytest
+from PIL import Image
+
+import image_processing
+from storage import PENDING_UPLOAD_PREFIX
+
+
+def png_bytes(size=(800, 900)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def presign(client, webtoon, content_type="image/png", file_name="cover.png"):
+    return client.post("/api/uploads/presign", json={
+        "target": "thumbnail", "target_id": webtoon["id"],
+        "file_name": file_name, "content_type": content_type
+    })
+
+
+def upload(client, webtoon, body):
+    """Presign, PUT the body and finalize; returns the asset id and pending key"""
+    presigned = presign(client, webtoon).json()
+    instructions = presigned["upload"]
+    assert client.put(instructions["url"], content=body, headers=instructions["headers"]).status_code == 204
+
+    response = client.post(f"/api/uploads/{presigned['asset_id']}/finalize")
+    assert response.status_code == 202, response.text
+    assert response.json()["status"] == "processing"
+    return presigned["asset_id"], response.json()["file_path"]
+
+
+def test_finalized_image_is_published_by_the_worker(client, webtoon):
+    asset_id, pending_key = upload(client, webtoon, png_bytes())
+    assert pending_key.startswith(f"{PENDING_UPLOAD_PREFIX}/")
+    assert client.get(f"/static/{pending_key}").status_code == 404
+
+    assert image_processing.process_queued_assets() == 1
+
+    asset = client.get(f"/api/uploads/{asset_id}").json()
+    assert asset["status"] == "ready"
+    assert asset["file_path"].endswith(".png")
+    assert set(asset["variants"]) >= {"thumbnail"}
+    assert client.get(f"/static/{asset['file_path']}").status_code == 200
+    assert not os.path.exists(os.path.join("static", pending_key))
+
+    thumbnail = client.get(f"/api/webtoons/{webtoon['id']}").json()["thumbnail_url"]
+    assert thumbnail == asset["variants"]["thumbnail"]
+
+
+def test_non_image_payload_fails_validation(client, webtoon):
+    asset_id, pending_key = upload(client, webtoon, b"<html><script>alert(1)</script></html>")
+
+    image_processing.process_queued_assets()
+
+    assert client.get(f"/api/uploads/{asset_id}").json()["status"] == "failed"
+    assert client.get(f"/static/{pending_key}").status_code == 404
+
+
+def test_finalize_requires_the_uploaded_file(client, webtoon):
+    asset_id = presign(client, webtoon).json()["asset_id"]
+    assert client.post(f"/api/uploads/{asset_id}/finalize").status_code == 400
+
+
+def test_finalize_only_once(client, webtoon):
+    asset_id, _ = upload(client, webtoon, png_bytes())
+    assert client.post(f"/api/uploads/{asset_id}/finalize").status_code == 409
+
+
+def test_only_the_uploader_can_finalize(client, other_client, webtoon):
+    presigned = presign(client, webtoon).json()
+    instructions = presigned["upload"]
+    client.put(instructions["url"], content=png_bytes(), headers=instructions["headers"])
+
+    url = f"/api/uploads/{presigned['asset_id']}/finalize"
+    assert other_client.post(url).status_code == 401
+
+    other_client.post("/api/webtoons/", json={"title": "다른 독자의 웹툰"})  # now has a session
+    assert other_client.post(url).status_code == 403
+
+
+@pytest.mark.parametrize("content_type", ["image/svg+xml", "text/html"])
+def test_presign_rejects_unsupported_types(client, webtoon, content_type):
+    assert presign(client, webtoon, content_type=content_type).status_code == 400
+
+
+def test_oversized_upload_is_rejected(client, webtoon, monkeypatch):
+    from routers import uploads_router
+    monkeypatch.setattr(uploads_router, "MAX_FILE_SIZE", 1024)
+
+    instructions = presign(client, webtoon).json()["upload"]
+    response = client.put(instructions["url"], content=b"0" * 2048, headers=instructions["headers"])
+
+    assert response.status_code == 413
+
+
+def test_object_replaced_after_finalize_is_size_checked_again(client, webtoon, monkeypatch):
+    asset_id, pending_key = upload(client, webtoon, png_bytes())
+
+    # A presigned S3 PUT is still valid after finalize
+    with open(os.path.join("static", pending_key), "wb") as file:
+        file.write(png_bytes(size=(3000, 3000)))
+    monkeypatch.setattr(image_processing, "MAX_FILE_SIZE", 4096)
+    image_processing.process_queued_assets()
+
+    assert client.get(f"/api/uploads/{asset_id}").json()["status"] == "failed"
+    assert not os.path.exists(os.path.join("static", pending_key))
+
+
+def test_uploads_never_finalized_are_cleaned_up(client, webtoon, db):
+    from datetime import datetime, timedelta
+    from models import ImageAsset
+
+    stale, recent = (presign(client, webtoon).json() for _ in range(2))
+    for presigned in (stale, recent):
+        instructions = presigned["upload"]
+        client.put(instructions["url"], content=png_bytes(), headers=instructions["headers"])
+    stale_asset = db.get(ImageAsset, uuid.UUID(stale["asset_id"]))
+    stale_asset.created_at = datetime.utcnow() - timedelta(seconds=image_processing.PENDING_UPLOAD_TTL_SECONDS + 1)
+    stale_key = stale_asset.file_path
+    db.commit()
+
+    assert image_processing.cleanup_pending_assets() == 1
+    assert client.get(f"/api/uploads/{stale['asset_id']}").status_code == 404
+    assert not os.path.exists(os.path.join("static", stale_key))
+    assert client.get(f"/api/uploads/{recent['asset_id']}").json()["status"] == "pending"
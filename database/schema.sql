@@ -117,6 +117,8 @@ CREATE TABLE IF NOT EXISTS image_assets (
     scene_id INTEGER REFERENCES scenes(id), -- episode_id를 scene_id로 변경
     asset_type VARCHAR(50), -- thumbnail, panel, character, background
     session_id VARCHAR(100),
+    status VARCHAR(20) DEFAULT 'ready', -- pending, processing, ready, failed
+    variants JSONB, -- 변형 이미지 이름 -> URL
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -144,23 +146,64 @@ CREATE TABLE IF NOT EXISTS chat_messages (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- 채팅 메시지 보관 테이블 (오래된 대화 스레드를 chat_messages에서 옮겨 보관)
+CREATE TABLE IF NOT EXISTS chat_messages_archive (
+    id INTEGER PRIMARY KEY,
+    webtoon_id INTEGER REFERENCES webtoons(id) ON DELETE CASCADE,
+    scene_id INTEGER,
+    sender_type VARCHAR(20) NOT NULL,
+    sender_name VARCHAR(100),
+    message TEXT NOT NULL,
+    session_id VARCHAR(100),
+    is_read BOOLEAN DEFAULT FALSE,
+    character_id INTEGER,
+    parent_message_id INTEGER,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 채팅 안읽음 카운터 테이블 (웹툰 + 세션별로 유지되는 안읽은 답장 수)
+CREATE TABLE IF NOT EXISTS chat_unread_counters (
+    id SERIAL PRIMARY KEY,
+    webtoon_id INTEGER NOT NULL REFERENCES webtoons(id) ON DELETE CASCADE,
+    session_id VARCHAR(100) NOT NULL, -- 답장을 받는 독자 세션
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(webtoon_id, session_id)
+);
+
+-- 채팅 읽음 위치 테이블 (웹툰 + 세션별 마지막으로 읽은 지점)
+CREATE TABLE IF NOT EXISTS chat_read_markers (
+    id SERIAL PRIMARY KEY,
+    webtoon_id INTEGER NOT NULL REFERENCES webtoons(id) ON DELETE CASCADE,
+    session_id VARCHAR(100) NOT NULL,
+    last_read_message_id INTEGER,
+    last_read_at TIMESTAMP NOT NULL, -- 이 시각까지의 메시지는 모두 읽음
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(webtoon_id, session_id)
+);
+
 -- 인덱스 생성
 CREATE INDEX idx_webtoons_status ON webtoons(status);
-CREATE INDEX idx_webtoons_session ON webtoons(session_id);
+CREATE INDEX idx_webtoons_published_created ON webtoons(created_at DESC) WHERE status = 'published'; -- 공개 웹툰 최신순
+CREATE INDEX idx_webtoons_session_created ON webtoons(session_id, created_at DESC); -- 내 웹툰 최신순
 CREATE INDEX idx_scenes_webtoon ON scenes(webtoon_id);
 CREATE INDEX idx_scenes_order ON scenes(webtoon_id, scene_number);
 CREATE INDEX idx_dialogues_scene ON dialogues(scene_id);
 CREATE INDEX idx_dialogues_order ON dialogues(scene_id, dialogue_order);
 CREATE INDEX idx_characters_webtoon ON characters(webtoon_id);
 CREATE INDEX idx_edit_history_scene ON edit_history(scene_id);
-CREATE INDEX idx_comments_webtoon ON comments(webtoon_id);
+CREATE INDEX idx_comments_thread ON comments(webtoon_id, parent_comment_id, created_at);
+CREATE INDEX idx_comments_replies ON comments(parent_comment_id, created_at) WHERE parent_comment_id IS NOT NULL;
 CREATE INDEX idx_generation_sessions_session ON generation_sessions(session_id);
 CREATE INDEX idx_likes_webtoon ON likes(webtoon_id);
-CREATE INDEX idx_likes_session ON likes(session_id);
+CREATE INDEX idx_likes_session_webtoon ON likes(session_id, webtoon_id);
 CREATE INDEX idx_chat_messages_webtoon ON chat_messages(webtoon_id);
 CREATE INDEX idx_chat_messages_session ON chat_messages(session_id);
 CREATE INDEX idx_chat_messages_character ON chat_messages(character_id);
-CREATE INDEX idx_chat_messages_parent ON chat_messages(parent_message_id);
+CREATE INDEX idx_chat_messages_replies ON chat_messages(parent_message_id, created_at) WHERE parent_message_id IS NOT NULL;
+CREATE INDEX idx_chat_messages_thread ON chat_messages(webtoon_id, parent_message_id, created_at);
+CREATE INDEX idx_chat_messages_archive_thread ON chat_messages_archive(webtoon_id, parent_message_id, created_at);
 
 -- Trigger function for updated_at
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -179,4 +222,56 @@ CREATE TRIGGER update_scenes_updated_at BEFORE UPDATE ON scenes
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 CREATE TRIGGER update_comments_updated_at BEFORE UPDATE ON comments
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
\ No newline at end of file
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- 전문 검색: webtoons/scenes/dialogues.search_vector (tsvector, 트리거로 갱신) 와 GIN/pg_trgm 인덱스는
+-- backend/migrations/versions/0004_full_text_search.py 에서 생성
+
+-- 인기 점수 (로그 공간의 시간 감쇠 점수, backend/ranking.py 참고)
+CREATE TABLE IF NOT EXISTS webtoon_scores (
+    webtoon_id INTEGER PRIMARY KEY REFERENCES webtoons(id) ON DELETE CASCADE,
+    score DOUBLE PRECISION NOT NULL, -- log(Σ 가중치 × e^(λ·(t - 기준시각)))
+    views_seen INTEGER NOT NULL DEFAULT 0, -- 마지막 반영 시점의 view_count
+    likes_seen INTEGER NOT NULL DEFAULT 0, -- 마지막 반영 시점의 like_count
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 점수에 반영된 활동의 기준 시각
+CREATE TABLE IF NOT EXISTS score_checkpoints (
+    name VARCHAR(50) PRIMARY KEY,
+    checkpoint TIMESTAMP NOT NULL
+);
+
+CREATE INDEX idx_webtoon_scores_rank ON webtoon_scores(score DESC, webtoon_id);
+CREATE INDEX idx_webtoons_updated ON webtoons(updated_at);
+CREATE INDEX idx_comments_created ON comments(created_at);
+CREATE INDEX idx_chat_messages_created ON chat_messages(created_at);
+
+-- 유사 웹툰 추천 (해시 n-gram 벡터와 미리 계산된 top-k 이웃, backend/recommendations.py 참고)
+CREATE TABLE IF NOT EXISTS webtoon_vectors (
+    webtoon_id INTEGER PRIMARY KEY REFERENCES webtoons(id) ON DELETE CASCADE,
+    vector BYTEA NOT NULL, -- float32 × VECTOR_DIM 단어 빈도
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS webtoon_similarities (
+    webtoon_id INTEGER REFERENCES webtoons(id) ON DELETE CASCADE,
+    similar_webtoon_id INTEGER REFERENCES webtoons(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL, -- 1 = 가장 유사
+    score DOUBLE PRECISION NOT NULL, -- 코사인 유사도
+    PRIMARY KEY (webtoon_id, similar_webtoon_id)
+);
+
+CREATE INDEX idx_webtoon_similarities_rank ON webtoon_similarities(webtoon_id, rank);
+
+-- 함께 좋아요한 웹툰 (좋아요 공동 출현 기반 이웃, backend/collaborative.py 참고)
+CREATE TABLE IF NOT EXISTS webtoon_co_likes (
+    webtoon_id INTEGER REFERENCES webtoons(id) ON DELETE CASCADE,
+    similar_webtoon_id INTEGER REFERENCES webtoons(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL, -- 1 = 가장 관련 높음
+    score DOUBLE PRECISION NOT NULL, -- 축소 보정한 코사인 유사도
+    co_likes INTEGER NOT NULL, -- 두 웹툰을 모두 좋아요한 세션 수
+    PRIMARY KEY (webtoon_id, similar_webtoon_id)
+);
+
+CREATE INDEX idx_webtoon_co_likes_rank ON webtoon_co_likes(webtoon_id, rank);
@@ -106,8 +106,8 @@ const WebtoonPage = () => {
 
   const fetchRecommendations = async () => {
     try {
-      const response = await api.get('/api/webtoons?page=1&per_page=6');
-      setRecommendations(response.data.webtoons.filter(w => w.id !== parseInt(id)));
+      const response = await api.get(`/api/webtoons/${id}/similar?limit=6`);
+      setRecommendations(response.data.webtoons);
     } catch (error) {
       console.error('Failed to fetch recommendations:', error);
     }
@@ -268,7 +268,10 @@ const WebtoonPage = () => {
           .map(msg => msg.id);
         
         if (unreadIds.length > 0) {
-          await api.post('/api/chat/messages/batch-read', unreadIds);
+          // 마지막 메시지까지 모두 읽음 처리 (읽음 위치 하나만 저장)
+          await api.put(`/api/chat/read-marker/webtoon/${id}`, {
+            message_id: messages[messages.length - 1].id
+          });
           setUnreadMessages(0);
         }
       }, 1500);
@@ -64,12 +64,31 @@ echo "PORT=$FRONTEND_PORT" >> "$PROJECT_ROOT/frontend/.env"
 echo "📦 백엔드 서버 시작 중... (포트: $BACKEND_PORT)"
 cd "$PROJECT_ROOT/backend"
 source "$PROJECT_ROOT/.venv/bin/activate"
-uv run uvicorn main:app --reload --host 0.0.0.0 --port $BACKEND_PORT > "$PROJECT_ROOT/backend.log" 2>&1 &
+echo "🗄  데이터베이스 마이그레이션 적용 중..."
+uv run alembic upgrade head || { echo "❌ 마이그레이션 실패"; exit 1; }
+if [ "$1" = "--prod" ]; then
+    # 운영 모드: gunicorn + uvicorn 워커 (코어 수만큼, gunicorn.conf.py 참고)
+    PORT=$BACKEND_PORT uv run gunicorn -c gunicorn.conf.py main:app > "$PROJECT_ROOT/backend.log" 2>&1 &
+else
+    uv run uvicorn main:app --reload --host 0.0.0.0 --port $BACKEND_PORT > "$PROJECT_ROOT/backend.log" 2>&1 &
+fi
 BACKEND_PID=$!
 echo "BACKEND_PID=$BACKEND_PID" >> "$PID_FILE"
 echo "BACKEND_PORT=$BACKEND_PORT" >> "$PID_FILE"
 echo "✅ 백엔드 서버 시작됨 (PID: $BACKEND_PID, 포트: $BACKEND_PORT)"
 
+# 업로드 이미지 검증·리사이즈 워커 (API 워커와 별도 프로세스)
+uv run python image_processing.py > "$PROJECT_ROOT/image_worker.log" 2>&1 &
+IMAGE_WORKER_PID=$!
+echo "IMAGE_WORKER_PID=$IMAGE_WORKER_PID" >> "$PID_FILE"
+echo "✅ 이미지 워커 시작됨 (PID: $IMAGE_WORKER_PID)"
+
+# 비슷한 웹툰 색인 워커 (발행·수정된 웹툰 대기열 처리)
+uv run python recommendations.py --worker > "$PROJECT_ROOT/similarity_worker.log" 2>&1 &
+SIMILARITY_WORKER_PID=$!
+echo "SIMILARITY_WORKER_PID=$SIMILARITY_WORKER_PID" >> "$PID_FILE"
+echo "✅ 유사도 워커 시작됨 (PID: $SIMILARITY_WORKER_PID)"
+
 # 백엔드가 시작될 때까지 잠시 대기
 sleep 3
 
@@ -25,6 +25,18 @@ if [ -f "$PID_FILE" ]; then
         fi
     fi
     
+    # 이미지 워커 종료
+    if [ ! -z "$IMAGE_WORKER_PID" ] && kill -0 $IMAGE_WORKER_PID 2>/dev/null; then
+        kill $IMAGE_WORKER_PID
+        echo "✅ 이미지 워커 종료됨"
+    fi
+    
+    # 유사도 워커 종료
+    if [ ! -z "$SIMILARITY_WORKER_PID" ] && kill -0 $SIMILARITY_WORKER_PID 2>/dev/null; then
+        kill $SIMILARITY_WORKER_PID
+        echo "✅ 유사도 워커 종료됨"
+    fi
+    
     # 프론트엔드 서버 종료
     if [ ! -z "$FRONTEND_PID" ]; then
         if kill -0 $FRONTEND_PID 2>/dev/null; then